@@ -0,0 +1,21 @@
+from django.apps import AppConfig
+
+
+class ApiConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.api'
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+        from .resources import RESOURCES, bump_versions_for_instance
+
+        labels = set()
+        for config in RESOURCES.values():
+            labels.add(config['model'])
+            labels.update(config.get('depends_on', ()))
+            labels.update(child['model'] for child in config.get('children', {}).values())
+
+        # Any change to a model behind a resource invalidates its cached responses
+        for label in sorted(labels):
+            post_save.connect(bump_versions_for_instance, sender=label, dispatch_uid=f'api_version_save_{label}')
+            post_delete.connect(bump_versions_for_instance, sender=label, dispatch_uid=f'api_version_delete_{label}')
@@ -0,0 +1,319 @@
+"""
+Resources exposed by the public read-only API.
+
+Each resource is a values() projection of one model: `fields` maps the public
+field name to its ORM path, `ordering` is the keyset used for cursor
+pagination (it must end with a unique field), and `children` are related
+rows fetched for a whole page with one extra query.
+
+Every resource has a content version in the shared cache, bumped whenever
+one of its models is saved or deleted; cached response bodies and ETags are
+keyed by it, so a change is visible on the next request, in every worker,
+without any expiry. Bulk queryset.update() sends no signals, so code changing
+rows that way calls bump_versions_for_model() itself.
+"""
+
+import time
+
+from django.apps import apps
+from django.core.cache import caches
+from django.core.files.storage import default_storage
+
+
+RESOURCES = {
+    'news': {
+        'model': 'news.NewsArticle',
+        'filters': {'status': 'published', 'published_date__isnull': False},
+        'lookup': 'slug',
+        'ordering': ('-published_date', '-id'),
+        'fields': {
+            'id': 'id',
+            'slug': 'slug',
+            'title': 'title',
+            'excerpt': 'excerpt',
+            'content': 'content',
+            'category': 'category__name',
+            'category_slug': 'category__slug',
+            'author': 'author__full_name',
+            'featured_image': 'featured_image',
+            'image_caption': 'image_caption',
+            'is_featured': 'is_featured',
+            'published_date': 'published_date',
+            'updated_at': 'updated_at',
+        },
+        'list_fields': (
+            'id', 'slug', 'title', 'excerpt', 'category', 'featured_image', 'is_featured', 'published_date',
+        ),
+        'files': {'featured_image'},
+        'depends_on': ('news.NewsCategory', 'staff.StaffMember'),
+    },
+    'projects': {
+        'model': 'projects.Project',
+        'filters': {},
+        'lookup': 'slug',
+        'ordering': ('-created_at', '-id'),
+        'fields': {
+            'id': 'id',
+            'slug': 'slug',
+            'title': 'title',
+            'description': 'description',
+            'category': 'category__name',
+            'category_slug': 'category__slug',
+            'status': 'status',
+            'location': 'location',
+            'start_date': 'start_date',
+            'completion_date': 'completion_date',
+            'budget': 'budget',
+            'beneficiaries': 'beneficiaries',
+            'impact_text': 'impact_text',
+            'is_featured': 'is_featured',
+            'updated_at': 'updated_at',
+        },
+        'list_fields': ('id', 'slug', 'title', 'category', 'status', 'location', 'is_featured'),
+        'children': {
+            'images': {
+                'model': 'projects.ProjectImage',
+                'parent': 'project_id',
+                'ordering': ('-is_primary', 'order', 'uploaded_at'),
+                'fields': {'image': 'image', 'caption': 'caption', 'is_primary': 'is_primary'},
+                'files': {'image'},
+            },
+        },
+        'depends_on': ('projects.ProjectCategory', 'projects.ProjectImage'),
+    },
+    'services': {
+        'model': 'services.Service',
+        'filters': {'is_active': True},
+        'lookup': 'slug',
+        'ordering': ('order', 'name', 'id'),
+        'fields': {
+            'id': 'id',
+            'slug': 'slug',
+            'name': 'name',
+            'description': 'description',
+            'icon': 'icon',
+            'link_url': 'link_url',
+            'link_text': 'link_text',
+            'has_detail_page': 'has_detail_page',
+            'updated_at': 'updated_at',
+        },
+        'list_fields': ('id', 'slug', 'name', 'description', 'icon', 'link_url', 'link_text'),
+        'children': {
+            'content_blocks': {
+                'model': 'services.ServiceContentBlock',
+                'parent': 'service_id',
+                'filters': {'is_active': True},
+                'ordering': ('order', 'id'),
+                'fields': {
+                    'id': 'id', 'block_type': 'block_type', 'title': 'title',
+                    'content': 'content', 'data': 'data', 'order': 'order',
+                },
+            },
+        },
+        'depends_on': ('services.ServiceContentBlock',),
+    },
+    'documents': {
+        'model': 'documents.Document',
+        'filters': {'is_public': True},
+        'lookup': 'slug',
+        'ordering': ('-uploaded_date', '-id'),
+        'fields': {
+            'id': 'id',
+            'slug': 'slug',
+            'title': 'title',
+            'description': 'description',
+            'category': 'category__name',
+            'category_slug': 'category__slug',
+            'file': 'file',
+            'thumbnail': 'thumbnail',
+            'file_size': 'file_size',
+            'file_type': 'file_type',
+            'document_year': 'document_year',
+            'document_quarter': 'document_quarter',
+            'is_featured': 'is_featured',
+            'uploaded_date': 'uploaded_date',
+            'updated_date': 'updated_date',
+        },
+        'list_fields': (
+            'id', 'slug', 'title', 'category', 'file', 'file_size', 'file_type', 'document_year', 'uploaded_date',
+        ),
+        'files': {'file', 'thumbnail'},
+        'depends_on': ('documents.DocumentCategory',),
+    },
+    'gallery': {
+        'model': 'gallery.GalleryImage',
+        'filters': {},
+        'lookup': 'id',
+        'ordering': ('-uploaded_date', '-id'),
+        'fields': {
+            'id': 'id',
+            'title': 'title',
+            'category': 'category__name',
+            'category_slug': 'category__slug',
+            'image': 'image',
+            'thumbnail': 'thumbnail',
+            'width': 'image_width',
+            'height': 'image_height',
+            'color': 'image_color',
+            'placeholder': 'image_placeholder',
+            'caption': 'caption',
+            'date_taken': 'date_taken',
+            'is_featured': 'is_featured',
+            'uploaded_date': 'uploaded_date',
+        },
+        'list_fields': ('id', 'title', 'category', 'image', 'thumbnail', 'width', 'height', 'date_taken'),
+        'files': {'image', 'thumbnail'},
+        'depends_on': ('gallery.GalleryCategory',),
+    },
+    'staff': {
+        'model': 'staff.StaffMember',
+        'filters': {'is_active': True},
+        'lookup': 'id',
+        'ordering': ('display_order', 'full_name', 'id'),
+        'fields': {
+            'id': 'id',
+            'full_name': 'full_name',
+            'position': 'position',
+            'position_type': 'position_type',
+            'department': 'department__name',
+            'bio': 'bio',
+            'photo': 'photo',
+            'email': 'email',
+            'linkedin_url': 'linkedin_url',
+            'twitter_url': 'twitter_url',
+        },
+        'list_fields': ('id', 'full_name', 'position', 'position_type', 'department', 'photo'),
+        'files': {'photo'},
+        'depends_on': ('staff.Department',),
+    },
+}
+
+# Saves that only touch these never change an API response
+COUNTER_FIELDS = {'views', 'download_count'}
+
+VERSION_KEY_PREFIX = 'api_version'
+
+
+class InvalidQuery(ValueError):
+    """Bad field selection or limit; reported to the client as a 400"""
+
+
+def get_version(name):
+    """
+    Return the current content version of a resource.
+
+    Versions start from the clock, so a cleared cache never hands out a
+    version (and ETag) that a client may already hold for older content.
+    """
+    return caches['shared'].get_or_set(f'{VERSION_KEY_PREFIX}:{name}', time.time_ns() // 1000, None)
+
+
+def bump_version(name):
+    """Invalidate every cached response and ETag of a resource"""
+    try:
+        caches['shared'].incr(f'{VERSION_KEY_PREFIX}:{name}')
+    except ValueError:
+        caches['shared'].set(f'{VERSION_KEY_PREFIX}:{name}', time.time_ns() // 1000, None)
+
+
+def resources_for_model(model):
+    """Names of the resources whose responses include rows of this model"""
+    label = model._meta.label
+    return [
+        name for name, config in RESOURCES.items()
+        if config['model'] == label or label in config.get('depends_on', ())
+    ]
+
+
+def bump_versions_for_model(model):
+    """Invalidate the resources including rows of a model, after a bulk update"""
+    for name in resources_for_model(model):
+        bump_version(name)
+
+
+def bump_versions_for_instance(sender, instance, update_fields=None, **kwargs):
+    """post_save / post_delete handler"""
+    if update_fields is not None and set(update_fields) <= COUNTER_FIELDS:
+        return
+    for name in resources_for_model(sender):
+        bump_version(name)
+
+
+def select_fields(config, requested, detail):
+    """
+    Validate the `fields` query parameter.
+
+    Returns (fields, children) tuples; the defaults are the list fields for a
+    list and everything for a detail response.
+    """
+    children = config.get('children', {})
+    if not requested:
+        if detail:
+            return tuple(config['fields']), tuple(children)
+        return tuple(config['list_fields']), ()
+
+    names = [name.strip() for name in requested.split(',') if name.strip()]
+    unknown = [name for name in names if name not in config['fields'] and name not in children]
+    if unknown:
+        raise InvalidQuery(f"Unknown field(s): {', '.join(unknown)}")
+    return (
+        tuple(name for name in names if name in config['fields']),
+        tuple(name for name in names if name in children),
+    )
+
+
+def _project(rows, fields, field_map, files):
+    """Rename ORM paths to public names and turn file names into URLs"""
+    results = []
+    for row in rows:
+        item = {}
+        for name in fields:
+            value = row[field_map[name]]
+            if name in files:
+                value = default_storage.url(value) if value else None
+            item[name] = value
+        results.append(item)
+    return results
+
+
+def _attach_children(config, items, ids, children):
+    for child_name in children:
+        child = config['children'][child_name]
+        model = apps.get_model(child['model'])
+        paths = [child['parent'], *child['fields'].values()]
+        rows = list(
+            model.objects
+            .filter(**{f"{child['parent']}__in": ids}, **child.get('filters', {}))
+            .order_by(*child['ordering'])
+            .values(*dict.fromkeys(paths))
+        )
+        grouped = {pk: [] for pk in ids}
+        for row, projected in zip(rows, _project(rows, tuple(child['fields']), child['fields'], child.get('files', set()))):
+            grouped[row[child['parent']]].append(projected)
+        for item, pk in zip(items, ids):
+            item[child_name] = grouped[pk]
+
+
+def serialize(config, queryset, fields, children, limit=None):
+    """
+    Run the values() projection for the selected fields and attach children.
+
+    Returns (items, last row) where the last row is only set when more rows
+    follow it, i.e. when there is a next page.
+    """
+    field_map = config['fields']
+    # The ordering fields are always fetched for the next cursor
+    ordering = (field.lstrip('-') for field in config['ordering'])
+    paths = ['id', *ordering, *(field_map[name] for name in fields)]
+    queryset = queryset.values(*dict.fromkeys(paths))
+    if limit is None:
+        rows, has_more = list(queryset), False
+    else:
+        rows = list(queryset[:limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+    items = _project(rows, fields, field_map, config.get('files', set()))
+    if children:
+        _attach_children(config, items, [row['id'] for row in rows], children)
+    return items, rows[-1] if has_more else None
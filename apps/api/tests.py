@@ -0,0 +1,157 @@
+import base64
+import datetime
+import json
+import tempfile
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.documents.models import Document, DocumentCategory
+from apps.news.models import NewsArticle, NewsCategory
+from apps.services.models import Service, ServiceContentBlock
+from .resources import RESOURCES
+
+
+class PublicApiTests(TestCase):
+    """Read-only API: projections, cursor pages and versioned ETags"""
+
+    def setUp(self):
+        cache.clear()
+        self.services = [
+            Service.objects.create(name=f'Service {number}', description='Municipal service', order=number)
+            for number in range(5)
+        ]
+        ServiceContentBlock.objects.create(service=self.services[0], title='Requirements', order=1)
+        ServiceContentBlock.objects.create(service=self.services[0], title='Hidden', is_active=False)
+
+    def test_cursor_pagination_walks_every_item_once(self):
+        names, url = [], '/api/v1/services/?limit=2&fields=name'
+        while url:
+            data = self.client.get(url).json()
+            names += [item['name'] for item in data['results']]
+            url = data['next']
+
+        self.assertEqual(names, [f'Service {number}' for number in range(5)])
+
+    def test_field_selection(self):
+        data = self.client.get('/api/v1/services/?fields=slug,content_blocks').json()
+        self.assertEqual(data['results'][0], {
+            'slug': 'service-0',
+            'content_blocks': [{
+                'id': ServiceContentBlock.objects.get(title='Requirements').pk,
+                'block_type': 'text', 'title': 'Requirements', 'content': '', 'data': {}, 'order': 1,
+            }],
+        })
+
+        response = self.client.get('/api/v1/services/?fields=name,secret')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()['success'])
+
+    def test_detail_includes_children(self):
+        result = self.client.get('/api/v1/services/service-0/').json()['result']
+        self.assertEqual([block['title'] for block in result['content_blocks']], ['Requirements'])
+        self.assertEqual(self.client.get('/api/v1/services/missing/').status_code, 404)
+
+    def test_conditional_request_and_invalidation(self):
+        response = self.client.get('/api/v1/services/')
+        etag = response['ETag']
+
+        with self.assertNumQueries(1):  # the version, from the shared cache table
+            response = self.client.get('/api/v1/services/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.services[0].name = 'Birth Registration'
+        self.services[0].save()
+
+        response = self.client.get('/api/v1/services/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()['results'][0]['name'], 'Birth Registration')
+
+    def test_bulk_changes_invalidate_responses(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'secret-pass'))
+        category = NewsCategory.objects.create(name='Announcements')
+        article = NewsArticle.objects.create(category=category, title='Water supply update', content='Text', status='published')
+        response = self.client.get('/api/v1/news/?fields=title')
+        self.assertEqual([item['title'] for item in response.json()['results']], ['Water supply update'])
+
+        self.client.post('/admin/news/newsarticle/', {'action': 'unpublish_articles', '_selected_action': [article.pk]})
+        self.assertEqual(self.client.get('/api/v1/news/?fields=title').json()['results'], [])
+        self.assertEqual(
+            self.client.get('/api/v1/news/?fields=title', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200
+        )
+
+        blocks = [ServiceContentBlock.objects.create(service=self.services[1], title=title, order=number)
+                  for number, title in enumerate(['Requirements', 'Fees'])]
+        response = self.client.get('/api/v1/services/service-1/')
+        self.client.post('/portal/api/reorder/service-blocks/', {
+            'parent_id': self.services[1].pk,
+            'positions': json.dumps([{'id': blocks[0].pk, 'order': 1}, {'id': blocks[1].pk, 'order': 0}]),
+        })
+        response = self.client.get('/api/v1/services/service-1/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual([block['title'] for block in response.json()['result']['content_blocks']], ['Fees', 'Requirements'])
+
+    def test_unknown_resource(self):
+        self.assertEqual(self.client.get('/api/v1/secrets/').status_code, 404)
+
+
+@override_settings(SYNDICATION_AUTO_UPDATE=False)
+class ApiCursorTests(TestCase):
+    """Cursors keep their exact position and reject values they could not hold"""
+
+    def setUp(self):
+        cache.clear()
+        self.category = NewsCategory.objects.create(name='Announcements')
+
+    def walk(self, url):
+        titles = []
+        while url:
+            data = self.client.get(url).json()
+            titles += [item['title'] for item in data['results']]
+            url = data['next']
+        return titles
+
+    def test_cursor_keeps_microseconds(self):
+        # Within one millisecond: a cursor rounded to milliseconds skips or repeats rows
+        published = timezone.now().replace(microsecond=500000)
+        for number in range(3):
+            NewsArticle.objects.create(
+                category=self.category, title=f'Article {number}', content='Text', status='published',
+                published_date=published + datetime.timedelta(microseconds=100 * number),
+            )
+
+        self.assertEqual(
+            self.walk('/api/v1/news/?limit=1&fields=title'),
+            ['Article 2', 'Article 1', 'Article 0'],
+        )
+
+    def test_descending_nullable_ordering_ends_with_nulls(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=tmp.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        category = DocumentCategory.objects.create(name='Reports')
+        for title, year in [('Undated A', None), ('Report 2023', 2023), ('Undated B', None), ('Report 2024', 2024)]:
+            Document.objects.create(
+                title=title, description='Report', category=category, document_year=year,
+                file=SimpleUploadedFile('report.pdf', b'%PDF-1.4'),
+            )
+
+        with mock.patch.dict(RESOURCES['documents'], ordering=('-document_year', '-id')):
+            titles = self.walk('/api/v1/documents/?limit=1&fields=title')
+        self.assertEqual(titles, ['Report 2024', 'Report 2023', 'Undated B', 'Undated A'])
+
+    def test_well_formed_cursor_with_bad_values_is_rejected(self):
+        NewsArticle.objects.create(category=self.category, title='Article', content='Text', status='published')
+
+        for values in (['yesterday', 1], [{'date': 1}, 1], ['2026-01-01T00:00:00+00:00', 'one']):
+            cursor = base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+            response = self.client.get(f'/api/v1/news/?cursor={cursor}')
+            self.assertEqual(response.status_code, 400)
+            self.assertFalse(response.json()['success'])
@@ -0,0 +1,12 @@
+"""URL configuration for the public read-only API (mounted at /api/v1/)."""
+
+from django.urls import path
+from . import views
+
+app_name = 'api'
+
+urlpatterns = [
+    path('', views.api_index, name='index'),
+    path('<slug:resource>/', views.resource_list, name='list'),
+    path('<slug:resource>/<str:lookup>/', views.resource_detail, name='detail'),
+]
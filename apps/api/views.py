@@ -0,0 +1,154 @@
+"""
+Public read-only JSON API (v1) for the kiosk and mobile clients.
+
+    GET /api/v1/                        available resources
+    GET /api/v1/<resource>/             list, newest first
+        ?fields=id,title,...            choose fields (and children, e.g. content_blocks)
+        ?limit=20                       page size (max 100)
+        ?cursor=...                     continue from the previous page's next_cursor
+    GET /api/v1/<resource>/<lookup>/    one item by slug (or id)
+
+Responses carry an ETag derived from the resource's content version, so
+clients revalidate with If-None-Match and get a 304 after a single read of
+the shared cache; response bodies are cached under the same version.
+"""
+
+import hashlib
+import json
+from urllib.parse import urlencode
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse
+from django.urls import reverse
+from django.views.decorators.http import require_safe
+
+from apps.core.keyset import InvalidCursor, after_cursor, decode_cursor, encode_cursor, nullable_fields
+from apps.core.routers import replica_reads
+from .resources import RESOURCES, InvalidQuery, get_version, select_fields, serialize
+
+
+API_PAGE_SIZE = 20
+API_MAX_PAGE_SIZE = 100
+
+
+def _finish(response, etag=None):
+    if etag:
+        response['ETag'] = etag
+    response['Cache-Control'] = f'public, max-age={settings.API_MAX_AGE}'
+    # Read-only public data; let browser-based kiosk clients fetch it too
+    response['Access-Control-Allow-Origin'] = '*'
+    return response
+
+
+def _cached_response(request, name, build):
+    """
+    Serve a versioned response: 304 if the client's ETag is current, else the
+    cached body, else build(), which returns (status, payload).
+    """
+    version = get_version(name)
+    query = urlencode(sorted(request.GET.items()))
+    digest = hashlib.sha1(f'{request.get_host()}{request.path}?{query}'.encode()).hexdigest()[:20]
+    etag = f'W/"{version}-{digest}"'
+
+    if_none_match = request.headers.get('If-None-Match', '')
+    if etag in [tag.strip() for tag in if_none_match.split(',')]:
+        return _finish(HttpResponseNotModified(), etag)
+
+    cache_key = f'api:{name}:{version}:{digest}'
+    cached = cache.get(cache_key)
+    if cached is None:
+        try:
+            status, payload = build()
+        except (InvalidQuery, InvalidCursor) as error:
+            status, payload = 400, {'success': False, 'error': str(error)}
+        cached = (status, json.dumps(payload, cls=DjangoJSONEncoder))
+        cache.set(cache_key, cached, settings.API_CACHE_TIMEOUT)
+
+    status, body = cached
+    response = HttpResponse(body, status=status, content_type='application/json')
+    return _finish(response, etag if status == 200 else None)
+
+
+def _get_limit(request):
+    try:
+        limit = int(request.GET.get('limit', API_PAGE_SIZE))
+    except ValueError:
+        raise InvalidQuery('limit must be a number')
+    return max(1, min(limit, API_MAX_PAGE_SIZE))
+
+
+def _unknown_resource(name):
+    return _finish(JsonResponse({'success': False, 'error': f'Unknown resource: {name}'}, status=404))
+
+
+@require_safe
+def api_index(request):
+    """List the available resources"""
+    return _finish(JsonResponse({
+        'success': True,
+        'version': 1,
+        'resources': {
+            name: request.build_absolute_uri(reverse('api:list', kwargs={'resource': name}))
+            for name in RESOURCES
+        },
+    }))
+
+
+@require_safe
+@replica_reads
+def resource_list(request, resource):
+    """One page of a resource, ordered by its keyset"""
+    config = RESOURCES.get(resource)
+    if config is None:
+        return _unknown_resource(resource)
+
+    def build():
+        fields, children = select_fields(config, request.GET.get('fields'), detail=False)
+        limit = _get_limit(request)
+        model = apps.get_model(config['model'])
+        queryset = model.objects.filter(**config['filters']).order_by(*config['ordering'])
+        cursor = request.GET.get('cursor')
+        if cursor:
+            queryset = queryset.filter(
+                after_cursor(
+                    config['ordering'],
+                    decode_cursor(cursor, config['ordering'], model),
+                    nullable_fields(model, config['ordering']),
+                )
+            )
+
+        items, last_row = serialize(config, queryset, fields, children, limit=limit)
+        next_cursor = encode_cursor(last_row, config['ordering']) if last_row else None
+        next_url = None
+        if next_cursor:
+            params = request.GET.copy()
+            params['cursor'] = next_cursor
+            next_url = request.build_absolute_uri(f'{request.path}?{params.urlencode()}')
+        return 200, {'success': True, 'results': items, 'next_cursor': next_cursor, 'next': next_url}
+
+    return _cached_response(request, resource, build)
+
+
+@require_safe
+@replica_reads
+def resource_detail(request, resource, lookup):
+    """One item of a resource; detail responses include every field and child list"""
+    config = RESOURCES.get(resource)
+    if config is None:
+        return _unknown_resource(resource)
+
+    def build():
+        fields, children = select_fields(config, request.GET.get('fields'), detail=True)
+        if config['lookup'] == 'id' and not lookup.isdigit():
+            return 404, {'success': False, 'error': 'Not found'}
+        model = apps.get_model(config['model'])
+        queryset = model.objects.filter(**config['filters'], **{config['lookup']: lookup})
+        items, _ = serialize(config, queryset, fields, children)
+        if not items:
+            return 404, {'success': False, 'error': 'Not found'}
+        return 200, {'success': True, 'result': items[0]}
+
+    return _cached_response(request, resource, build)
@@ -1,3 +1,58 @@
-from django.test import TestCase
+from django.core import mail
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 
-# Create your tests here.
+from apps.core.models import OutgoingEmail
+from .models import ContactInquiry
+
+
+class ContactSubmitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def submit(self, email='ama@example.com'):
+        return self.client.post('/contact/submit/', {
+            'name': 'Ama Mensah',
+            'email': email,
+            'subject': 'general',
+            'message': 'Hello',
+        })
+
+    def test_notification_is_queued_not_sent(self):
+        response = self.client.post('/contact/submit/', {
+            'name': 'Ama Mensah',
+            'email': 'ama@example.com',
+            'subject': 'complaint',
+            'message': 'The street light on Main Road is out.',
+        })
+
+        self.assertRedirects(response, '/contact/', fetch_redirect_response=False)
+        self.assertEqual(ContactInquiry.objects.count(), 1)
+        self.assertEqual(len(mail.outbox), 0)
+
+        queued = OutgoingEmail.objects.get()
+        self.assertEqual(queued.status, 'queued')
+        self.assertEqual(queued.reply_to, 'ama@example.com')
+        self.assertIn('The street light on Main Road is out.', queued.body)
+
+    @override_settings(RATELIMIT_RATES={'contact': '2/10m'})
+    def test_burst_is_rejected_without_touching_database(self):
+        self.submit()
+        self.submit()
+
+        with self.assertNumQueries(0):
+            response = self.submit()
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(ContactInquiry.objects.count(), 2)
+
+    @override_settings(RATELIMIT_RATES={'contact': '2/10m'})
+    def test_same_email_is_limited_across_addresses(self):
+        self.submit(email='spam@example.com')
+        self.submit(email='SPAM@example.com')
+
+        response = self.client.post('/contact/submit/', {
+            'name': 'Spam', 'email': 'spam@example.com', 'message': 'Buy now',
+        }, REMOTE_ADDR='10.0.0.9')
+
+        self.assertEqual(response.status_code, 429)
@@ -1,9 +1,10 @@
 from django.shortcuts import render, redirect
 from django.contrib import messages
-from django.core.mail import send_mail
 from django.conf import settings
 from .models import ContactInquiry
+from apps.core.mail import queue_mail
 from apps.core.models import SiteSettings
+from apps.core.ratelimit import ratelimit
 
 
 def contact_page(request):
@@ -16,6 +17,7 @@ def contact_page(request):
     return render(request, 'contact/page.html', context)
 
 
+@ratelimit('contact', keys=('ip', 'post:email'))
 def contact_submit(request):
     """Handle contact form submission."""
     if request.method == 'POST':
@@ -41,12 +43,12 @@ def contact_submit(request):
                 message=message_text
             )
 
-            # Send email notification to site administrators
-            try:
-                admin_email = settings.DEFAULT_FROM_EMAIL
-                send_mail(
-                    subject=f'New Contact Inquiry: {inquiry.get_subject_display()}',
-                    message=f'''
+            # Queue the notification for site administrators; it is delivered
+            # by the send_queued_mail command, so the visitor never waits on SMTP
+            admin_email = settings.DEFAULT_FROM_EMAIL
+            queue_mail(
+                subject=f'New Contact Inquiry: {inquiry.get_subject_display()}',
+                message=f'''
 New contact inquiry from {name}
 
 Email: {email}
@@ -57,13 +59,11 @@ Message:
 {message_text}
 
 Submitted: {inquiry.submitted_date}
-                    '''.strip(),
-                    from_email=admin_email,
-                    recipient_list=[admin_email],
-                    fail_silently=True,
-                )
-            except Exception:
-                pass  # Don't fail if email doesn't send
+                '''.strip(),
+                from_email=admin_email,
+                recipient_list=[admin_email],
+                reply_to=email,
+            )
 
             messages.success(
                 request,
@@ -1,6 +1,7 @@
 from django.contrib import admin
+from django.utils import timezone
 from django.utils.html import format_html
-from .models import SiteSettings, HeroSlide, Statistic, AboutSection
+from .models import SiteSettings, HeroSlide, Statistic, AboutSection, OutgoingEmail
 
 
 @admin.register(SiteSettings)
@@ -128,3 +129,28 @@ class AboutSectionAdmin(admin.ModelAdmin):
         # Redirect to the single instance edit page
         obj = AboutSection.load()
         return self.changeform_view(request, str(obj.pk), extra_context=extra_context)
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    """Admin for the outgoing email queue (delivered by send_queued_mail)"""
+
+    list_display = ('subject', 'to', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('subject', 'to', 'last_error')
+    ordering = ('-created_at',)
+    readonly_fields = (
+        'subject', 'body', 'from_email', 'to', 'reply_to', 'attempts',
+        'last_error', 'created_at', 'sent_at',
+    )
+    actions = ['retry_now']
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description='Retry selected emails now')
+    def retry_now(self, request, queryset):
+        updated = queryset.exclude(status='sent').update(
+            status='queued', attempts=0, next_attempt_at=timezone.now()
+        )
+        self.message_user(request, f'{updated} email(s) queued for retry.')
@@ -4,3 +4,57 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.core'
+
+    def ready(self):
+        from django.contrib.auth.signals import user_logged_in
+        from django.core.signals import request_finished, request_started
+        from django.db.backends.signals import connection_created
+        from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+        from .db import (
+            configure_sqlite_connection, count_connection_opened,
+            track_request_finished, track_request_started,
+        )
+        from .facets import FACETS, category_model, invalidate_facets
+        from .images import IMAGE_FIELDS, process_image
+        from .routers import mark_primary_write
+        from .sessions import promote_session
+        from .similarity import SIMILARITY_INDEXES, schedule_delete_refresh, schedule_refresh
+        from .slugs import SLUG_MODELS, invalidate_slugs
+        from .syndication import FEEDS, SITEMAP_SECTIONS, schedule_update
+
+        connection_created.connect(configure_sqlite_connection)
+        connection_created.connect(count_connection_opened)
+        # Connected after django.db's close_old_connections, so these see
+        # which persistent connections survived the request boundary
+        request_started.connect(track_request_started)
+        request_finished.connect(track_request_finished)
+        post_save.connect(mark_primary_write, dispatch_uid='core_mark_primary_write_save')
+        post_delete.connect(mark_primary_write, dispatch_uid='core_mark_primary_write_delete')
+        user_logged_in.connect(promote_session, dispatch_uid='core_promote_session')
+
+        # Keep the pre-rendered sitemaps and feeds current
+        syndicated = {config['model'] for config in [*SITEMAP_SECTIONS.values(), *FEEDS.values()]}
+        for label in sorted(syndicated):
+            post_save.connect(schedule_update, sender=label, dispatch_uid=f'core_syndication_save_{label}')
+            post_delete.connect(schedule_update, sender=label, dispatch_uid=f'core_syndication_delete_{label}')
+
+        # Keep the precomputed "related" links current
+        for label in sorted({config['model'] for config in SIMILARITY_INDEXES.values()}):
+            post_save.connect(schedule_refresh, sender=label, dispatch_uid=f'core_similarity_save_{label}')
+            pre_delete.connect(schedule_delete_refresh, sender=label, dispatch_uid=f'core_similarity_delete_{label}')
+
+        # Normalise uploaded images and store what is derived from them
+        for label in sorted(IMAGE_FIELDS):
+            pre_save.connect(process_image, sender=label, dispatch_uid=f'core_process_image_{label}')
+
+        # Keep the slug resolution cache coherent with saves and deletes
+        for label in sorted(SLUG_MODELS):
+            post_save.connect(invalidate_slugs, sender=label, dispatch_uid=f'core_slugs_save_{label}')
+            post_delete.connect(invalidate_slugs, sender=label, dispatch_uid=f'core_slugs_delete_{label}')
+
+        # Keep the cached listing facet counts current
+        counted = {config['model'] for config in FACETS.values()}
+        counted |= {category_model(config)._meta.label for config in FACETS.values()}
+        for label in sorted(counted):
+            post_save.connect(invalidate_facets, sender=label, dispatch_uid=f'core_facets_save_{label}')
+            post_delete.connect(invalidate_facets, sender=label, dispatch_uid=f'core_facets_delete_{label}')
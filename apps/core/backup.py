@@ -0,0 +1,238 @@
+"""
+Consistent, compressed database backups.
+
+SQLite is copied with its online backup API, a few pages per step, so writers
+only wait for one step at a time instead of for the whole copy, and the copy
+is a consistent snapshot (copying db.sqlite3 with cp can capture a torn write
+and misses what is still in the -wal file). MySQL is dumped with mysqldump
+--single-transaction, a consistent snapshot that takes no table locks on InnoDB.
+
+Either way the output is streamed through zstd (when the optional zstandard
+package is installed) or gzip into BACKUP_ROOT, one file per generation:
+
+    db-20260101-020000.sqlite3.zst   the backup
+    db-20260101-020000.sqlite3.zst.sha256   checksum of the uncompressed data
+
+A snapshot identical to the previous generation is not stored again, and only
+the newest BACKUP_KEEP generations are kept.
+"""
+
+import gzip
+import hashlib
+import os
+import sqlite3
+import subprocess
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+CHUNK_SIZE = 1024 * 1024
+# Pages copied per backup step, and the pause between steps (seconds) that
+# lets writers in
+BACKUP_STEP_PAGES = 256
+BACKUP_STEP_SLEEP = 0.005
+
+EXTENSIONS = {'zstd': '.zst', 'gzip': '.gz'}
+
+
+class BackupError(Exception):
+    pass
+
+
+def get_root():
+    return Path(getattr(settings, 'BACKUP_ROOT', Path(settings.BASE_DIR) / 'backups'))
+
+
+def default_compression():
+    return 'zstd' if zstandard is not None else 'gzip'
+
+
+def open_compressed(path, compression, mode):
+    """Binary file object that (de)compresses path with the given codec"""
+    if compression == 'gzip':
+        return gzip.open(path, mode, compresslevel=6)
+    if zstandard is None:
+        raise BackupError('zstd compression needs the zstandard package')
+    raw = open(path, mode)
+    if mode == 'wb':
+        return zstandard.ZstdCompressor(level=10, threads=-1).stream_writer(raw, closefd=True)
+    return zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+
+
+def compression_for(path):
+    for compression, extension in EXTENSIONS.items():
+        if str(path).endswith(extension):
+            return compression
+    raise BackupError(f'{path} is not a compressed backup')
+
+
+def generations(root, kind):
+    """Existing backups of one kind ('sqlite3' or 'sql'), oldest first"""
+    suffixes = tuple(f'.{kind}{extension}' for extension in EXTENSIONS.values())
+    return sorted(
+        path for path in Path(root).glob('db-*')
+        if path.name.endswith(suffixes)
+    )
+
+
+def read_digest(path):
+    checksum_file = Path(f'{path}.sha256')
+    if not checksum_file.exists():
+        return None
+    return checksum_file.read_text().split(maxsplit=1)[0]
+
+
+def write_stream(chunks, destination, compression):
+    """Compress an iterable of byte chunks into destination; returns the sha256 of the input"""
+    digest = hashlib.sha256()
+    with open_compressed(destination, compression, 'wb') as output:
+        for chunk in chunks:
+            digest.update(chunk)
+            output.write(chunk)
+    return digest.hexdigest()
+
+
+def read_file(path):
+    with open(path, 'rb') as source:
+        yield from iter(lambda: source.read(CHUNK_SIZE), b'')
+
+
+def sqlite_snapshot(connection, target_path, pages=BACKUP_STEP_PAGES, sleep=BACKUP_STEP_SLEEP):
+    """Copy the database of a Django SQLite connection into target_path with the online backup API"""
+    if connection.in_atomic_block:
+        # The backup would wait forever for this connection's own write lock
+        raise BackupError('cannot back up from inside a transaction')
+    connection.ensure_connection()
+    target = sqlite3.connect(target_path)
+    try:
+        with target:
+            connection.connection.backup(target, pages=pages, sleep=sleep)
+        # The snapshot is a standalone file: no -wal/-shm siblings to carry around
+        target.execute('PRAGMA journal_mode = DELETE')
+    finally:
+        target.close()
+
+
+def mysql_dump(connection):
+    """Yield chunks of a consistent logical dump of a Django MySQL connection's database"""
+    params = connection.get_connection_params()
+    args = [
+        'mysqldump', '--single-transaction', '--quick', '--routines', '--triggers',
+        '--hex-blob', '--no-tablespaces', '--skip-dump-date',
+    ]
+    if params.get('user'):
+        args.append(f"--user={params['user']}")
+    if params.get('host'):
+        args.append(f"--host={params['host']}")
+    if params.get('port'):
+        args.append(f"--port={params['port']}")
+    if params.get('unix_socket'):
+        args.append(f"--socket={params['unix_socket']}")
+    args.append(connection.settings_dict['NAME'])
+
+    # The password goes through the environment, never the process list
+    env = {**os.environ}
+    if params.get('password'):
+        env['MYSQL_PWD'] = params['password']
+    try:
+        process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env)
+    except FileNotFoundError:
+        raise BackupError('mysqldump is not installed')
+    yield from iter(lambda: process.stdout.read(CHUNK_SIZE), b'')
+    stderr = process.communicate()[1]
+    if process.returncode:
+        raise BackupError(f'mysqldump failed: {stderr.decode(errors="replace").strip()}')
+
+
+def backup_database(connection, root=None, compression=None, keep=None):
+    """
+    Write a new backup generation of a database.
+
+    Returns (path, created): created is False when the data was identical to
+    the previous generation, which is then kept instead.
+    """
+    root = Path(root or get_root())
+    root.mkdir(parents=True, exist_ok=True)
+    compression = compression or default_compression()
+    keep = keep if keep is not None else getattr(settings, 'BACKUP_KEEP', 7)
+    stamp = timezone.now().strftime('%Y%m%d-%H%M%S')
+
+    kind = {'sqlite': 'sqlite3', 'mysql': 'sql'}.get(connection.vendor)
+    if kind is None:
+        raise BackupError(f'backups of {connection.vendor} databases are not supported')
+    previous = generations(root, kind)
+    destination = root / f'db-{stamp}.{kind}{EXTENSIONS[compression]}'
+    # Written under a temporary name, so a failed or unchanged backup never
+    # replaces an existing generation
+    partial = Path(f'{destination}.partial')
+    try:
+        if kind == 'sqlite3':
+            with tempfile.TemporaryDirectory(dir=root) as tmp:
+                snapshot = os.path.join(tmp, 'snapshot.sqlite3')
+                sqlite_snapshot(connection, snapshot)
+                digest = write_stream(read_file(snapshot), partial, compression)
+        else:
+            digest = write_stream(mysql_dump(connection), partial, compression)
+
+        if previous and read_digest(previous[-1]) == digest:
+            return previous[-1], False
+        os.replace(partial, destination)
+    finally:
+        partial.unlink(missing_ok=True)
+
+    Path(f'{destination}.sha256').write_text(f'{digest}  {destination.name.rsplit(".", 1)[0]}\n')
+    for path in generations(root, kind)[:-keep] if keep > 0 else []:
+        path.unlink()
+        Path(f'{path}.sha256').unlink(missing_ok=True)
+    return destination, True
+
+
+def restore_sqlite(backup_path, target_path):
+    """
+    Decompress a SQLite backup to target_path and check it.
+
+    The data must match the recorded checksum and pass PRAGMA integrity_check;
+    target_path is only replaced once both succeeded. Returns the number of
+    tables restored.
+    """
+    backup_path = Path(backup_path)
+    target_path = Path(target_path)
+    expected = read_digest(backup_path)
+    partial = target_path.with_name(f'{target_path.name}.restoring')
+    try:
+        digest = hashlib.sha256()
+        with open_compressed(backup_path, compression_for(backup_path), 'rb') as source, open(partial, 'wb') as output:
+            for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+                digest.update(chunk)
+                output.write(chunk)
+        if expected and digest.hexdigest() != expected:
+            raise BackupError(f'{backup_path.name} does not match its checksum')
+
+        database = sqlite3.connect(partial)
+        try:
+            result = database.execute('PRAGMA integrity_check').fetchone()[0]
+            tables = database.execute("SELECT count(*) FROM sqlite_master WHERE type = 'table'").fetchone()[0]
+        except sqlite3.DatabaseError as error:
+            raise BackupError(f'{backup_path.name} is not a valid database: {error}')
+        finally:
+            database.close()
+        if result != 'ok':
+            raise BackupError(f'{backup_path.name} failed the integrity check: {result}')
+        os.replace(partial, target_path)
+    finally:
+        partial.unlink(missing_ok=True)
+    return tables
+
+
+def verify_sqlite_backup(backup_path):
+    """Restore a backup into a scratch file; raises BackupError if it is unusable"""
+    with tempfile.TemporaryDirectory() as tmp:
+        return restore_sqlite(backup_path, os.path.join(tmp, 'restored.sqlite3'))
+
@@ -0,0 +1,148 @@
+"""
+Database connection tuning.
+
+SQLite is configured on every new connection: WAL journaling lets readers
+keep reading while a view or download counter is being written, and the
+busy timeout makes writers wait for the lock instead of failing with
+"database is locked".
+
+Persistent connections (CONN_MAX_AGE / CONN_HEALTH_CHECKS) are instrumented
+with opened / reused / stale counters, mainly to tune MySQL deployments.
+"""
+
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """connection_created handler that applies settings.SQLITE_PRAGMAS"""
+    if connection.vendor != 'sqlite':
+        return
+
+    pragmas = getattr(settings, 'SQLITE_PRAGMAS', {})
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            if value is None or value == '':
+                continue
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+# ============================================================================
+# Persistent connection metrics
+# ============================================================================
+#
+# With CONN_MAX_AGE > 0 a worker thread keeps its connection between requests.
+# Counters (per database alias):
+#   opened   - new connections established
+#   reused   - requests served on a connection kept from an earlier request
+#   stale    - kept connections discarded because they expired (CONN_MAX_AGE),
+#              errored, or failed the CONN_HEALTH_CHECKS ping
+#
+# Counters are kept in memory and added to the default cache every
+# CONNECTION_STATS_FLUSH_INTERVAL seconds, so they can be read across workers
+# when CACHE_URL points at a shared backend; the connection_stats command
+# refuses to run on a per-process one. They stay out of the database-backed
+# 'shared' cache, whose writes would open the very connections being counted.
+
+CONNECTION_METRICS = ('opened', 'reused', 'stale')
+CONNECTION_STATS_CACHE_PREFIX = 'db_connection_stats'
+CONNECTION_STATS_FLUSH_INTERVAL = 30  # seconds
+
+_pending = Counter()
+_pending_lock = threading.Lock()
+_last_flush = time.monotonic()
+_local = threading.local()
+
+
+def _record(alias, metric, amount=1):
+    with _pending_lock:
+        _pending[(alias, metric)] += amount
+
+
+def _open_aliases():
+    return {
+        conn.alias for conn in connections.all(initialized_only=True)
+        if conn.connection is not None
+    }
+
+
+def count_connection_opened(sender, connection, **kwargs):
+    """connection_created handler; a kept connection being replaced counts as stale"""
+    _record(connection.alias, 'opened')
+    carried = getattr(_local, 'carried', set())
+    if connection.alias in carried:
+        carried.discard(connection.alias)
+        _record(connection.alias, 'stale')
+
+
+def track_request_started(**kwargs):
+    """
+    request_started handler, runs after Django's close_old_connections.
+
+    Connections held at the end of the previous request are either still
+    open (carried into this request) or were just closed as obsolete.
+    """
+    held = getattr(_local, 'held', set())
+    still_open = _open_aliases()
+    for alias in held - still_open:
+        _record(alias, 'stale')
+    _local.carried = held & still_open
+
+
+def track_request_finished(**kwargs):
+    """request_finished handler, runs after Django's close_old_connections"""
+    for alias in getattr(_local, 'carried', set()):
+        _record(alias, 'reused')
+    _local.carried = set()
+    _local.held = _open_aliases()
+    flush_connection_stats()
+
+
+def flush_connection_stats(force=False):
+    """Add the in-memory counters to the shared cache totals"""
+    global _last_flush
+
+    now = time.monotonic()
+    if not force and now - _last_flush < CONNECTION_STATS_FLUSH_INTERVAL:
+        return
+    with _pending_lock:
+        pending = dict(_pending)
+        _pending.clear()
+        _last_flush = now
+
+    for (alias, metric), amount in pending.items():
+        key = f'{CONNECTION_STATS_CACHE_PREFIX}:{alias}:{metric}'
+        cache.add(key, 0, timeout=None)
+        try:
+            cache.incr(key, amount)
+        except ValueError:
+            cache.set(key, amount, timeout=None)
+
+
+def get_connection_stats(aliases=None):
+    """Return {alias: {metric: total}} from the cache"""
+    aliases = aliases or list(connections)
+    keys = {
+        f'{CONNECTION_STATS_CACHE_PREFIX}:{alias}:{metric}': (alias, metric)
+        for alias in aliases for metric in CONNECTION_METRICS
+    }
+    values = cache.get_many(keys)
+    stats = {alias: dict.fromkeys(CONNECTION_METRICS, 0) for alias in aliases}
+    for key, (alias, metric) in keys.items():
+        stats[alias][metric] = values.get(key, 0)
+    return stats
+
+
+def reset_connection_stats():
+    """Clear the pending and cached counters"""
+    with _pending_lock:
+        _pending.clear()
+    cache.delete_many([
+        f'{CONNECTION_STATS_CACHE_PREFIX}:{alias}:{metric}'
+        for alias in connections for metric in CONNECTION_METRICS
+    ])
@@ -0,0 +1,147 @@
+"""
+Faceted navigation counts for the public listings.
+
+The category and year filters of the news and documents listings show how
+many public items each choice holds. Those counts are the same for every
+visitor, so they are computed with one grouped query per listing,
+
+    SELECT category_id, <year>, COUNT(*) ... GROUP BY category_id, <year>
+
+and the resulting (category, year) -> count table is cached together with
+the categories. Every facet is summed from that table without another
+query, including combined ones: the years within the selected category and
+the categories within the selected year.
+
+The cache is versioned per listing and bumped when an item or a category is
+saved or deleted; counter-only saves (views, downloads) are ignored. Bulk
+queryset.update() sends no signals, so code changing visibility that way
+calls bump_facets_version() itself. The versions live in the shared cache,
+so a bump reaches every worker and not only the one that handled the save.
+
+The table is always built on the primary database: the listings are
+@replica_reads views, and counts from a replica that has not caught up yet
+would stay cached under the new version for a day.
+"""
+
+import time
+from collections import Counter
+
+from django.apps import apps
+from django.core.cache import cache, caches
+from django.db.models import Count, F
+
+# name -> listing definition: the public filters, the category foreign key,
+# the year (a field or a year transform) and the attribute the templates read
+# the category count from
+FACETS = {
+    'news': {
+        'model': 'news.NewsArticle',
+        'filters': {'status': 'published'},
+        'category': 'category',
+        'year': 'published_date__year',
+        'count_attribute': 'article_count',
+    },
+    'documents': {
+        'model': 'documents.Document',
+        'filters': {'is_public': True},
+        'category': 'category',
+        'year': 'document_year',
+        'count_attribute': 'doc_count',
+    },
+}
+
+COUNTER_FIELDS = {'views', 'download_count'}
+FACETS_CACHE_PREFIX = 'facets'
+FACETS_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def get_facets_version(name):
+    """Versions start from the clock, like the API resource versions"""
+    return caches['shared'].get_or_set(f'{FACETS_CACHE_PREFIX}_version:{name}', time.time_ns() // 1000, None)
+
+
+def bump_facets_version(name):
+    """Invalidate the cached counts of a listing, in every worker"""
+    key = f'{FACETS_CACHE_PREFIX}_version:{name}'
+    try:
+        caches['shared'].incr(key)
+    except ValueError:
+        caches['shared'].set(key, time.time_ns() // 1000, None)
+
+
+def category_model(config):
+    return apps.get_model(config['model'])._meta.get_field(config['category']).related_model
+
+
+def build_facet_table(name):
+    """Return (categories in display order, {(category_id, year): count}) from one grouped query on the primary"""
+    config = FACETS[name]
+    model = apps.get_model(config['model'])
+    category_field = model._meta.get_field(config['category']).attname
+    rows = (
+        model._default_manager.using('default').filter(**config['filters'])
+        .values(category_field, year=F(config['year']))
+        .annotate(count=Count('pk'))
+        .order_by()
+    )
+    table = {(row[category_field], row['year']): row['count'] for row in rows}
+    category_ids = {category_id for category_id, _ in table if category_id is not None}
+    categories = list(category_model(config)._default_manager.using('default').filter(pk__in=category_ids))
+    return categories, table
+
+
+def get_facets(name, category=None, year=None):
+    """
+    Category and year counts of a listing.
+
+    With a category (pk), the years are counted within it; with a year, the
+    categories are counted within it. Returns a dict with 'categories' (the
+    categories with items, each with its count set as the listing's
+    count_attribute), 'years' ([{'year', 'count'}], newest first, items
+    without a year left out) and 'total'.
+    """
+    config = FACETS[name]
+    key = f'{FACETS_CACHE_PREFIX}:{name}:{get_facets_version(name)}'
+    cached = cache.get(key)
+    if cached is None:
+        cached = build_facet_table(name)
+        cache.set(key, cached, FACETS_CACHE_TIMEOUT)
+    categories, table = cached
+
+    category_counts, year_counts = Counter(), Counter()
+    for (category_id, item_year), count in table.items():
+        if year is None or item_year == year:
+            category_counts[category_id] += count
+        if category is None or category_id == category:
+            year_counts[item_year] += count
+
+    facet_categories = []
+    for facet_category in categories:
+        if category_counts[facet_category.pk]:
+            setattr(facet_category, config['count_attribute'], category_counts[facet_category.pk])
+            facet_categories.append(facet_category)
+    return {
+        'categories': facet_categories,
+        'years': [
+            {'year': item_year, 'count': year_counts[item_year]}
+            for item_year in sorted((y for y in year_counts if y is not None), reverse=True)
+        ],
+        'total': sum(table.values()),
+    }
+
+
+def facets_for_model(model):
+    """Names of the listings counting rows of this model (items or categories)"""
+    label = model._meta.label
+    return [
+        name for name, config in FACETS.items()
+        if label in (config['model'], category_model(config)._meta.label)
+    ]
+
+
+def invalidate_facets(sender, instance, update_fields=None, **kwargs):
+    """post_save / post_delete handler"""
+    if update_fields is not None and set(update_fields) <= COUNTER_FIELDS:
+        return
+    for name in facets_for_model(sender):
+        bump_facets_version(name)
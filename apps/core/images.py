@@ -0,0 +1,246 @@
+"""
+Image uploads: normalisation, metadata, placeholders and thumbnails.
+
+Every model in IMAGE_FIELDS has one processed image field. When a new file is
+assigned, process_image (a pre_save handler, so the admin, the staff portal
+and the shell all go through it) decodes it once, before it reaches storage,
+and from that single decode:
+
+- normalises it: applies the EXIF orientation, downscales it to the field's
+  maximum size (IMAGE_MAX_SIZES setting), drops EXIF (camera, GPS) and
+  re-encodes it at IMAGE_UPLOAD_QUALITY;
+- stores its size, dominant colour and a tiny blurred placeholder next to it
+  (<field>_width, <field>_height, <field>_color, <field>_placeholder), so
+  templates can reserve the image's box and paint a preview without ever
+  opening the file;
+- renders the listing thumbnail, for models that have one.
+
+`manage.py backfill_image_metadata` fills in the metadata of files uploaded
+before it existed.
+"""
+
+import base64
+import io
+import logging
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+logger = logging.getLogger(__name__)
+
+# model label -> processed image field, its default maximum size and optional
+# thumbnail field (with the size it fits in)
+IMAGE_FIELDS = {
+    'core.HeroSlide': {'field': 'image', 'max_size': (2560, 1600)},
+    'gallery.GalleryImage': {'field': 'image', 'max_size': (2048, 2048), 'thumbnail': ('thumbnail', (600, 600))},
+    'news.NewsArticle': {'field': 'featured_image', 'max_size': (1600, 1600)},
+    'projects.ProjectImage': {'field': 'image', 'max_size': (2048, 2048)},
+    'staff.StaffMember': {'field': 'photo', 'max_size': (800, 800)},
+}
+
+# Formats re-encoded on upload; others (e.g. animated GIFs) are stored as uploaded
+NORMALISED_FORMATS = {'JPEG', 'PNG', 'WEBP'}
+THUMBNAIL_QUALITY = 80
+
+# Placeholders are upscaled and blurred by the browser, so a few pixels are enough
+PLACEHOLDER_SIZE = (16, 16)
+PLACEHOLDER_FORMAT = 'WEBP' if features.check('webp') else 'PNG'
+COLOR_SAMPLE_SIZE = (64, 64)
+
+READ_ERRORS = (OSError, UnidentifiedImageError, Image.DecompressionBombError)
+
+
+def get_max_size(label):
+    """Maximum (width, height) of a model's image, overridable per model in settings"""
+    overrides = getattr(settings, 'IMAGE_MAX_SIZES', {})
+    return tuple(overrides.get(label, IMAGE_FIELDS[label]['max_size']))
+
+
+def fit_size(size, max_size):
+    """Largest size with the aspect ratio of `size` that fits in max_size (never upscaled)"""
+    width, height = size
+    scale = min(1, max_size[0] / width, max_size[1] / height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def _is_transposed(image):
+    """True if the EXIF orientation swaps width and height"""
+    return image.getexif().get(0x0112) in (5, 6, 7, 8)
+
+
+def open_image(field_file, max_size=None):
+    """
+    Decode a stored or freshly uploaded file with orientation applied.
+
+    With max_size, a JPEG is decoded at the smallest DCT scale that still
+    covers the size it will be reduced to, so a phone photo never occupies
+    its full resolution in memory.
+    """
+    was_closed = field_file.closed
+    field_file.open('rb')
+    try:
+        field_file.seek(0)
+        image = Image.open(field_file)
+        if max_size is not None and image.format == 'JPEG':
+            box = max_size[::-1] if _is_transposed(image) else max_size
+            image.draft(image.mode, fit_size(image.size, box))
+        image.load()
+    finally:
+        if was_closed:
+            field_file.close()
+        else:
+            field_file.seek(0)
+    oriented = ImageOps.exif_transpose(image)
+    oriented.format = image.format
+    return oriented
+
+
+def normalise_image(image, max_size):
+    """
+    Downscale an oriented image to fit max_size and re-encode it without EXIF.
+
+    Returns (image, encoded bytes). The colour profile is kept so colours do
+    not shift.
+    """
+    image_format = image.format
+    target = fit_size(image.size, max_size)
+    if target != image.size:
+        image = image.resize(target, Image.Resampling.LANCZOS)
+
+    options = {'icc_profile': image.info.get('icc_profile')}
+    quality = getattr(settings, 'IMAGE_UPLOAD_QUALITY', 85)
+    if image_format == 'JPEG':
+        if image.mode not in ('RGB', 'L', 'CMYK'):
+            image = image.convert('RGB')
+        options.update(quality=quality, optimize=True, progressive=True)
+    elif image_format == 'WEBP':
+        options.update(quality=quality)
+    else:
+        options.update(optimize=True)
+
+    output = io.BytesIO()
+    image.save(output, image_format, **{key: value for key, value in options.items() if value is not None})
+    image.format = image_format
+    return image, output.getvalue()
+
+
+def render_thumbnail(image, max_size):
+    """
+    Downscale a Pillow image to fit in max_size (width, height).
+
+    Returns a ContentFile named after the format: JPEG, or PNG for images with
+    transparency.
+    """
+    thumbnail = image.copy()
+    thumbnail.thumbnail(max_size, Image.Resampling.LANCZOS)
+
+    output = io.BytesIO()
+    if thumbnail.mode in ('RGBA', 'LA') or 'transparency' in thumbnail.info:
+        thumbnail.save(output, 'PNG', optimize=True)
+        extension = 'png'
+    else:
+        thumbnail.convert('RGB').save(output, 'JPEG', quality=THUMBNAIL_QUALITY, optimize=True, progressive=True)
+        extension = 'jpg'
+    return ContentFile(output.getvalue(), name=f'thumbnail.{extension}')
+
+
+def dominant_color(image):
+    """Most common colour of a reduced palette, as #rrggbb"""
+    sample = image.convert('RGB')
+    sample.thumbnail(COLOR_SAMPLE_SIZE)
+    palette_image = sample.quantize(colors=4)
+    palette = palette_image.getpalette()
+    _, index = max(palette_image.getcolors())
+    red, green, blue = palette[index * 3:index * 3 + 3]
+    return f'#{red:02x}{green:02x}{blue:02x}'
+
+
+def placeholder_data_uri(image):
+    """A PLACEHOLDER_SIZE rendition of the image as a data: URI (usually under 200 bytes)"""
+    small = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+    small.thumbnail(PLACEHOLDER_SIZE)
+    output = io.BytesIO()
+    small.save(output, PLACEHOLDER_FORMAT, quality=40)
+    encoded = base64.b64encode(output.getvalue()).decode()
+    return f'data:image/{PLACEHOLDER_FORMAT.lower()};base64,{encoded}'
+
+
+def image_metadata(image):
+    """Return the values stored for one image, keyed by field suffix"""
+    return {
+        'width': image.width,
+        'height': image.height,
+        'color': dominant_color(image),
+        'placeholder': placeholder_data_uri(image),
+    }
+
+
+def read_image_metadata(path):
+    """
+    Metadata of the image file at `path`, or None if it cannot be read.
+
+    Only needs Pillow, so it can run in worker processes.
+    """
+    try:
+        with Image.open(path) as image:
+            image.load()
+            return image_metadata(ImageOps.exif_transpose(image))
+    except READ_ERRORS:
+        return None
+
+
+def metadata_fields(field):
+    return {suffix: f'{field}_{suffix}' for suffix in ('width', 'height', 'color', 'placeholder')}
+
+
+def apply_image_metadata(instance, field, metadata):
+    """Set the stored metadata of an instance (cleared when metadata is None)"""
+    for suffix, name in metadata_fields(field).items():
+        if metadata is None:
+            setattr(instance, name, None if suffix in ('width', 'height') else '')
+        else:
+            setattr(instance, name, metadata[suffix])
+
+
+def process_image(sender, instance, raw=False, update_fields=None, **kwargs):
+    """pre_save handler: normalise a newly assigned image and store what is derived from it"""
+    label = sender._meta.label
+    config = IMAGE_FIELDS[label]
+    field = config['field']
+    if raw or (update_fields is not None and field not in update_fields):
+        return
+
+    field_file = getattr(instance, field)
+    if not field_file:
+        apply_image_metadata(instance, field, None)
+        return
+
+    new_upload = not field_file._committed
+    thumbnail_field, thumbnail_size = config.get('thumbnail', (None, None))
+    missing = getattr(instance, f'{field}_width') is None or (
+        thumbnail_field and not getattr(instance, thumbnail_field)
+    )
+    # An unchanged file is never reopened once everything derived from it exists
+    if not new_upload and not missing:
+        return
+
+    max_size = get_max_size(label)
+    try:
+        image = open_image(field_file, max_size if new_upload else None)
+        if new_upload and image.format in NORMALISED_FORMATS:
+            image, content = normalise_image(image, max_size)
+            # Replaces the upload; FileField.pre_save then stores this content
+            setattr(instance, field, ContentFile(content, name=os.path.basename(field_file.name)))
+            field_file = getattr(instance, field)
+    except READ_ERRORS:
+        logger.warning('Could not read image %s', field_file.name, exc_info=True)
+        apply_image_metadata(instance, field, None)
+        return
+
+    apply_image_metadata(instance, field, image_metadata(image))
+    if thumbnail_field:
+        content = render_thumbnail(image, thumbnail_size)
+        stem = os.path.splitext(os.path.basename(field_file.name))[0]
+        getattr(instance, thumbnail_field).save(f'{stem}{os.path.splitext(content.name)[1]}', content, save=False)
@@ -0,0 +1,108 @@
+"""
+Keyset ("cursor") pagination helpers.
+
+A cursor is the url-safe base64 JSON of the ordering values of the last row
+on a page; the next page is the rows strictly after it in that ordering,
+which stays one index range scan however deep the client scrolls. The
+ordering must end with a unique field so every row has its own position.
+
+NULLs are taken to sort before every value, as they do on SQLite and MySQL,
+so in a descending ordering they come last.
+"""
+
+import base64
+import binascii
+import datetime
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    """A cursor that was not produced by encode_cursor() for this ordering"""
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """Keeps full microsecond precision, which DjangoJSONEncoder truncates"""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(row, ordering):
+    """Cursor for the position of `row`, a mapping of field name -> value"""
+    values = [row[field.lstrip('-')] for field in ordering]
+    payload = json.dumps(values, cls=CursorEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, ordering, model):
+    """
+    Return the ordering values of a cursor, as the Python types of model's fields.
+
+    Anything encode_cursor() could not have produced for this ordering (bad
+    base64, a value of the wrong type, NULL for a non-nullable field) raises
+    InvalidCursor, so a tampered cursor is a client error, not a failed query.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor('Invalid cursor')
+    if not isinstance(values, list) or len(values) != len(ordering):
+        raise InvalidCursor('Invalid cursor')
+
+    converted = []
+    for name, value in zip(ordering, values):
+        name = name.lstrip('-')
+        field = model._meta.pk if name == 'pk' else model._meta.get_field(name)
+        if value is None:
+            if not field.null:
+                raise InvalidCursor('Invalid cursor')
+            converted.append(None)
+            continue
+        if isinstance(value, (list, dict)):
+            raise InvalidCursor('Invalid cursor')
+        try:
+            converted.append(field.to_python(value))
+        except (ValidationError, TypeError, ValueError):
+            raise InvalidCursor('Invalid cursor')
+    return converted
+
+
+def nullable_fields(model, ordering):
+    """Names of the ordering fields of model that may be NULL, for after_cursor()"""
+    names = (field.lstrip('-') for field in ordering)
+    return {name for name in names if name != 'pk' and model._meta.get_field(name).null}
+
+
+def after_cursor(ordering, values, nullable=()):
+    """
+    Build the keyset condition for rows after the cursor position.
+
+    For ordering (a, -b, c): a > x OR (a = x AND b < y) OR (a = x AND b = y AND c > z)
+
+    Args:
+        nullable: Names of ordering fields that may be NULL
+    """
+    condition = Q(pk__in=[])
+    equal = Q()
+    for field, value in zip(ordering, values):
+        name = field.lstrip('-')
+        descending = field.startswith('-')
+        if value is None:
+            # Only non-NULL values follow a NULL, and only when ascending
+            after = None if descending else Q(**{f'{name}__isnull': False})
+            same = Q(**{f'{name}__isnull': True})
+        else:
+            after = Q(**{f"{name}__{'lt' if descending else 'gt'}": value})
+            if descending and name in nullable:
+                after |= Q(**{f'{name}__isnull': True})
+            same = Q(**{name: value})
+        if after is not None:
+            condition |= equal & after
+        equal &= same
+    return condition
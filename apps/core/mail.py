@@ -0,0 +1,135 @@
+"""
+Outbound email queue.
+
+Views call queue_mail() instead of send_mail(), which only inserts an
+OutgoingEmail row, so a slow or unreachable mail server never holds up a
+visitor's request. The send_queued_mail command delivers the queue in
+batches over one SMTP connection and retries failures with backoff.
+"""
+
+import logging
+import smtplib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY = 60  # seconds; doubles after every failed attempt
+RETRY_MAX_DELAY = 6 * 60 * 60
+# A claimed batch is pushed this far into the future so a second worker
+# does not pick it up while the first is still sending it
+CLAIM_TIMEOUT = timedelta(minutes=10)
+
+
+def queue_mail(subject, message, recipient_list, from_email=None, reply_to=None):
+    """Add an email to the outbox and return the OutgoingEmail"""
+    return OutgoingEmail.objects.create(
+        subject=subject[:255],
+        body=message,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=', '.join(recipient_list),
+        reply_to=reply_to or '',
+    )
+
+
+def retry_delay(attempts):
+    """Return the backoff before the next attempt after `attempts` failures"""
+    return timedelta(seconds=min(RETRY_BASE_DELAY * 2 ** (attempts - 1), RETRY_MAX_DELAY))
+
+
+def claim_batch(batch_size):
+    """Lock up to batch_size due emails for this worker and return them"""
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            OutgoingEmail.objects
+            .select_for_update(skip_locked=True)
+            .filter(status='queued', next_attempt_at__lte=now)
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        if batch:
+            OutgoingEmail.objects.filter(pk__in=[email.pk for email in batch]).update(
+                next_attempt_at=now + CLAIM_TIMEOUT
+            )
+    return batch
+
+
+def _to_message(email, connection):
+    return EmailMessage(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email,
+        to=email.recipients,
+        reply_to=[email.reply_to] if email.reply_to else None,
+        connection=connection,
+    )
+
+
+def _record_failure(email, error, max_attempts):
+    email.attempts += 1
+    email.last_error = str(error)[:1000]
+    if email.attempts >= max_attempts:
+        email.status = 'failed'
+        logger.error('Giving up on outgoing email %s after %s attempts: %s', email.pk, email.attempts, error)
+    else:
+        email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+        logger.warning('Outgoing email %s failed (attempt %s): %s', email.pk, email.attempts, error)
+    email.save(update_fields=['attempts', 'last_error', 'status', 'next_attempt_at'])
+
+
+def send_batch(batch, max_attempts=MAX_ATTEMPTS):
+    """
+    Deliver a claimed batch over a single mail connection.
+
+    Returns:
+        (sent, failed) counts. A failed email stays queued for a retry until
+        it reaches max_attempts.
+    """
+    sent = failed = 0
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as error:
+        # Server unreachable: the whole batch waits for the next retry
+        for email in batch:
+            _record_failure(email, error, max_attempts)
+        return 0, len(batch)
+
+    try:
+        for index, email in enumerate(batch):
+            try:
+                connection.send_messages([_to_message(email, connection)])
+            except smtplib.SMTPServerDisconnected as error:
+                _record_failure(email, error, max_attempts)
+                failed += 1
+                # Reconnect for the rest of the batch
+                connection.close()
+                try:
+                    connection.open()
+                except Exception as reconnect_error:
+                    # Server gone: the rest of the batch waits for the next retry
+                    remaining = batch[index + 1:]
+                    for pending in remaining:
+                        _record_failure(pending, reconnect_error, max_attempts)
+                    return sent, failed + len(remaining)
+            except Exception as error:
+                _record_failure(email, error, max_attempts)
+                failed += 1
+            else:
+                email.attempts += 1
+                email.status = 'sent'
+                email.sent_at = timezone.now()
+                email.last_error = ''
+                email.save(update_fields=['attempts', 'status', 'sent_at', 'last_error'])
+                sent += 1
+    finally:
+        connection.close()
+
+    return sent, failed
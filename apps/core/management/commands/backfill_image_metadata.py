@@ -0,0 +1,83 @@
+"""Store dimensions, colour and placeholders of existing images (see apps/core/images.py)"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.api.resources import bump_version, resources_for_model
+from apps.core.images import IMAGE_FIELDS, metadata_fields, read_image_metadata
+
+
+class Command(BaseCommand):
+    help = 'Compute the stored metadata of images uploaded before it existed, in parallel'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--model', choices=sorted(IMAGE_FIELDS), action='append',
+            help='Only process this model (repeatable; default: all)'
+        )
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Recompute images that already have metadata too'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Worker processes decoding images (default: one per CPU; 1 runs in this process)'
+        )
+        parser.add_argument('--batch-size', type=int, default=200, help='Rows written per UPDATE batch')
+
+    def handle(self, *args, **options):
+        workers = max(1, options['workers'])
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            for label in options['model'] or IMAGE_FIELDS:
+                self.backfill(label, executor, options['all'], options['batch_size'])
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def backfill(self, label, executor, recompute, batch_size):
+        model = apps.get_model(label)
+        field = IMAGE_FIELDS[label]['field']
+        names = metadata_fields(field)
+
+        queryset = model.objects.exclude(**{field: ''}).order_by('pk')
+        if not recompute:
+            queryset = queryset.filter(**{f"{names['width']}__isnull": True})
+        rows = list(queryset.values_list('pk', field))
+
+        try:
+            paths = [default_storage.path(name) for _, name in rows]
+        except NotImplementedError:
+            raise CommandError('backfill_image_metadata needs media stored on the local filesystem')
+
+        # Decoding is CPU-bound, so it runs in worker processes; only the
+        # results come back here to be written
+        results = executor.map(read_image_metadata, paths, chunksize=16) if executor else map(read_image_metadata, paths)
+
+        updated, failed, batch = 0, [], []
+        for (pk, name), metadata in zip(rows, results):
+            if metadata is None:
+                failed.append(name)
+                continue
+            instance = model(pk=pk)
+            for suffix, attribute in names.items():
+                setattr(instance, attribute, metadata[suffix])
+            batch.append(instance)
+            if len(batch) >= batch_size:
+                updated += model.objects.bulk_update(batch, list(names.values()))
+                batch = []
+        if batch:
+            updated += model.objects.bulk_update(batch, list(names.values()))
+
+        if updated:
+            # bulk_update sends no signals; let cached API responses pick the values up
+            for resource in resources_for_model(model):
+                bump_version(resource)
+
+        for name in failed:
+            self.stderr.write(f'{label}: could not read {name}')
+        self.stdout.write(self.style.SUCCESS(f'{label}: stored metadata for {updated} image(s), {len(failed)} unreadable.'))
@@ -0,0 +1,44 @@
+"""Write a compressed backup generation of the database (see apps/core/backup.py)"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from apps.core.backup import EXTENSIONS, BackupError, backup_database, get_root, verify_sqlite_backup
+
+
+class Command(BaseCommand):
+    help = 'Back up the database without blocking writers, compressed, keeping the newest generations'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default='default',
+            help='Database alias to back up (default: default)'
+        )
+        parser.add_argument(
+            '--compression', choices=sorted(EXTENSIONS),
+            help='Codec (default: zstd if the zstandard package is installed, else gzip)'
+        )
+        parser.add_argument('--keep', type=int, help='Generations to keep (default: BACKUP_KEEP)')
+        parser.add_argument('--output-dir', help='Directory of the generations (default: BACKUP_ROOT)')
+        parser.add_argument(
+            '--verify', action='store_true',
+            help='Restore the new SQLite backup into a scratch file and check its integrity'
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        try:
+            path, created = backup_database(
+                connection, options['output_dir'], options['compression'], options['keep'],
+            )
+            if options['verify'] and connection.vendor == 'sqlite':
+                tables = verify_sqlite_backup(path)
+                self.stdout.write(f'Verified {path.name}: {tables} table(s), integrity ok.')
+        except BackupError as error:
+            raise CommandError(str(error))
+
+        if created:
+            self.stdout.write(self.style.SUCCESS(f'Backed up {options["database"]} to {path} ({path.stat().st_size} bytes).'))
+        else:
+            self.stdout.write(f'Unchanged since {path.name}; no new generation written to {options["output_dir"] or get_root()}.')
@@ -0,0 +1,81 @@
+"""
+Benchmark per-request database latency with and without persistent connections.
+
+Simulates request boundaries with the request_started / request_finished
+signals, so Django closes or keeps the connection exactly as it would between
+real requests, and runs a few typical page queries in between. The gain is
+small on SQLite and large on MySQL, where each new connection costs a TCP
+handshake and authentication.
+"""
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.signals import request_finished, request_started
+from django.db import connections
+
+from apps.core.db import flush_connection_stats, get_connection_stats, reset_connection_stats
+from apps.core.models import SiteSettings
+from apps.news.models import NewsArticle
+
+
+class Command(BaseCommand):
+    help = 'Compare per-request latency with CONN_MAX_AGE=0 and with persistent connections'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Requests per profile (default: 500)')
+        parser.add_argument('--max-age', type=int, default=60, help='CONN_MAX_AGE for the reuse profile (default: 60)')
+        parser.add_argument('--database', default='default', help='Database alias (default: default)')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        original = dict(connection.settings_dict)
+        profiles = [
+            ('no reuse (CONN_MAX_AGE=0)', 0, False),
+            (f"reuse (CONN_MAX_AGE={options['max_age']})", options['max_age'], True),
+        ]
+
+        self.stdout.write(f"{options['requests']} requests per profile on '{connection.alias}' ({connection.vendor})\n")
+        self.stdout.write(f"{'Profile':<28} {'mean ms':>8} {'p50 ms':>8} {'p95 ms':>8} {'opened':>7} {'reused':>7}")
+
+        try:
+            for label, max_age, health_checks in profiles:
+                connection.close()
+                connection.settings_dict['CONN_MAX_AGE'] = max_age
+                connection.settings_dict['CONN_HEALTH_CHECKS'] = health_checks
+                reset_connection_stats()
+
+                timings = self._run(options['database'], options['requests'])
+
+                flush_connection_stats(force=True)
+                counts = get_connection_stats([connection.alias])[connection.alias]
+                timings.sort()
+                self.stdout.write(
+                    f'{label:<28} {statistics.mean(timings):>8.3f} '
+                    f'{timings[len(timings) // 2]:>8.3f} {timings[int(len(timings) * 0.95)]:>8.3f} '
+                    f"{counts['opened']:>7} {counts['reused']:>7}"
+                )
+        finally:
+            connection.close()
+            connection.settings_dict.clear()
+            connection.settings_dict.update(original)
+            reset_connection_stats()
+
+    def _run(self, using, count):
+        timings = []
+        for _ in range(count):
+            start = time.perf_counter()
+            request_started.send(sender=self.__class__)
+            try:
+                SiteSettings.objects.using(using).first()
+                list(
+                    NewsArticle.objects.using(using)
+                    .filter(status='published')
+                    .order_by('-published_date')
+                    .values('id', 'title')[:10]
+                )
+            finally:
+                request_finished.send(sender=self.__class__)
+            timings.append((time.perf_counter() - start) * 1000)
+        return timings
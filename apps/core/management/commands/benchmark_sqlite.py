@@ -0,0 +1,128 @@
+"""
+Benchmark concurrent SQLite reads and writes before and after connection tuning.
+
+Runs against a throwaway database file, never the site database. Readers run
+listing-style SELECTs while writers increment counters the way the news view
+counter and document download counter do.
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+# Behaviour before tuning: rollback journal, full fsync, Python's default 5s timeout
+DEFAULT_PROFILE = {
+    'journal_mode': 'delete',
+    'synchronous': 'full',
+}
+
+
+class Command(BaseCommand):
+    help = 'Measure SQLite reader/writer throughput with default and tuned pragmas'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=8, help='Reader threads (default: 8)')
+        parser.add_argument('--writers', type=int, default=2, help='Writer threads (default: 2)')
+        parser.add_argument('--duration', type=float, default=5.0, help='Seconds per profile (default: 5)')
+        parser.add_argument('--rows', type=int, default=5000, help='Rows in the test table (default: 5000)')
+
+    def handle(self, *args, **options):
+        profiles = [
+            ('default (rollback journal)', DEFAULT_PROFILE),
+            ('tuned (SQLITE_PRAGMAS)', settings.SQLITE_PRAGMAS),
+        ]
+
+        self.stdout.write(
+            f"{options['readers']} readers, {options['writers']} writers, "
+            f"{options['duration']}s per profile, {options['rows']} rows\n"
+        )
+        self.stdout.write(f"{'Profile':<28} {'reads/s':>10} {'writes/s':>10} {'locked':>8}")
+
+        for label, pragmas in profiles:
+            with tempfile.TemporaryDirectory() as tmpdir:
+                path = os.path.join(tmpdir, 'benchmark.sqlite3')
+                self._create_database(path, pragmas, options['rows'])
+                reads, writes, locked = self._run(path, pragmas, options)
+
+            duration = options['duration']
+            self.stdout.write(
+                f'{label:<28} {reads / duration:>10.0f} {writes / duration:>10.0f} {locked:>8}'
+            )
+
+    def _connect(self, path, pragmas):
+        connection = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        for name, value in pragmas.items():
+            if value is not None and value != '':
+                connection.execute(f'PRAGMA {name} = {value}')
+        return connection
+
+    def _create_database(self, path, pragmas, rows):
+        connection = self._connect(path, pragmas)
+        connection.execute(
+            'CREATE TABLE article (id INTEGER PRIMARY KEY, title TEXT, status TEXT, '
+            'published INTEGER, views INTEGER NOT NULL DEFAULT 0)'
+        )
+        connection.execute('CREATE INDEX article_status_published ON article (status, published DESC)')
+        connection.execute('BEGIN')
+        connection.executemany(
+            'INSERT INTO article (title, status, published) VALUES (?, ?, ?)',
+            ((f'Article {i}', 'published' if i % 5 else 'draft', i) for i in range(rows))
+        )
+        connection.execute('COMMIT')
+        connection.close()
+
+    def _run(self, path, pragmas, options):
+        stop = threading.Event()
+        counts = {'reads': 0, 'writes': 0, 'locked': 0}
+        lock = threading.Lock()
+
+        def record(key):
+            with lock:
+                counts[key] += 1
+
+        def reader():
+            connection = self._connect(path, pragmas)
+            while not stop.is_set():
+                try:
+                    connection.execute('BEGIN')
+                    connection.execute(
+                        "SELECT id, title, views FROM article WHERE status = 'published' "
+                        'ORDER BY published DESC LIMIT 12'
+                    ).fetchall()
+                    connection.execute('SELECT COUNT(*) FROM article WHERE status = ?', ('published',)).fetchone()
+                    connection.execute('COMMIT')
+                    record('reads')
+                except sqlite3.OperationalError:
+                    if connection.in_transaction:
+                        connection.execute('ROLLBACK')
+                    record('locked')
+            connection.close()
+
+        def writer(seed):
+            connection = self._connect(path, pragmas)
+            article_id = seed
+            while not stop.is_set():
+                article_id = (article_id * 7919 + 1) % options['rows'] + 1
+                try:
+                    connection.execute('UPDATE article SET views = views + 1 WHERE id = ?', (article_id,))
+                    record('writes')
+                except sqlite3.OperationalError:
+                    record('locked')
+            connection.close()
+
+        threads = [threading.Thread(target=reader) for _ in range(options['readers'])]
+        threads += [threading.Thread(target=writer, args=(i,)) for i in range(options['writers'])]
+        for thread in threads:
+            thread.start()
+        time.sleep(options['duration'])
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        return counts['reads'], counts['writes'], counts['locked']
@@ -0,0 +1,28 @@
+"""Recompute the "related" news and project links (see apps/core/similarity.py)"""
+
+from django.core.management.base import BaseCommand
+
+from apps.core.similarity import SIMILARITY_INDEXES, rebuild, refresh_pending
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the TF-IDF similarity index behind related articles and projects'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--index', choices=sorted(SIMILARITY_INDEXES), action='append',
+            help='Only rebuild this index (repeatable; default: all)'
+        )
+        parser.add_argument(
+            '--pending', action='store_true',
+            help='Only apply the refreshes queued by saves and deletes (run every few minutes)'
+        )
+
+    def handle(self, *args, **options):
+        for name in options['index'] or SIMILARITY_INDEXES:
+            if options['pending']:
+                refreshed = refresh_pending(name)
+                self.stdout.write(self.style.SUCCESS(f'{name}: refreshed {refreshed} queued item(s).'))
+            else:
+                stored = rebuild(name)
+                self.stdout.write(self.style.SUCCESS(f'{name}: stored {stored} related link(s).'))
@@ -0,0 +1,13 @@
+"""Rebuild the pre-rendered sitemaps and feeds (see apps/core/syndication.py)"""
+
+from django.core.management.base import BaseCommand
+
+from apps.core.syndication import get_root, rebuild_all
+
+
+class Command(BaseCommand):
+    help = 'Regenerate every sitemap chunk, the sitemap index and the RSS/Atom feeds'
+
+    def handle(self, *args, **options):
+        written = rebuild_all()
+        self.stdout.write(self.style.SUCCESS(f'Wrote {written} sitemap file(s) and the feeds to {get_root()}.'))
@@ -0,0 +1,50 @@
+"""Checkpoint the SQLite write-ahead log into the main database file"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = 'Checkpoint the SQLite WAL file (run from cron to keep the -wal file small)'
+
+    MODES = ['PASSIVE', 'FULL', 'RESTART', 'TRUNCATE']
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--mode',
+            choices=self.MODES,
+            default='TRUNCATE',
+            type=str.upper,
+            help='Checkpoint mode (default: TRUNCATE, which also empties the -wal file)'
+        )
+        parser.add_argument(
+            '--database',
+            default='default',
+            help='Database alias to checkpoint (default: default)'
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError('checkpoint_wal only applies to SQLite databases.')
+
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            journal_mode = cursor.fetchone()[0]
+            if journal_mode.lower() != 'wal':
+                self.stdout.write(f'Journal mode is {journal_mode}; nothing to checkpoint.')
+                return
+
+            cursor.execute(f"PRAGMA wal_checkpoint({options['mode']})")
+            busy, log_frames, checkpointed = cursor.fetchone()
+
+        if busy:
+            self.stdout.write(self.style.WARNING(
+                f'Checkpoint could not complete: database busy '
+                f'({checkpointed} of {log_frames} frames checkpointed).'
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'WAL checkpoint ({options["mode"]}) complete: '
+                f'{checkpointed} of {log_frames} frames checkpointed.'
+            ))
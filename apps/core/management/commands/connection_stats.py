@@ -0,0 +1,40 @@
+"""Show persistent database connection counters collected by apps/core/db.py"""
+
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from apps.core.db import flush_connection_stats, get_connection_stats, reset_connection_stats
+
+
+class Command(BaseCommand):
+    help = 'Show how many database connections were opened, reused and discarded as stale'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Clear the counters after showing them')
+
+    def handle(self, *args, **options):
+        if isinstance(caches['default'], (LocMemCache, DummyCache)):
+            # This process would only see its own (empty) counters
+            raise CommandError(
+                'The web workers count connections in their own process cache; '
+                'set CACHE_URL to a shared backend (e.g. filecache:///path) to collect them.'
+            )
+        flush_connection_stats(force=True)
+        stats = get_connection_stats()
+
+        self.stdout.write(f"{'Database':<12} {'max age':>8} {'opened':>8} {'reused':>8} {'stale':>8} {'reuse %':>8}")
+        for alias, counts in stats.items():
+            max_age = connections[alias].settings_dict.get('CONN_MAX_AGE')
+            served = counts['opened'] + counts['reused']
+            reuse_rate = 100 * counts['reused'] / served if served else 0
+            self.stdout.write(
+                f"{alias:<12} {str(max_age):>8} {counts['opened']:>8} "
+                f"{counts['reused']:>8} {counts['stale']:>8} {reuse_rate:>7.1f}%"
+            )
+
+        if options['reset']:
+            reset_connection_stats()
+            self.stdout.write(self.style.SUCCESS('Counters cleared.'))
@@ -0,0 +1,115 @@
+"""Reconcile MEDIA_ROOT with the database (see apps/core/media_audit.py)"""
+
+import os
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.core.media_audit import (
+    checksums, find_missing_rows, is_recent, iter_media_files, quarantine, referenced_files,
+)
+
+
+class Command(BaseCommand):
+    help = 'Report media files no row refers to and file references whose file is gone'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--quarantine', action='store_true',
+            help='Move orphaned files to MEDIA_QUARANTINE_ROOT instead of only listing them'
+        )
+        parser.add_argument(
+            '--min-age', type=float, default=24,
+            help='Ignore files modified less than this many hours ago (default: 24)'
+        )
+        parser.add_argument(
+            '--exclude', action='append', default=[],
+            help='Skip files whose name starts with this prefix (repeatable)'
+        )
+        parser.add_argument(
+            '--checksums', action='store_true',
+            help='Also read every referenced file and report the unreadable ones'
+        )
+        parser.add_argument(
+            '--manifest',
+            help='With --checksums: report files changed since this manifest, then rewrite it'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=min(8, (os.cpu_count() or 1) * 2),
+            help='Threads computing checksums'
+        )
+
+    def handle(self, *args, **options):
+        root = Path(settings.MEDIA_ROOT)
+        if not root.is_dir():
+            raise CommandError(f'MEDIA_ROOT {root} does not exist')
+        if options['manifest'] and not options['checksums']:
+            raise CommandError('--manifest needs --checksums')
+
+        exclude = list(options['exclude'])
+        quarantine_root = Path(settings.MEDIA_QUARANTINE_ROOT).resolve()
+        if quarantine_root.is_relative_to(root.resolve()):
+            exclude.append(f'{quarantine_root.relative_to(root.resolve()).as_posix()}/')
+        destination = quarantine_root / timezone.now().strftime('%Y%m%d-%H%M%S')
+        min_age = options['min_age'] * 3600
+
+        referenced = referenced_files()
+        missing = set(referenced)
+        files = orphans = recent = 0
+        for name, entry in iter_media_files(root, exclude):
+            files += 1
+            if name in referenced:
+                missing.discard(name)
+                continue
+            if is_recent(entry, min_age):
+                recent += 1
+                continue
+            orphans += 1
+            if options['quarantine']:
+                quarantine(root, name, destination)
+                self.stdout.write(f'quarantined {name}')
+            else:
+                self.stdout.write(f'orphan {name} ({entry.stat().st_size} bytes)')
+
+        for label, pk, field, name in find_missing_rows(sorted(missing)):
+            self.stdout.write(f'missing {name} ({label} {pk}, {field})')
+
+        summary = (
+            f'{files} file(s) on disk, {len(referenced)} referenced: {orphans} orphan(s), '
+            f'{len(missing)} missing, {recent} too recent to judge.'
+        )
+        if options['quarantine'] and orphans:
+            summary += f' Orphans moved to {destination}.'
+        if options['checksums']:
+            summary += ' ' + self.verify(root, referenced - missing, options['manifest'], max(1, options['workers']))
+
+        self.stdout.write(self.style.WARNING(summary) if orphans or missing else self.style.SUCCESS(summary))
+
+    def verify(self, root, names, manifest, workers):
+        previous = {}
+        if manifest and os.path.exists(manifest):
+            with open(manifest, encoding='utf-8') as source:
+                previous = dict(line.rstrip('\n').split('  ', 1)[::-1] for line in source if '  ' in line)
+
+        unreadable = changed = 0
+        output = open(f'{manifest}.tmp', 'w', encoding='utf-8') if manifest else None
+        try:
+            # Same layout as sha256sum, so `sha256sum -c` run in MEDIA_ROOT can check it too
+            for name, digest in checksums(root, sorted(names), workers):
+                if digest is None:
+                    unreadable += 1
+                    self.stderr.write(f'unreadable {name}')
+                    continue
+                if name in previous and previous[name] != digest:
+                    changed += 1
+                    self.stdout.write(f'changed {name}')
+                if output:
+                    output.write(f'{digest}  {name}\n')
+        finally:
+            if output:
+                output.close()
+        if output:
+            os.replace(f'{manifest}.tmp', manifest)
+        return f'Checksummed {len(names) - unreadable} file(s): {unreadable} unreadable, {changed} changed.'
@@ -0,0 +1,39 @@
+"""Deliver queued outgoing emails (see apps/core/mail.py)"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.core.mail import MAX_ATTEMPTS, claim_batch, send_batch
+
+
+class Command(BaseCommand):
+    help = 'Send queued emails in batches over one SMTP connection, retrying failures with backoff'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50, help='Emails per SMTP connection (default: 50)')
+        parser.add_argument(
+            '--max-attempts', type=int, default=MAX_ATTEMPTS,
+            help=f'Attempts before an email is marked as failed (default: {MAX_ATTEMPTS})'
+        )
+        parser.add_argument('--loop', action='store_true', help='Keep running and poll the queue')
+        parser.add_argument('--interval', type=float, default=15, help='Seconds between polls with --loop (default: 15)')
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        total_sent = total_failed = 0
+
+        while True:
+            batch = claim_batch(batch_size)
+            if batch:
+                sent, failed = send_batch(batch, max_attempts=options['max_attempts'])
+                total_sent += sent
+                total_failed += failed
+                if len(batch) == batch_size:
+                    continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        style = self.style.SUCCESS if not total_failed else self.style.WARNING
+        self.stdout.write(style(f'Sent {total_sent} email(s), {total_failed} failed.'))
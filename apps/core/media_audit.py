@@ -0,0 +1,146 @@
+"""
+Reconcile MEDIA_ROOT with the files the database refers to.
+
+    orphans   files on disk that no row refers to (e.g. written by a request
+              whose transaction then rolled back)
+    missing   names stored in a FileField / ImageField whose file is gone
+              (e.g. deleted by hand)
+
+Referenced names are loaded with one values_list() per model, covering every
+file field plus media URLs embedded in any text or JSON column: CKEditor
+uploads are only referenced from HTML, which also lives in plain TextFields
+edited with the CKEditor widget (staff bios), and image content blocks keep
+their URL in JSON data. The directory tree is then streamed with os.scandir,
+one directory at a time, and checked against that set, so memory grows with
+the number of rows, not with the size of the tree.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import unquote
+
+from django.apps import apps
+from django.conf import settings
+from django.db import models
+from django_ckeditor_5.fields import CKEditor5Field
+
+CHECKSUM_CHUNK_SIZE = 1024 * 1024
+CHECKSUM_BATCH_SIZE = 256
+
+
+def file_fields(model):
+    return [field.name for field in model._meta.concrete_fields if isinstance(field, models.FileField)]
+
+
+# Columns that may hold media URLs
+TEXT_FIELD_TYPES = (models.CharField, models.TextField, models.JSONField, CKEditor5Field)
+
+
+def text_fields(model):
+    return [field.name for field in model._meta.concrete_fields if isinstance(field, TEXT_FIELD_TYPES)]
+
+
+def media_url_pattern():
+    return re.compile(re.escape(settings.MEDIA_URL) + r'''([^"'\s()<>?#]+)''')
+
+
+def referenced_files():
+    """Every media name the database refers to"""
+    referenced = set()
+    pattern = media_url_pattern()
+    for model in apps.get_models():
+        fields = file_fields(model)
+        texts = text_fields(model)
+        if not fields and not texts:
+            continue
+        rows = model._base_manager.values_list(*fields, *texts).iterator(chunk_size=2000)
+        for row in rows:
+            referenced.update(name for name in row[:len(fields)] if name)
+            for text in row[len(fields):]:
+                if text and not isinstance(text, str):
+                    text = json.dumps(text, ensure_ascii=False)
+                referenced.update(unquote(match) for match in pattern.findall(text or ''))
+    return referenced
+
+
+def iter_media_files(root, exclude=()):
+    """
+    Yield (name, DirEntry) for every file under root; names are relative, with '/'.
+
+    Each directory is listed completely before its files are yielded, so they
+    can be moved while walking. Hidden entries (.htaccess, temporary files)
+    and excluded name prefixes are skipped.
+    """
+    pending = ['']
+    while pending:
+        prefix = pending.pop()
+        with os.scandir(os.path.join(root, prefix)) as iterator:
+            entries = sorted(iterator, key=lambda entry: entry.name)
+        for entry in entries:
+            name = f'{prefix}{entry.name}'
+            if entry.name.startswith('.') or name.startswith(tuple(exclude)):
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                pending.append(f'{name}/')
+            elif entry.is_file(follow_symlinks=False):
+                yield name, entry
+
+
+def find_missing_rows(names):
+    """Yield (model label, pk, field, name) for rows whose file is in `names`"""
+    names = list(names)
+    for model in apps.get_models():
+        for field in file_fields(model):
+            for start in range(0, len(names), 500):
+                rows = model._base_manager.filter(**{f'{field}__in': names[start:start + 500]})
+                for pk, name in rows.values_list('pk', field):
+                    yield model._meta.label, pk, field, name
+
+
+def quarantine(root, name, destination):
+    """Move a media file under the quarantine directory, keeping its relative path"""
+    target = Path(destination) / name
+    target.parent.mkdir(parents=True, exist_ok=True)
+    shutil.move(os.path.join(root, name), target)
+    return target
+
+
+def checksum(path):
+    """SHA-256 of a file; hashlib releases the GIL, so threads hash in parallel"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as source:
+        for chunk in iter(lambda: source.read(CHECKSUM_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def checksums(root, names, workers):
+    """
+    Yield (name, sha256 or None if unreadable), hashing in a thread pool.
+
+    Names are submitted in batches so the queue of pending work stays small.
+    """
+    def hash_one(name):
+        try:
+            return name, checksum(os.path.join(root, name))
+        except OSError:
+            return name, None
+
+    names = iter(names)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while True:
+            batch = [name for _, name in zip(range(CHECKSUM_BATCH_SIZE), names)]
+            if not batch:
+                return
+            yield from executor.map(hash_one, batch)
+
+
+def is_recent(entry, min_age):
+    """Files younger than min_age seconds may belong to a transaction still in flight"""
+    return time.time() - entry.stat(follow_symlinks=False).st_mtime < min_age
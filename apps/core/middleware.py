@@ -0,0 +1,40 @@
+"""Middleware for the core app"""
+
+import time
+
+from django.conf import settings
+
+from .routers import get_replicas, reset_primary_write, wrote_to_primary
+
+
+class ReplicaPinningMiddleware:
+    """
+    Keep staff reads on the primary database right after they save something.
+
+    When a request by a staff user writes to the database, a cookie holding
+    an expiry timestamp is set; @replica_reads views skip the replica until
+    it expires, so edits show up on the public pages immediately.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not get_replicas():
+            return self.get_response(request)
+
+        reset_primary_write()
+        response = self.get_response(request)
+
+        user = getattr(request, 'user', None)
+        if wrote_to_primary() and user is not None and user.is_authenticated and user.is_staff:
+            pin_seconds = settings.REPLICA_PIN_SECONDS
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE_NAME,
+                str(int(time.time() + pin_seconds)),
+                max_age=pin_seconds,
+                secure=settings.SESSION_COOKIE_SECURE,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.8 on 2026-10-19 19:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_shared_cache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingRelatedRefresh',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.CharField(max_length=50)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('affected', models.JSONField(blank=True, default=list)),
+                ('queued_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Pending Related Content Refresh',
+                'verbose_name_plural': 'Pending Related Content Refreshes',
+                'ordering': ['queued_at'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='pendingrelatedrefresh',
+            constraint=models.UniqueConstraint(fields=('index', 'object_id'), name='core_related_refresh_unique'),
+        ),
+    ]
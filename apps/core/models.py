@@ -1,5 +1,6 @@
 from django.db import models
 from django.core.validators import FileExtensionValidator
+from django.utils import timezone
 
 
 class SingletonModel(models.Model):
@@ -97,6 +98,11 @@ class HeroSlide(models.Model):
         upload_to='hero/',
         help_text="Hero image (recommended: 1920x1080px)"
     )
+    # Stored when the image changes (see apps.core.images)
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_color = models.CharField(max_length=7, blank=True, editable=False)
+    image_placeholder = models.TextField(blank=True, editable=False)
 
     # Call to Action
     button_text = models.CharField(
@@ -212,3 +218,72 @@ class AboutSection(SingletonModel):
 
     def __str__(self):
         return "About Section Content"
+
+
+class OutgoingEmail(models.Model):
+    """Email waiting to be delivered by the send_queued_mail command"""
+
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254)
+    to = models.TextField(help_text="Comma-separated recipient addresses")
+    reply_to = models.CharField(max_length=254, blank=True)
+
+    # Delivery
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now,
+        help_text="Not delivered before this time (retry backoff)"
+    )
+    last_error = models.TextField(blank=True)
+
+    # Metadata
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = "Outgoing Email"
+        verbose_name_plural = "Outgoing Emails"
+        indexes = [
+            models.Index(
+                fields=['next_attempt_at'],
+                name='core_outbox_due_idx',
+                condition=models.Q(status='queued'),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} -> {self.to}"
+
+    @property
+    def recipients(self):
+        return [address.strip() for address in self.to.split(',') if address.strip()]
+
+
+class PendingRelatedRefresh(models.Model):
+    """An item whose "related" links need recomputing (see apps/core/similarity.py)"""
+
+    index = models.CharField(max_length=50)
+    object_id = models.PositiveBigIntegerField()
+    # Sources that linked to the item before it was deleted
+    affected = models.JSONField(default=list, blank=True)
+    queued_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['queued_at']
+        verbose_name = "Pending Related Content Refresh"
+        verbose_name_plural = "Pending Related Content Refreshes"
+        constraints = [
+            models.UniqueConstraint(fields=['index', 'object_id'], name='core_related_refresh_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.index} {self.object_id}"
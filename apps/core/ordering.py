@@ -0,0 +1,88 @@
+"""
+Bulk reordering helpers shared by all drag-and-drop sortable models.
+
+Applies a whole permutation in a single CASE-based UPDATE inside a
+transaction, and guards against stale reorders with a version token.
+"""
+
+import hashlib
+
+from django.db import transaction
+from django.db.models import Case, IntegerField, Value, When
+
+
+class StaleOrderingError(Exception):
+    """Raised when the rows were reordered since the client last loaded them"""
+
+    def __init__(self, message, version=None):
+        super().__init__(message)
+        self.version = version
+
+
+def ordering_version(rows):
+    """
+    Return a short version token for a set of (pk, position) pairs.
+
+    The token changes whenever any of the rows gets a different position,
+    so a client can send back the token it was given to detect concurrent edits.
+    """
+    digest = hashlib.sha1()
+    for pk, position in sorted(rows):
+        digest.update(f'{pk}:{position};'.encode())
+    return digest.hexdigest()[:16]
+
+
+def get_ordering_version(queryset, field='order'):
+    """Return the current ordering version of the rows in a queryset"""
+    return ordering_version(queryset.values_list('pk', field))
+
+
+def bulk_reorder(queryset, positions, field='order', expected_version=None):
+    """
+    Apply new positions to the rows of a queryset with a single UPDATE.
+
+    Args:
+        queryset: Rows the caller is allowed to reorder (e.g. one service's blocks)
+        positions: Mapping of primary key -> new position
+        field: Name of the integer ordering field
+        expected_version: Version token the client last saw, or None to skip the check
+
+    Returns:
+        The new ordering version of the reordered rows.
+
+    Raises:
+        ValueError: If a primary key does not belong to the queryset, or two
+            rows were given the same position
+        StaleOrderingError: If the rows changed since expected_version was issued
+    """
+    positions = {int(pk): int(position) for pk, position in positions.items()}
+    if not positions:
+        return ordering_version([])
+    if len(set(positions.values())) != len(positions):
+        raise ValueError('Two items cannot share a position.')
+
+    with transaction.atomic():
+        rows = queryset.select_for_update().filter(pk__in=positions.keys())
+        current = list(rows.values_list('pk', field))
+
+        if len(current) != len(positions):
+            raise ValueError('One or more items do not belong to this list.')
+
+        current_version = ordering_version(current)
+        if expected_version and expected_version != current_version:
+            raise StaleOrderingError(
+                'The order was changed by someone else. Reload and try again.',
+                version=current_version,
+            )
+
+        existing = set(current)
+        changed = {pk: pos for pk, pos in positions.items() if (pk, pos) not in existing}
+        if changed:
+            queryset.model._default_manager.filter(pk__in=changed.keys()).update(**{
+                field: Case(
+                    *[When(pk=pk, then=Value(pos)) for pk, pos in changed.items()],
+                    output_field=IntegerField(),
+                )
+            })
+
+    return ordering_version(positions.items())
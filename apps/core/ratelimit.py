@@ -0,0 +1,135 @@
+"""
+Cache-backed rate limiting.
+
+Uses a sliding-window counter: hits are counted in fixed windows and the
+previous window's count is weighted by how much of it still overlaps the
+sliding window. Each check is a few cache operations and never touches the
+database, so a burst of spam is rejected before any row is written.
+
+Usage:
+    @ratelimit('contact', keys=('ip', 'post:email'))
+    def contact_submit(request):
+        ...
+
+Rates are configured per group in settings.RATELIMIT_RATES, e.g. '5/10m'.
+"""
+
+import hashlib
+import re
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, JsonResponse
+
+
+RATE_PATTERN = re.compile(r'^(\d+)/(\d*)([smhd])$')
+PERIOD_SECONDS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+CACHE_PREFIX = 'ratelimit'
+
+
+def parse_rate(rate):
+    """Parse a rate such as '5/10m' into (limit, period in seconds)"""
+    match = RATE_PATTERN.match(rate.strip())
+    if not match:
+        raise ValueError(f'Invalid rate limit: {rate!r}')
+    limit, multiplier, unit = match.groups()
+    return int(limit), int(multiplier or 1) * PERIOD_SECONDS[unit]
+
+
+def get_client_ip(request):
+    """Return the client IP, honouring RATELIMIT_IP_HEADER behind a trusted proxy"""
+    header = getattr(settings, 'RATELIMIT_IP_HEADER', None)
+    if header:
+        forwarded = request.META.get(header, '')
+        if forwarded:
+            return forwarded.split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def get_key_value(request, key):
+    """
+    Resolve a key spec to the value to count hits against.
+
+    Supported keys: 'ip' and 'post:<field>' (compared case-insensitively).
+    """
+    if key == 'ip':
+        return get_client_ip(request)
+    if key.startswith('post:'):
+        return request.POST.get(key[5:], '').strip().lower()
+    raise ValueError(f'Unknown rate limit key: {key!r}')
+
+
+def hit(group, key, value, limit, period):
+    """
+    Count one hit and return True if the sliding-window limit is exceeded.
+    """
+    digest = hashlib.sha1(value.encode()).hexdigest()[:20]
+    base = f'{CACHE_PREFIX}:{group}:{key}:{digest}'
+    now = time.time()
+    window = int(now // period)
+    current_key = f'{base}:{window}'
+    previous_key = f'{base}:{window - 1}'
+
+    cache.add(current_key, 0, timeout=period * 2)
+    try:
+        current = cache.incr(current_key)
+    except ValueError:
+        # Expired between add() and incr()
+        cache.set(current_key, 1, timeout=period * 2)
+        current = 1
+    previous = cache.get(previous_key, 0)
+
+    overlap = 1 - (now % period) / period
+    return previous * overlap + current > limit
+
+
+def is_ratelimited(request, group, keys):
+    """Record a hit for each key and return True if any of them is over the group's rate"""
+    if not getattr(settings, 'RATELIMIT_ENABLE', True):
+        return False
+
+    limit, period = parse_rate(settings.RATELIMIT_RATES[group])
+    limited = False
+    for key in keys:
+        value = get_key_value(request, key)
+        if value and hit(group, key, value, limit, period):
+            limited = True
+    return limited
+
+
+def ratelimited_response(request, period):
+    """Return a 429 response without rendering templates or touching the database"""
+    message = 'Too many requests. Please wait a few minutes and try again.'
+    wants_json = (
+        '/api/' in request.path
+        or 'application/json' in request.headers.get('Accept', '')
+        or request.headers.get('X-Requested-With') == 'XMLHttpRequest'
+    )
+    if wants_json:
+        response = JsonResponse({'success': False, 'error': message}, status=429)
+    else:
+        response = HttpResponse(message, status=429, content_type='text/plain; charset=utf-8')
+    response['Retry-After'] = str(period)
+    return response
+
+
+def ratelimit(group, keys=('ip',), methods=('POST',)):
+    """
+    Decorator that rejects requests over the rate configured for `group`.
+
+    Args:
+        group: Name of the rate in settings.RATELIMIT_RATES; hits are counted per group
+        keys: What to count against ('ip', 'post:email', ...); each is limited separately
+        methods: HTTP methods that count as hits (others pass through)
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method in methods and is_ratelimited(request, group, keys):
+                _, period = parse_rate(settings.RATELIMIT_RATES[group])
+                return ratelimited_response(request, period)
+            return view_func(request, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,96 @@
+"""
+Read-replica routing for public pages.
+
+Replicas are configured with DATABASE_REPLICA_URLS (see config/settings.py).
+Only views decorated with @replica_reads send their queries to a replica;
+everything else, and every write, goes to the primary. After a staff member
+saves something, ReplicaPinningMiddleware sets a short-lived cookie that keeps
+their reads on the primary so they see their own change straight away,
+even if the replica is a few seconds behind.
+"""
+
+import random
+import time
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+
+
+# Apps whose reads always go to the primary: a lagging replica would log
+# people out or hide permission changes right after they were made.
+# django_cache is the database cache (CACHES['shared']), written on the primary.
+PRIMARY_ONLY_APPS = {'auth', 'sessions', 'contenttypes', 'admin', 'django_cache'}
+
+_use_replica = ContextVar('use_replica', default=False)
+_wrote = ContextVar('wrote_to_primary', default=False)
+
+
+def get_replicas():
+    """Return the configured replica database aliases"""
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+def is_pinned_to_primary(request):
+    """Check if the request carries an unexpired read-your-writes pin"""
+    try:
+        pinned_until = float(request.COOKIES.get(settings.REPLICA_PIN_COOKIE_NAME, 0))
+    except ValueError:
+        return False
+    return pinned_until > time.time()
+
+
+def replica_reads(view_func):
+    """
+    Send the reads of a public view to a read replica.
+
+    Has no effect when no replica is configured, or when the visitor
+    recently saved something and is pinned to the primary.
+    """
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not get_replicas() or is_pinned_to_primary(request):
+            return view_func(request, *args, **kwargs)
+
+        token = _use_replica.set(True)
+        try:
+            return view_func(request, *args, **kwargs)
+        finally:
+            _use_replica.reset(token)
+    return wrapper
+
+
+def mark_primary_write(sender=None, **kwargs):
+    """post_save/post_delete handler recording that this request wrote data"""
+    _wrote.set(True)
+
+
+def reset_primary_write():
+    """Clear the write flag at the start of a request"""
+    _wrote.set(False)
+
+
+def wrote_to_primary():
+    """Check if the current request has written anything"""
+    return _wrote.get()
+
+
+class ReplicaRouter:
+    """Route reads inside @replica_reads views to a replica, everything else to the primary"""
+
+    def db_for_read(self, model, **hints):
+        if not _use_replica.get() or model._meta.app_label in PRIMARY_ONLY_APPS:
+            return 'default'
+        replicas = get_replicas()
+        return random.choice(replicas) if replicas else 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive schema changes through replication
+        return db not in get_replicas()
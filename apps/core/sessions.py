@@ -0,0 +1,140 @@
+"""
+Session handling that keeps anonymous visitors off the session table.
+
+Staff sessions use SESSION_ENGINE (cached_db by default: reads come from the
+cache, writes go through to the database). Visitors who have never logged in
+get a store chosen by ANONYMOUS_SESSIONS instead:
+
+    'signed_cookies' - data lives in a signed cookie, no server-side storage
+    'none'           - data lasts for the current request only, no cookie
+    'server'         - same store as staff (Django's default behaviour)
+
+When a visitor logs in, their session is promoted to the staff store.
+"""
+
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.sessions.backends import signed_cookies
+from django.contrib.sessions.backends.base import SessionBase
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+
+
+class NullSessionStore(SessionBase):
+    """Session store that keeps data for the current request only"""
+
+    def exists(self, session_key):
+        return False
+
+    def create(self):
+        self.modified = True
+
+    def save(self, must_create=False):
+        pass
+
+    def delete(self, session_key=None):
+        pass
+
+    def load(self):
+        return {}
+
+    @classmethod
+    def clear_expired(cls):
+        pass
+
+
+ANONYMOUS_STORES = {
+    'signed_cookies': signed_cookies.SessionStore,
+    'none': NullSessionStore,
+}
+
+
+def get_staff_session_store():
+    """Return the SessionStore class of the configured SESSION_ENGINE"""
+    return import_module(settings.SESSION_ENGINE).SessionStore
+
+
+def get_anonymous_session_store():
+    """Return the SessionStore class for anonymous visitors, or None to use the staff store"""
+    return ANONYMOUS_STORES.get(getattr(settings, 'ANONYMOUS_SESSIONS', 'server'))
+
+
+def promote_session(sender, request, user, **kwargs):
+    """
+    user_logged_in handler: move the session of a visitor who just logged in
+    into the staff store, keeping its data (auth keys, "remember me" expiry).
+    """
+    if not getattr(request, 'anonymous_session', False):
+        return
+
+    staff_session = get_staff_session_store()()
+    staff_session.update(dict(request.session.items()))
+    request.session = staff_session
+    request.anonymous_session = False
+
+
+class HybridSessionMiddleware(SessionMiddleware):
+    """SessionMiddleware that gives visitors without a staff session an anonymous store"""
+
+    def process_request(self, request):
+        session_key = request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        anonymous_store = get_anonymous_session_store()
+
+        if session_key or anonymous_store is None:
+            request.session = self.SessionStore(session_key)
+            request.anonymous_session = False
+        else:
+            request.session = anonymous_store(
+                request.COOKIES.get(settings.ANONYMOUS_SESSION_COOKIE_NAME)
+            )
+            request.anonymous_session = True
+
+    def process_response(self, request, response):
+        if not hasattr(request, 'session'):
+            return response
+        if not getattr(request, 'anonymous_session', False):
+            response = super().process_response(request, response)
+            if settings.ANONYMOUS_SESSION_COOKIE_NAME in request.COOKIES:
+                self._delete_anonymous_cookie(response)
+            return response
+
+        session = request.session
+        if isinstance(session, NullSessionStore):
+            return response
+
+        cookie_name = settings.ANONYMOUS_SESSION_COOKIE_NAME
+        if session.accessed:
+            patch_vary_headers(response, ('Cookie',))
+        if cookie_name in request.COOKIES and session.is_empty():
+            self._delete_anonymous_cookie(response)
+        elif session.modified and not session.is_empty() and response.status_code < 500:
+            if session.get_expire_at_browser_close():
+                max_age = expires = None
+            else:
+                max_age = session.get_expiry_age()
+                expires = http_date(time.time() + max_age)
+            session.save()
+            response.set_cookie(
+                cookie_name,
+                session.session_key,
+                max_age=max_age,
+                expires=expires,
+                domain=settings.SESSION_COOKIE_DOMAIN,
+                path=settings.SESSION_COOKIE_PATH,
+                secure=settings.SESSION_COOKIE_SECURE or None,
+                httponly=True,
+                samesite=settings.SESSION_COOKIE_SAMESITE,
+            )
+        return response
+
+    def _delete_anonymous_cookie(self, response):
+        response.delete_cookie(
+            settings.ANONYMOUS_SESSION_COOKIE_NAME,
+            path=settings.SESSION_COOKIE_PATH,
+            domain=settings.SESSION_COOKIE_DOMAIN,
+            samesite=settings.SESSION_COOKIE_SAMESITE,
+        )
+        patch_vary_headers(response, ('Cookie',))
@@ -0,0 +1,327 @@
+"""
+Content similarity for "related" news articles and projects.
+
+Each published item is turned into a TF-IDF vector over its tag-stripped
+text, and the TOP_K most cosine-similar items are stored in a link table
+(news.RelatedArticle, projects.RelatedProject), so a detail page fetches its
+related items with one indexed join instead of a query per view.
+
+Vectors are dense float32 rows over a capped vocabulary (MAX_FEATURES terms),
+and similarities are computed in BATCH_SIZE-row matrix products. The matrix
+takes items x MAX_FEATURES x 4 bytes: 20 MB for 1,000 items, 200 MB for
+10,000. That is fine at this site's scale, where each index holds a few
+hundred to a few thousand items, without a sparse-matrix dependency; an index
+growing past ~10,000 items needs a lower MAX_FEATURES or sparse vectors.
+
+numpy is only imported by the build itself, which runs in the management
+command; the signal handlers that queue refreshes do not need it, so a site
+without numpy still starts and serves pages.
+
+`manage.py build_related_content` computes the whole index. After that,
+saving or deleting an item only queues it (PendingRelatedRefresh), so the
+TF-IDF build never runs in the editor's request; `build_related_content
+--pending`, run from cron every few minutes, then recomputes only the rows the
+queued items can affect: their own neighbours and those of items whose top-k
+they enter or leave.
+"""
+
+import html
+import math
+import re
+from collections import Counter
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from .models import PendingRelatedRefresh
+
+TOP_K = 6
+MAX_FEATURES = 5000
+# Terms in more than this share of documents carry no signal
+MAX_DOCUMENT_FREQUENCY = 0.5
+BATCH_SIZE = 256
+
+# name -> corpus definition; text fields map to a term weight
+SIMILARITY_INDEXES = {
+    'news': {
+        'model': 'news.NewsArticle',
+        'link_model': 'news.RelatedArticle',
+        'filters': {'status': 'published'},
+        'fields': {'title': 3, 'excerpt': 2, 'content': 1},
+    },
+    'projects': {
+        'model': 'projects.Project',
+        'link_model': 'projects.RelatedProject',
+        'filters': {},
+        'fields': {'title': 3, 'description': 1, 'location': 1, 'impact_text': 1},
+    },
+}
+
+TOKEN_PATTERN = re.compile(r'[a-z][a-z0-9]{2,}')
+STOP_WORDS = frozenset("""
+    about above after again against all also and any are because been before being below between both but
+    can could did does doing down during each few for from further had has have having her here hers him his
+    how into its itself just more most not now off once only other our ours out over own same she should
+    some such than that the their theirs them then there these they this those through too under until very
+    was were what when where which while who whom why will with would you your yours
+""".split())
+
+
+def tokenize(text):
+    """Lowercase terms of an HTML fragment, without stop words"""
+    text = html.unescape(strip_tags(text or '')).lower()
+    return [token for token in TOKEN_PATTERN.findall(text) if token not in STOP_WORDS]
+
+
+def term_counts(row, fields):
+    """Weighted term frequencies for one item"""
+    counts = Counter()
+    for field, weight in fields.items():
+        for token in tokenize(row[field]):
+            counts[token] += weight
+    return counts
+
+
+def load_corpus(name):
+    """Return (ids, term counts) for every visible item of an index"""
+    config = SIMILARITY_INDEXES[name]
+    model = apps.get_model(config['model'])
+    rows = model.objects.filter(**config['filters']).order_by('pk').values('pk', *config['fields'])
+    ids, counts = [], []
+    for row in rows.iterator(chunk_size=500):
+        ids.append(row['pk'])
+        counts.append(term_counts(row, config['fields']))
+    return ids, counts
+
+
+def build_matrix(counts):
+    """
+    Build L2-normalised TF-IDF rows (float32, one per document).
+
+    Uses sublinear term frequency (1 + log tf) and smoothed IDF. Takes
+    len(counts) x MAX_FEATURES x 4 bytes (see the module docstring).
+    """
+    import numpy as np
+
+    total = len(counts)
+    document_frequency = Counter()
+    for doc in counts:
+        document_frequency.update(doc.keys())
+
+    max_df = max(2, int(MAX_DOCUMENT_FREQUENCY * total))
+    # A term found in only one document cannot relate two of them
+    candidates = [(df, term) for term, df in document_frequency.items() if 2 <= df <= max_df]
+    candidates.sort(key=lambda item: (-item[0], item[1]))
+    vocabulary = {term: column for column, (_, term) in enumerate(candidates[:MAX_FEATURES])}
+
+    matrix = np.zeros((total, len(vocabulary)), dtype=np.float32)
+    for row, doc in enumerate(counts):
+        for term, tf in doc.items():
+            column = vocabulary.get(term)
+            if column is not None:
+                idf = math.log((1 + total) / (1 + document_frequency[term])) + 1
+                matrix[row, column] = (1 + math.log(tf)) * idf
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    matrix /= norms
+    return matrix
+
+
+def top_neighbours(matrix, rows, k=TOP_K):
+    """
+    Yield (row, [(neighbour row, score), ...]) for the given row numbers.
+
+    Similarities are computed BATCH_SIZE rows at a time; items with nothing in
+    common (score 0) are never neighbours.
+    """
+    import numpy as np
+
+    rows = list(rows)
+    for start in range(0, len(rows), BATCH_SIZE):
+        batch = np.asarray(rows[start:start + BATCH_SIZE])
+        scores = matrix[batch] @ matrix.T
+        scores[np.arange(len(batch)), batch] = -1  # never related to itself
+
+        count = min(k, scores.shape[1] - 1)
+        if count <= 0:
+            for row in batch:
+                yield int(row), []
+            continue
+        best = np.argpartition(-scores, count - 1, axis=1)[:, :count]
+        for offset, row in enumerate(batch):
+            columns = best[offset][np.argsort(-scores[offset, best[offset]], kind='stable')]
+            yield int(row), [
+                (int(column), float(scores[offset, column]))
+                for column in columns if scores[offset, column] > 0
+            ]
+
+
+def _replace_links(link_model, ids, neighbours):
+    """Swap the stored neighbours of the given sources for freshly computed ones"""
+    sources, links = [], []
+    for row, related in neighbours:
+        sources.append(ids[row])
+        links.extend(
+            link_model(source_id=ids[row], target_id=ids[column], score=score, rank=rank)
+            for rank, (column, score) in enumerate(related, start=1)
+        )
+    with transaction.atomic():
+        link_model.objects.filter(source_id__in=sources).delete()
+        link_model.objects.bulk_create(links, batch_size=500)
+    return len(links)
+
+
+def rebuild(name):
+    """Recompute the whole index; returns the number of links stored"""
+    config = SIMILARITY_INDEXES[name]
+    model = apps.get_model(config['model'])
+    link_model = apps.get_model(config['link_model'])
+    cutoff = timezone.now()
+    ids, counts = load_corpus(name)
+    matrix = build_matrix(counts)
+
+    stored = 0
+    with transaction.atomic():
+        # Hidden items keep no links
+        link_model.objects.exclude(source__in=model.objects.filter(**config['filters'])).delete()
+        neighbours = list(top_neighbours(matrix, range(len(ids))))
+        for start in range(0, len(neighbours), BATCH_SIZE):
+            stored += _replace_links(link_model, ids, neighbours[start:start + BATCH_SIZE])
+        # Everything queued before the corpus was read is covered
+        PendingRelatedRefresh.objects.filter(index=name, queued_at__lte=cutoff).delete()
+    return stored
+
+
+def entering_sources(link_model, ids, matrix, rows):
+    """
+    Items whose top-k the changed rows now enter.
+
+    A source with a full top-k is affected when a changed item outscores its
+    weakest link. A source with fewer links is affected only if it really has
+    fewer than TOP_K candidates; otherwise it was just never indexed, which
+    build_related_content takes care of.
+    """
+    import numpy as np
+
+    changed = np.zeros(len(ids), dtype=bool)
+    changed[rows] = True
+    strongest = np.zeros(len(ids), dtype=np.float32)
+    for start in range(0, len(rows), BATCH_SIZE):
+        scores = matrix[rows[start:start + BATCH_SIZE]] @ matrix.T
+        strongest = np.maximum(strongest, scores.max(axis=0))
+    strongest[changed] = 0
+
+    weakest = dict(
+        link_model.objects
+        .values('source_id')
+        .annotate(count=Count('pk'), lowest=Min('score'))
+        .filter(count__gte=TOP_K)
+        .values_list('source_id', 'lowest')
+    )
+    entering, short = set(), []
+    for row, (item_id, score) in enumerate(zip(ids, strongest.tolist())):
+        if score <= 0:
+            continue
+        if item_id in weakest:
+            if score > weakest[item_id]:
+                entering.add(item_id)
+        else:
+            short.append(row)
+
+    for start in range(0, len(short), BATCH_SIZE):
+        batch = np.asarray(short[start:start + BATCH_SIZE])
+        candidates = (matrix[batch] @ matrix.T > 0) & ~changed
+        candidates[np.arange(len(batch)), batch] = False
+        entering.update(
+            ids[row] for row, count in zip(batch.tolist(), candidates.sum(axis=1).tolist())
+            if count < TOP_K
+        )
+    return entering
+
+
+def refresh_pending(name):
+    """
+    Apply the refreshes queued for an index; returns the number of items refreshed.
+
+    Recomputes the changed items' own neighbours and those of items they
+    enter or leave the top-k of, with one TF-IDF build for the whole queue.
+    """
+    link_model = apps.get_model(SIMILARITY_INDEXES[name]['link_model'])
+    cutoff = timezone.now()
+    queued = list(
+        PendingRelatedRefresh.objects.filter(index=name, queued_at__lte=cutoff)
+        .values_list('pk', 'object_id', 'affected')
+    )
+    if not queued:
+        return 0
+
+    ids, counts = load_corpus(name)
+    position = {item_id: row for row, item_id in enumerate(ids)}
+    matrix = build_matrix(counts)
+    changed = {object_id for _, object_id, _ in queued}
+
+    # Sources that linked to a changed item, before or after a delete
+    stale = {source for _, _, affected in queued for source in affected}
+    stale.update(link_model.objects.filter(target_id__in=changed).values_list('source_id', flat=True))
+    rows = sorted(position[pk] for pk in changed if pk in position)
+    stale.update(ids[row] for row in rows)
+    if rows and len(ids) > 1:
+        stale.update(entering_sources(link_model, ids, matrix, rows))
+
+    stale_rows = sorted(position[item_id] for item_id in stale if item_id in position)
+    with transaction.atomic():
+        # Hidden and deleted items keep no links
+        link_model.objects.filter(source_id__in=[pk for pk in changed if pk not in position]).delete()
+        for start in range(0, len(stale_rows), BATCH_SIZE):
+            _replace_links(link_model, ids, top_neighbours(matrix, stale_rows[start:start + BATCH_SIZE]))
+        # Items queued again while this ran stay queued
+        PendingRelatedRefresh.objects.filter(pk__in=[pk for pk, _, _ in queued], queued_at__lte=cutoff).delete()
+    return len(changed)
+
+
+def indexes_for_model(model):
+    label = model._meta.label
+    return [name for name, config in SIMILARITY_INDEXES.items() if config['model'] == label]
+
+
+def queue_refresh(model, pk, affected=()):
+    """Queue an item for build_related_content --pending"""
+    for name in indexes_for_model(model):
+        entry, created = PendingRelatedRefresh.objects.get_or_create(
+            index=name, object_id=pk, defaults={'affected': sorted(affected)},
+        )
+        if not created:
+            # Saving again also moves queued_at past a refresh already under way
+            entry.affected = sorted(set(entry.affected) | set(affected))
+            entry.save()
+
+
+def schedule_refresh(sender, instance, update_fields=None, raw=False, **kwargs):
+    """post_save handler: queue a refresh unless only untracked fields changed"""
+    if raw or not getattr(settings, 'RELATED_CONTENT_AUTO_UPDATE', True):
+        return
+    if update_fields is not None:
+        tracked = set()
+        for name in indexes_for_model(sender):
+            config = SIMILARITY_INDEXES[name]
+            tracked.update(config['fields'], config['filters'])
+        # e.g. increment_views() saving only the view counter
+        if not tracked.intersection(update_fields):
+            return
+    queue_refresh(sender, instance.pk)
+
+
+def schedule_delete_refresh(sender, instance, **kwargs):
+    """pre_delete handler: the links pointing at the item vanish with it"""
+    if not getattr(settings, 'RELATED_CONTENT_AUTO_UPDATE', True):
+        return
+    affected = set()
+    for name in indexes_for_model(sender):
+        link_model = apps.get_model(SIMILARITY_INDEXES[name]['link_model'])
+        affected.update(link_model.objects.filter(target_id=instance.pk).values_list('source_id', flat=True))
+    queue_refresh(sender, instance.pk, affected)
@@ -0,0 +1,151 @@
+"""
+Slug resolution cache for the public detail pages.
+
+Each model in SLUG_MODELS has its slug -> (pk, visible) mapping cached, so a
+detail page fetches its row by primary key, and an unknown slug (crawlers
+probing old or mistyped URLs) or a hidden one (a draft article, an inactive
+service) is a 404 without querying the model's table. Unknown slugs are
+cached too, for a shorter time. Small models such as categories cache the
+object itself, so the category pages skip that query altogether.
+
+Entries are keyed by a per-model version, bumped whenever a row is saved or
+deleted, which covers slug changes, visibility changes and new rows taking a
+slug that was cached as unknown. Saves that only touch other fields (the
+view counter) leave it alone. Bulk queryset.update() sends no signals, so
+code that changes visibility that way calls bump_slug_version() itself. The
+versions live in the shared cache so a bump reaches every worker; the
+entries stay in each worker's default cache.
+
+Misses are resolved on the primary database, even inside @replica_reads
+views: a replica that has not caught up yet would otherwise get a new slug
+cached as unknown, or an old visibility cached for hours.
+"""
+
+import time
+from collections import namedtuple
+
+from django.apps import apps
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.validators import slug_re
+from django.http import Http404
+
+# model label -> optional 'visible' (field -> value a public row must have)
+# and 'cache_object' (cache the whole instance, for small rows)
+SLUG_MODELS = {
+    'news.NewsArticle': {'visible': {'status': 'published'}},
+    'news.NewsCategory': {'cache_object': True},
+    'projects.Project': {},
+    'projects.ProjectCategory': {'cache_object': True},
+    'services.Service': {'visible': {'is_active': True}},
+    'documents.Document': {'visible': {'is_public': True}},
+    'gallery.GalleryCategory': {'cache_object': True},
+}
+
+SLUG_CACHE_PREFIX = 'slug'
+SLUG_CACHE_TIMEOUT = 60 * 60 * 6
+UNKNOWN_SLUG_TIMEOUT = 60 * 10
+# A per-process default cache cannot be cleared from another worker; keep the
+# unknown markers short there in case a version bump is missed
+LOCAL_UNKNOWN_SLUG_TIMEOUT = 60
+UNKNOWN = 'unknown'
+
+SlugEntry = namedtuple('SlugEntry', 'pk visible obj')
+
+
+def _label(model):
+    return model if isinstance(model, str) else model._meta.label
+
+
+def get_slug_version(model):
+    """
+    Current version of a model's slug entries.
+
+    Versions start from the clock, so a cleared cache cannot bring back an
+    entry cached under an older version.
+    """
+    return caches['shared'].get_or_set(f'{SLUG_CACHE_PREFIX}_version:{_label(model)}', time.time_ns() // 1000, None)
+
+
+def bump_slug_version(model):
+    """Invalidate every cached slug of a model, in every worker"""
+    key = f'{SLUG_CACHE_PREFIX}_version:{_label(model)}'
+    try:
+        caches['shared'].incr(key)
+    except ValueError:
+        caches['shared'].set(key, time.time_ns() // 1000, None)
+
+
+def unknown_slug_timeout():
+    return LOCAL_UNKNOWN_SLUG_TIMEOUT if isinstance(caches['default'], LocMemCache) else UNKNOWN_SLUG_TIMEOUT
+
+
+def _is_visible(row, config):
+    return all(row[field] == value for field, value in config.get('visible', {}).items())
+
+
+def resolve_slug(model, slug):
+    """Return the SlugEntry of a slug, or None if no row has it"""
+    if not slug_re.match(slug or ''):
+        # Nothing can have it; not worth a cache entry either
+        return None
+    label = _label(model)
+    config = SLUG_MODELS[label]
+    key = f'{SLUG_CACHE_PREFIX}:{label}:{get_slug_version(label)}:{slug}'
+    entry = cache.get(key)
+    if entry == UNKNOWN:
+        return None
+    if entry is not None:
+        return SlugEntry(*entry)
+
+    rows = apps.get_model(label)._default_manager.using('default').filter(slug=slug)
+    if config.get('cache_object'):
+        obj = rows.first()
+        row = obj and {'pk': obj.pk, **{field: getattr(obj, field) for field in config.get('visible', {})}}
+    else:
+        obj = None
+        row = rows.values('pk', *config.get('visible', {})).first()
+
+    if row is None:
+        cache.set(key, UNKNOWN, unknown_slug_timeout())
+        return None
+    entry = SlugEntry(row['pk'], _is_visible(row, config), obj)
+    cache.set(key, tuple(entry), SLUG_CACHE_TIMEOUT)
+    return entry
+
+
+def get_by_slug_or_404(model, slug, queryset=None):
+    """
+    The visible row with this slug, fetched by primary key.
+
+    Unknown and hidden slugs raise Http404 from the cache. Without a
+    queryset, models that cache their objects are served from the cache.
+    """
+    label = _label(model)
+    entry = resolve_slug(label, slug)
+    if entry is None or not entry.visible:
+        raise Http404(f'No {label} matches the given query.')
+    if queryset is None and entry.obj is not None:
+        return entry.obj
+
+    if queryset is None:
+        queryset = apps.get_model(label)._default_manager.all()
+    queryset = queryset.filter(**SLUG_MODELS[label].get('visible', {}), pk=entry.pk)
+    obj = queryset.first()
+    if obj is None and queryset.db != 'default':
+        # A replica that has not caught up with the primary the slug came from
+        obj = queryset.using('default').first()
+    if obj is None:
+        # Changed behind the signals' back (e.g. a raw SQL update)
+        bump_slug_version(label)
+        raise Http404(f'No {label} matches the given query.')
+    return obj
+
+
+def invalidate_slugs(sender, instance, update_fields=None, **kwargs):
+    """post_save / post_delete handler"""
+    config = SLUG_MODELS[sender._meta.label]
+    relevant = {'slug', *config.get('visible', {})}
+    if update_fields is not None and not config.get('cache_object') and not relevant & set(update_fields):
+        return
+    bump_slug_version(sender)
@@ -0,0 +1,157 @@
+"""
+Static file storage with content-hashed names and precompressed variants.
+
+collectstatic writes every file under a hashed name (styles.3f2a9c81d0e4.css)
+recorded in staticfiles.json, which {% static %} looks up, so the files can be
+cached by browsers forever. Text assets also get .gz and, when the optional
+Brotli package is installed, .br siblings that Apache can serve as-is instead
+of compressing on every request (see STATIC_HTACCESS).
+"""
+
+import gzip
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_EXTENSIONS = {
+    '.css', '.js', '.mjs', '.map', '.json', '.svg', '.txt', '.xml', '.html',
+    '.ico', '.ttf', '.otf', '.eot',
+}
+# Small files gain nothing from compression
+MIN_COMPRESS_SIZE = 512
+# Keep a compressed variant only if it is at least this much smaller
+MIN_COMPRESS_RATIO = 0.95
+
+HTACCESS_TEMPLATE = r"""# Generated by collectstatic (apps/core/storage.py). Do not edit.
+
+# Serve precompressed variants when the browser accepts them
+<IfModule mod_rewrite.c>
+    RewriteEngine On
+
+    RewriteCond %{HTTP:Accept-Encoding} \bbr\b
+    RewriteCond %{REQUEST_FILENAME}.br -f
+    RewriteRule ^(.+)$ $1.br [L]
+
+    RewriteCond %{HTTP:Accept-Encoding} \bgzip\b
+    RewriteCond %{REQUEST_FILENAME}.gz -f
+    RewriteRule ^(.+)$ $1.gz [L]
+
+    # Keep the original content type and stop mod_deflate compressing again
+    RewriteRule \.css\.(gz|br)$ - [T=text/css,E=no-gzip:1,E=no-brotli:1]
+    RewriteRule \.(m?js)\.(gz|br)$ - [T=application/javascript,E=no-gzip:1,E=no-brotli:1]
+    RewriteRule \.svg\.(gz|br)$ - [T=image/svg+xml,E=no-gzip:1,E=no-brotli:1]
+    RewriteRule \.(json|map)\.(gz|br)$ - [T=application/json,E=no-gzip:1,E=no-brotli:1]
+</IfModule>
+
+<IfModule mod_headers.c>
+    <FilesMatch "\.gz$">
+        Header set Content-Encoding gzip
+        Header append Vary Accept-Encoding
+    </FilesMatch>
+    <FilesMatch "\.br$">
+        Header set Content-Encoding br
+        Header append Vary Accept-Encoding
+    </FilesMatch>
+
+    # Hashed file names change whenever the content does
+    <FilesMatch "\.[0-9a-f]{12}\.[A-Za-z0-9]+(\.gz|\.br)?$">
+        Header set Cache-Control "public, max-age=31536000, immutable"
+    </FilesMatch>
+</IfModule>
+"""
+
+
+def compress_gzip(data):
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def compress_brotli(data):
+    return brotli.compress(data, quality=11)
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """ManifestStaticFilesStorage that also writes .gz / .br siblings"""
+
+    # Referencing a file that was never collected (e.g. an optional default
+    # image) serves its unhashed URL instead of failing the whole page
+    manifest_strict = False
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            # Without a manifest (collectstatic not run, e.g. in tests) this is expected
+            if self.hashed_files:
+                logger.warning('Static file %s is missing from the manifest', name)
+            return name
+
+    def get_encoders(self):
+        """Return (extension, compress function) pairs for the available encodings"""
+        encoders = [('.gz', compress_gzip)]
+        if brotli is not None:
+            encoders.append(('.br', compress_brotli))
+        return encoders
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+
+        # Hashed names are immutable, so their existing siblings are reused
+        # even though collectstatic rewrites the files on every run
+        hashed_names = set(self.hashed_files.values())
+        jobs = [(name, True) for name in hashed_names]
+        jobs += [(name, False) for name in paths if name not in hashed_names]
+
+        # zlib and brotli release the GIL, so threads compress in parallel
+        with ThreadPoolExecutor() as executor:
+            list(executor.map(lambda job: self.compress(*job), jobs))
+
+        if getattr(settings, 'STATIC_HTACCESS', False):
+            with open(self.path('.htaccess'), 'w') as htaccess:
+                htaccess.write(HTACCESS_TEMPLATE)
+
+    def compress(self, name, immutable=False):
+        """
+        Write compressed siblings of one collected file, skipping up-to-date ones.
+
+        Args:
+            name: Collected file name, relative to STATIC_ROOT
+            immutable: The name is content-hashed, so an existing sibling is always current
+        """
+        if os.path.splitext(name)[1].lower() not in COMPRESSIBLE_EXTENSIONS:
+            return
+
+        path = self.path(name)
+        try:
+            mtime = os.path.getmtime(path)
+        except FileNotFoundError:
+            return
+
+        data = None
+        for extension, compress_func in self.get_encoders():
+            target = path + extension
+            if os.path.exists(target) and (immutable or os.path.getmtime(target) >= mtime):
+                continue
+            if data is None:
+                with open(path, 'rb') as source:
+                    data = source.read()
+
+            compressed = compress_func(data) if len(data) >= MIN_COMPRESS_SIZE else None
+            if compressed is None or len(compressed) > len(data) * MIN_COMPRESS_RATIO:
+                # Not worth it; drop a sibling left over from older content
+                if os.path.exists(target):
+                    os.remove(target)
+                continue
+            with open(target, 'wb') as output:
+                output.write(compressed)
@@ -0,0 +1,362 @@
+"""
+Pre-rendered XML sitemaps and RSS/Atom feeds.
+
+Crawlers fetch plain files from SYNDICATION_ROOT instead of running listing
+queries on every request:
+
+    sitemap.xml                 index of the section files below
+    sitemap-<section>-<n>.xml   one file per block of CHUNK_SIZE primary keys
+    feeds/<feed>.rss|.atom      latest FEED_LENGTH items
+
+Saving or deleting an object only rewrites the sitemap chunk that holds its
+primary key, the feeds of its type and the index (built from the chunk files'
+modification times, which are set to their newest lastmod). `manage.py
+build_syndication` rebuilds everything, e.g. after the first deploy.
+"""
+
+import logging
+import os
+import tempfile
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.urls import reverse
+from django.utils import feedgenerator
+
+from .models import SiteSettings
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1000
+FEED_LENGTH = 20
+
+# name -> what goes into sitemap-<name>-<n>.xml
+SITEMAP_SECTIONS = {
+    'news': {
+        'model': 'news.NewsArticle',
+        'filters': {'status': 'published', 'published_date__isnull': False},
+        'lastmod': 'updated_at',
+        'url': ('news:detail', 'slug'),
+    },
+    'projects': {
+        'model': 'projects.Project',
+        'filters': {},
+        'lastmod': 'updated_at',
+        'url': ('projects:detail', 'slug'),
+    },
+    'services': {
+        # Services with an external link have no page of their own
+        'model': 'services.Service',
+        'filters': {'is_active': True, 'link_url': ''},
+        'lastmod': 'updated_at',
+        'url': ('services:detail', 'slug'),
+    },
+    'documents': {
+        'model': 'documents.Document',
+        'filters': {'is_public': True},
+        'lastmod': 'updated_date',
+        'url': ('documents:detail', 'slug'),
+    },
+}
+
+# name -> feeds/<name>.rss and feeds/<name>.atom
+FEEDS = {
+    'news': {
+        'model': 'news.NewsArticle',
+        'filters': {'status': 'published', 'published_date__isnull': False},
+        'title': 'News',
+        'link': 'news:list',
+        'description': 'excerpt',
+        'pubdate': 'published_date',
+        'updateddate': 'updated_at',
+        'url': ('news:detail', 'slug'),
+    },
+    'documents': {
+        'model': 'documents.Document',
+        'filters': {'is_public': True},
+        'title': 'Documents',
+        'link': 'documents:list',
+        'description': 'description',
+        'pubdate': 'uploaded_date',
+        'updateddate': 'updated_date',
+        'url': ('documents:detail', 'slug'),
+    },
+}
+
+FEED_FORMATS = {
+    'rss': feedgenerator.Rss201rev2Feed,
+    'atom': feedgenerator.Atom1Feed,
+}
+
+CONTENT_TYPES = {
+    '.xml': 'application/xml; charset=utf-8',
+    '.rss': 'application/rss+xml; charset=utf-8',
+    '.atom': 'application/atom+xml; charset=utf-8',
+}
+
+
+def get_root():
+    return Path(settings.SYNDICATION_ROOT)
+
+
+def absolute_url(path):
+    return settings.SITE_URL.rstrip('/') + path
+
+
+def chunk_for_pk(pk):
+    """Return the sitemap chunk number (1-based) that holds this primary key"""
+    return (pk - 1) // CHUNK_SIZE + 1
+
+
+def chunk_filename(section, chunk):
+    return f'sitemap-{section}-{chunk}.xml'
+
+
+def _write_atomic(path, write, mtime=None):
+    """Write via a temporary file so crawlers never see a half-written file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as output:
+            write(output)
+        os.chmod(tmp_path, 0o644)
+        if mtime is not None:
+            os.utime(tmp_path, (mtime.timestamp(), mtime.timestamp()))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _remove(path):
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _w3c_date(value):
+    return value.astimezone(dt_timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def write_sitemap_chunk(section, chunk):
+    """
+    Render one sitemap chunk from a primary key range query.
+
+    Returns the newest lastmod in the chunk, or None if it had no visible
+    objects (the file is then removed).
+    """
+    config = SITEMAP_SECTIONS[section]
+    model = apps.get_model(config['model'])
+    url_name, url_field = config['url']
+    lastmod_field = config['lastmod']
+
+    first_pk = (chunk - 1) * CHUNK_SIZE + 1
+    rows = list(
+        model.objects
+        .filter(pk__range=(first_pk, first_pk + CHUNK_SIZE - 1), **config['filters'])
+        .order_by('pk')
+        .values_list(url_field, lastmod_field)
+    )
+    path = get_root() / chunk_filename(section, chunk)
+    if not rows:
+        _remove(path)
+        return None
+
+    newest = max(lastmod for _, lastmod in rows)
+
+    def write(output):
+        output.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        output.write('<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+        for value, lastmod in rows:
+            location = absolute_url(reverse(url_name, kwargs={url_field: value}))
+            output.write(f'<url><loc>{escape(location)}</loc><lastmod>{_w3c_date(lastmod)}</lastmod></url>\n')
+        output.write('</urlset>\n')
+
+    _write_atomic(path, write, mtime=newest)
+    return newest
+
+
+def write_sitemap_index():
+    """List every chunk file on disk; its modification time is its lastmod"""
+    root = get_root()
+    entries = []
+    for section in SITEMAP_SECTIONS:
+        chunks = sorted(root.glob(f'sitemap-{section}-*.xml'), key=lambda path: int(path.stem.rsplit('-', 1)[1]))
+        for path in chunks:
+            modified = datetime.fromtimestamp(path.stat().st_mtime, tz=dt_timezone.utc)
+            entries.append((absolute_url(f'/{path.name}'), modified))
+
+    def write(output):
+        output.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        output.write('<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+        for location, modified in entries:
+            output.write(f'<sitemap><loc>{escape(location)}</loc><lastmod>{_w3c_date(modified)}</lastmod></sitemap>\n')
+        output.write('</sitemapindex>\n')
+
+    _write_atomic(root / 'sitemap.xml', write)
+
+
+def write_feeds(name):
+    """Render the RSS and Atom feeds for one content type"""
+    config = FEEDS[name]
+    model = apps.get_model(config['model'])
+    url_name, url_field = config['url']
+    fields = ('title', url_field, config['description'], config['pubdate'], config['updateddate'])
+    items = list(
+        model.objects
+        .filter(**config['filters'])
+        .order_by(f"-{config['pubdate']}")
+        .values(*fields)[:FEED_LENGTH]
+    )
+    site_name = SiteSettings.load().site_name
+    newest = max((item[config['updateddate']] for item in items), default=None)
+
+    for extension, feed_class in FEED_FORMATS.items():
+        feed_path = f'/feeds/{name}.{extension}'
+        feed = feed_class(
+            title=f"{site_name} - {config['title']}",
+            link=absolute_url(reverse(config['link'])),
+            description=f"Latest {config['title'].lower()} from {site_name}",
+            language=settings.LANGUAGE_CODE,
+            feed_url=absolute_url(feed_path),
+        )
+        for item in items:
+            link = absolute_url(reverse(url_name, kwargs={url_field: item[url_field]}))
+            feed.add_item(
+                title=item['title'],
+                link=link,
+                unique_id=link,
+                description=item[config['description']],
+                pubdate=item[config['pubdate']],
+                updateddate=item[config['updateddate']],
+            )
+        _write_atomic(
+            get_root() / feed_path.lstrip('/'),
+            lambda output: feed.write(output, 'utf-8'),
+            mtime=newest,
+        )
+
+
+def sections_for_model(model):
+    label = model._meta.label
+    sitemaps = [name for name, config in SITEMAP_SECTIONS.items() if config['model'] == label]
+    feeds = [name for name, config in FEEDS.items() if config['model'] == label]
+    return sitemaps, feeds
+
+
+def update_for_object(model, pk):
+    """Regenerate only the files an object can appear in"""
+    update_for_objects(model, [pk])
+
+
+def update_for_objects(model, pks):
+    """Regenerate the files a set of objects can appear in, each file once"""
+    sitemaps, feeds = sections_for_model(model)
+    for section in sitemaps:
+        for chunk in sorted({chunk_for_pk(pk) for pk in pks}):
+            write_sitemap_chunk(section, chunk)
+    for name in feeds:
+        write_feeds(name)
+    if sitemaps:
+        write_sitemap_index()
+
+
+def rebuild_all():
+    """Regenerate every sitemap chunk and feed; returns the number of chunk files written"""
+    written = 0
+    root = get_root()
+    for section, config in SITEMAP_SECTIONS.items():
+        model = apps.get_model(config['model'])
+        last_pk = model.objects.aggregate(last=Max('pk'))['last'] or 0
+        last_chunk = chunk_for_pk(last_pk) if last_pk else 0
+        for chunk in range(1, last_chunk + 1):
+            if write_sitemap_chunk(section, chunk) is not None:
+                written += 1
+        # Chunks past the highest primary key belonged to deleted rows
+        for path in root.glob(f'sitemap-{section}-*.xml'):
+            if int(path.stem.rsplit('-', 1)[1]) > last_chunk:
+                _remove(path)
+    write_sitemap_index()
+    for name in FEEDS:
+        write_feeds(name)
+    return written
+
+
+def published_fields(model):
+    """Fields whose change can alter the model's sitemap entries or feed items"""
+    label = model._meta.label
+    fields = set()
+    for config in SITEMAP_SECTIONS.values():
+        if config['model'] == label:
+            fields.update([config['lastmod'], config['url'][1]])
+            fields.update(lookup.split('__')[0] for lookup in config['filters'])
+    for config in FEEDS.values():
+        if config['model'] == label:
+            fields.update(['title', config['url'][1], config['description'], config['pubdate'], config['updateddate']])
+            fields.update(lookup.split('__')[0] for lookup in config['filters'])
+    return fields
+
+
+def schedule_update(sender, instance, **kwargs):
+    """post_save / post_delete handler: regenerate after the transaction commits"""
+    if kwargs.get('raw') or not getattr(settings, 'SYNDICATION_AUTO_UPDATE', True):
+        return
+    update_fields = kwargs.get('update_fields')
+    # e.g. increment_views() saving only the view counter
+    if update_fields is not None and not published_fields(sender).intersection(update_fields):
+        return
+    schedule_objects_update(type(instance), [instance.pk])
+
+
+def schedule_objects_update(model, pks):
+    """
+    Regenerate the files of these objects after the transaction commits.
+
+    Bulk queryset.update() sends no signals, so code changing published
+    fields that way calls this itself.
+    """
+    if not pks or not getattr(settings, 'SYNDICATION_AUTO_UPDATE', True):
+        return
+    pks = list(pks)
+
+    def update():
+        try:
+            update_for_objects(model, pks)
+        except Exception:
+            # A stale sitemap is better than a failed save
+            logger.exception('Could not update sitemaps/feeds for %s %s', model._meta.label, pks)
+
+    transaction.on_commit(update)
+
+
+def get_file(name):
+    """
+    Return the path of a published file, rendering it first if it is missing.
+
+    Returns None for names that are not published here.
+    """
+    root = get_root()
+    path = root / name
+    if path.exists():
+        return path
+
+    if name == 'sitemap.xml':
+        # Nothing published yet (fresh deploy)
+        rebuild_all()
+    elif name.startswith('sitemap-'):
+        section, _, chunk = name[len('sitemap-'):-len('.xml')].rpartition('-')
+        if section not in SITEMAP_SECTIONS or not chunk.isdigit():
+            return None
+        write_sitemap_chunk(section, int(chunk))
+    elif name.startswith('feeds/'):
+        feed = Path(name).stem
+        if feed not in FEEDS:
+            return None
+        write_feeds(feed)
+    return path if path.exists() else None
@@ -0,0 +1,69 @@
+"""
+Front-end assets for the page <head>.
+
+`npm run build` in theme/static_src bundles Alpine.js and Lucide into
+js/dist/app.js and copies the Inter / Poppins fonts into fonts/. Until that
+bundle exists (e.g. a checkout that never ran the build) the tags fall back
+to the local Alpine copy, the pinned Lucide CDN build and Google Fonts.
+"""
+
+from functools import lru_cache
+
+from django import template
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.templatetags.static import static
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+BUNDLE = 'js/dist/app.js'
+PRELOAD_FONTS = ('fonts/inter-latin-wght-normal.woff2',)
+
+GOOGLE_FONTS_URL = (
+    'https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700'
+    '&family=Poppins:wght@300;400;500;600;700&display=swap'
+)
+LUCIDE_CDN_URL = 'https://unpkg.com/lucide@0.546.0/dist/umd/lucide.min.js'
+
+
+@lru_cache(maxsize=None)
+def has_bundle():
+    """True once the vendored bundle has been built (checked once per process)"""
+    return bool(finders.find(BUNDLE)) or staticfiles_storage.exists(BUNDLE)
+
+
+@register.simple_tag
+def frontend_fonts():
+    """Preload the self-hosted body font, or link Google Fonts without the bundle"""
+    if has_bundle():
+        return mark_safe('\n'.join(
+            format_html('<link rel="preload" href="{}" as="font" type="font/woff2" crossorigin>', static(font))
+            for font in PRELOAD_FONTS
+        ))
+    return format_html(
+        '<link rel="preconnect" href="https://fonts.googleapis.com">\n'
+        '<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>\n'
+        '<link href="{}" rel="stylesheet">',
+        GOOGLE_FONTS_URL,
+    )
+
+
+@register.simple_tag
+def frontend_scripts(icons=True):
+    """
+    Load Alpine.js and, with icons=True, Lucide icons.
+
+    The bundle always contains both; the fallback loads Lucide only when asked.
+    """
+    if has_bundle():
+        return format_html('<script defer src="{}"></script>', static(BUNDLE))
+
+    tags = [format_html('<script defer src="{}"></script>', static('js/alpine.min.js'))]
+    if icons:
+        tags.append(format_html('<script defer src="{}"></script>', LUCIDE_CDN_URL))
+        tags.append(mark_safe(
+            "<script>document.addEventListener('DOMContentLoaded', function () { lucide.createIcons(); });</script>"
+        ))
+    return mark_safe('\n'.join(tags))
@@ -0,0 +1,52 @@
+"""
+Attributes that let the browser lay out and paint an image before it loads.
+
+    {% load images %}
+    <img src="{{ article.featured_image.url }}" {% image_attrs article.featured_image %}>
+
+renders the stored width and height (so the box is reserved and nothing
+reflows) and a background of the dominant colour under the blurred
+placeholder. Works for any field listed in IMAGE_FIELDS; the
+metadata is read from the model instance, never from the file.
+"""
+
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from apps.core.images import metadata_fields
+
+register = template.Library()
+
+
+def placeholder_style(color, placeholder):
+    """Inline CSS painting the colour and placeholder until the image covers them"""
+    declarations = []
+    if color:
+        declarations.append(('background-color', color))
+    if placeholder:
+        declarations.append(('background-image', f'url({placeholder})'))
+        declarations.append(('background-size', 'cover'))
+    return format_html_join(';', '{}:{}', declarations)
+
+
+@register.simple_tag
+def image_attrs(field_file):
+    """width, height and placeholder style attributes for a stored image"""
+    if not field_file:
+        return ''
+    names = metadata_fields(field_file.field.name)
+    width, height, color, placeholder = (
+        getattr(field_file.instance, names[suffix], None) for suffix in ('width', 'height', 'color', 'placeholder')
+    )
+    attrs = format_html('width="{}" height="{}"', width, height) if width and height else ''
+    style = placeholder_style(color, placeholder)
+    if style:
+        attrs = format_html('{} style="{}"', attrs, style)
+    return attrs
+
+
+@register.simple_tag
+def placeholder_attrs(color, placeholder):
+    """style attribute from values() rows or JSON items (color and placeholder keys)"""
+    style = placeholder_style(color, placeholder)
+    return format_html('style="{}"', style) if style else ''
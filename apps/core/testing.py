@@ -0,0 +1,167 @@
+"""Shared test helpers"""
+
+import re
+import socketserver
+import tempfile
+import threading
+import unittest
+
+from django.db import connection
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+
+
+class TestRunner(DiscoverRunner):
+    """
+    The project's test runner (settings.TEST_RUNNER).
+
+    Content committed by TransactionTestCases regenerates the sitemaps and
+    feeds, so the whole run writes them to a scratch SYNDICATION_ROOT instead
+    of the working tree.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.syndication_root = tempfile.TemporaryDirectory()
+        self.syndication_override = override_settings(SYNDICATION_ROOT=self.syndication_root.name)
+        self.syndication_override.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.syndication_override.disable()
+        self.syndication_root.cleanup()
+        super().teardown_test_environment(**kwargs)
+
+
+class QueryPlanAssertionsMixin:
+    """Assertions over EXPLAIN output (SQLite query planner)"""
+
+    def assertUsesIndex(self, queryset):
+        """
+        Fail if the query plan falls back to a full scan of the model's table.
+
+        Walking an index in ORDER BY order is accepted for unfiltered queries
+        and for partial indexes (whose condition already matches the filter);
+        otherwise a filtered query must SEARCH an index.
+        """
+        if connection.vendor != 'sqlite':
+            raise unittest.SkipTest('Query plan assertions require SQLite')
+
+        table = queryset.model._meta.db_table
+        filtered = bool(queryset.query.where)
+        partial_indexes = {
+            index.name for index in queryset.model._meta.indexes if index.condition is not None
+        }
+        plan = queryset.explain()
+        scan = re.compile(rf'\bSCAN {re.escape(table)}\b(?: USING (?:COVERING )?INDEX (\w+))?')
+        for line in plan.splitlines():
+            match = scan.search(line)
+            if not match:
+                continue
+            index_name = match.group(1)
+            if index_name is None or (filtered and index_name not in partial_indexes):
+                self.fail(f'Full table scan on {table}:\n{plan}\n\n{queryset.query}')
+        return plan
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Speaks just enough SMTP for smtplib / Django's SMTP backend"""
+
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        if server.max_connections is not None and server.connections > server.max_connections:
+            return
+        self.reply('220 localhost test SMTP')
+        sender, recipients = None, []
+
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                break
+            command = line.decode().strip()
+            verb = command[:4].upper()
+
+            if verb in ('EHLO', 'HELO'):
+                self.reply('250 localhost')
+            elif verb == 'MAIL':
+                sender, recipients = command.split(':', 1)[1].strip().strip('<>'), []
+                self.reply('250 OK')
+            elif verb == 'RCPT':
+                address = command.split(':', 1)[1].strip().strip('<>')
+                if address in server.rejected:
+                    self.reply('550 No such user')
+                else:
+                    recipients.append(address)
+                    self.reply('250 OK')
+            elif verb == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                data = []
+                while True:
+                    data_line = self.rfile.readline()
+                    if data_line in (b'.\r\n', b'.\n', b''):
+                        break
+                    data.append(data_line)
+                server.messages.append({
+                    'from': sender,
+                    'to': recipients,
+                    'data': b''.join(data).decode(),
+                })
+                self.reply('250 OK queued')
+                if len(server.messages) == server.drop_after:
+                    break
+            elif verb in ('RSET', 'NOOP'):
+                self.reply('250 OK')
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                break
+            else:
+                self.reply('502 Command not implemented')
+
+
+class LocalSMTPServer(socketserver.ThreadingTCPServer):
+    """
+    In-process SMTP server for tests.
+
+    Usage:
+        with LocalSMTPServer() as smtp, override_settings(**smtp.email_settings):
+            ...
+        smtp.messages     # delivered messages
+        smtp.connections  # SMTP sessions opened
+
+    Set drop_after to hang up once that many messages were delivered, and
+    max_connections to hang up on any later session straight away.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _SMTPHandler)
+        self.connections = 0
+        self.messages = []
+        self.rejected = set()
+        self.drop_after = None
+        self.max_connections = None
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+    @property
+    def email_settings(self):
+        return {
+            'EMAIL_BACKEND': 'django.core.mail.backends.smtp.EmailBackend',
+            'EMAIL_HOST': self.server_address[0],
+            'EMAIL_PORT': self.server_address[1],
+            'EMAIL_HOST_USER': '',
+            'EMAIL_HOST_PASSWORD': '',
+            'EMAIL_USE_TLS': False,
+            'EMAIL_USE_SSL': False,
+        }
@@ -1,3 +1,911 @@
-from django.test import TestCase
+import gzip
+import io
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.sessions.backends import cached_db
+from django.contrib.sessions.models import Session
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.core.cache import cache, caches
+from django.core.cache.backends import locmem
+from django.db import connection, connections
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.http import HttpResponse
+from django.template import Context, Template
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from PIL import Image
+
+from apps.documents.models import Document, DocumentCategory
+from apps.gallery.models import GalleryCategory, GalleryImage
+from apps.news.models import NewsArticle, NewsCategory
+from apps.projects.models import Project, ProjectCategory, ProjectImage
+from apps.services.models import Service, ServiceContentBlock
+from apps.staff.models import Department, StaffMember
+from . import backup, db, syndication
+from .mail import claim_batch, queue_mail, send_batch
+from .models import HeroSlide, OutgoingEmail
+from .middleware import ReplicaPinningMiddleware
+from .routers import ReplicaRouter, replica_reads
+from .sessions import HybridSessionMiddleware
+from .templatetags import frontend
+from .testing import LocalSMTPServer
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'])
+class ReplicaRouterTests(TestCase):
+    """Public reads go to the replica unless the visitor just saved something"""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.router = ReplicaRouter()
+
+    def routed_reads(self, request):
+        """Return the aliases chosen for a content model and a session-critical model"""
+        @replica_reads
+        def view(request):
+            return self.router.db_for_read(NewsCategory), self.router.db_for_read(User)
+        return view(request)
+
+    def test_reads_outside_replica_views_use_primary(self):
+        self.assertEqual(self.router.db_for_read(NewsCategory), 'default')
+
+    def test_public_view_reads_from_replica(self):
+        content_db, auth_db = self.routed_reads(self.factory.get('/news/'))
+        self.assertEqual(content_db, 'replica1')
+        self.assertEqual(auth_db, 'default')
+
+    def test_writes_always_use_primary(self):
+        self.assertEqual(self.router.db_for_write(NewsCategory), 'default')
+        self.assertFalse(self.router.allow_migrate('replica1', 'news'))
+
+    def test_pinned_visitor_reads_from_primary(self):
+        request = self.factory.get('/news/')
+        request.COOKIES['amma_primary_pin'] = str(int(time.time()) + 60)
+        self.assertEqual(self.routed_reads(request), ('default', 'default'))
+
+    def test_expired_pin_reads_from_replica(self):
+        request = self.factory.get('/news/')
+        request.COOKIES['amma_primary_pin'] = str(int(time.time()) - 1)
+        self.assertEqual(self.routed_reads(request)[0], 'replica1')
+
+    def save_through_middleware(self, user):
+        def get_response(request):
+            NewsCategory.objects.create(name='Updates', slug='updates')
+            return HttpResponse()
+
+        request = self.factory.post('/portal/news/create/')
+        request.user = user
+        return ReplicaPinningMiddleware(get_response)(request)
+
+    def test_staff_save_pins_to_primary(self):
+        staff = User.objects.create_user('editor', password='x', is_staff=True)
+        response = self.save_through_middleware(staff)
+        self.assertIn('amma_primary_pin', response.cookies)
+
+    def test_read_only_request_is_not_pinned(self):
+        staff = User.objects.create_user('editor', password='x', is_staff=True)
+        request = self.factory.get('/portal/')
+        request.user = staff
+        response = ReplicaPinningMiddleware(lambda request: HttpResponse())(request)
+        self.assertNotIn('amma_primary_pin', response.cookies)
+
+
+@override_settings(SYNDICATION_AUTO_UPDATE=False)
+class ReplicaReadsIntegrationTests(TransactionTestCase):
+    """A second SQLite file plays a replica that missed the latest write"""
+
+    def setUp(self):
+        cache.clear()
+        category = NewsCategory.objects.create(name='Announcements')
+        NewsArticle.objects.create(category=category, title='Water supply update', content='Text', status='published')
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        replica_path = Path(tmp.name) / 'replica.sqlite3'
+        backup.sqlite_snapshot(connection, replica_path)
+        NewsArticle.objects.create(category=category, title='New market opening', content='Text', status='published')
+
+        replica = DatabaseWrapper({**connection.settings_dict, 'NAME': str(replica_path)}, alias='replica1')
+        connections['replica1'] = replica
+        self.addCleanup(connections.__delitem__, 'replica1')
+        self.addCleanup(replica.close)
+
+    def titles(self):
+        response = self.client.get('/news/')
+        self.assertEqual(response.status_code, 200)
+        articles = [response.context['featured_article'], *response.context['articles']]
+        return {article.title for article in articles if article}
+
+    def test_public_view_reads_the_replica(self):
+        with override_settings(DATABASE_REPLICAS=['replica1']):
+            self.assertEqual(self.titles(), {'Water supply update'})
+        self.assertEqual(self.titles(), {'Water supply update', 'New market opening'})
+
+    @override_settings(DATABASE_REPLICAS=['replica1'])
+    def test_pinned_visitor_reads_the_primary(self):
+        self.client.cookies['amma_primary_pin'] = str(int(time.time()) + 60)
+        self.assertEqual(self.titles(), {'Water supply update', 'New market opening'})
+
+    @override_settings(DATABASE_REPLICAS=['replica1'])
+    def test_staff_write_pins_the_following_reads(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'secret-pass'))
+        response = self.client.post('/portal/api/news/categories/create/', {'name': 'Tenders'})
+        self.assertTrue(response.json()['success'])
+        self.assertIn('amma_primary_pin', response.cookies)
+        self.assertEqual(self.titles(), {'Water supply update', 'New market opening'})
+
+    @override_settings(DATABASE_REPLICAS=['replica1'])
+    def test_slugs_missing_on_the_replica_resolve_on_the_primary(self):
+        tenders = NewsCategory.objects.create(name='Tenders')
+        category = DocumentCategory.objects.create(name='Budgets')
+        Document.objects.bulk_create([Document(
+            title='Budget 2026', slug='budget-2026', description='Budget', category=category,
+            file='documents/budget.pdf', file_type='PDF',
+        )])
+
+        for _ in range(2):
+            self.assertEqual(self.client.get('/news/?category=tenders').context['selected_category'], tenders)
+            self.assertContains(self.client.get('/documents/budget-2026/'), 'Budget 2026')
+
+    def test_facet_counts_are_built_on_the_primary(self):
+        tenders = NewsCategory.objects.create(name='Tenders')
+        NewsArticle.objects.create(category=tenders, title='Market stalls tender', content='Text', status='published')
+
+        with override_settings(DATABASE_REPLICAS=['replica1']):
+            categories = self.client.get('/news/').context['categories']
+        self.assertEqual(
+            {category.name: category.article_count for category in categories},
+            {'Announcements': 2, 'Tenders': 1},
+        )
+
+
+class ConnectionStatsTests(SimpleTestCase):
+    """Persistent connections are counted as opened, reused or stale"""
+
+    def setUp(self):
+        db.reset_connection_stats()
+        db._local.__dict__.clear()
+
+    def simulate_request(self, open_at_start, open_at_end, replaced=False):
+        with mock.patch.object(db, '_open_aliases', return_value=set(open_at_start)):
+            db.track_request_started()
+        if replaced:
+            db.count_connection_opened(None, SimpleNamespace(alias='default'))
+        with mock.patch.object(db, '_open_aliases', return_value=set(open_at_end)):
+            db.track_request_finished()
+
+    def stats(self):
+        db.flush_connection_stats(force=True)
+        return db.get_connection_stats(['default'])['default']
+
+    def test_kept_connection_is_reused(self):
+        db.count_connection_opened(None, SimpleNamespace(alias='default'))
+        self.simulate_request(open_at_start=[], open_at_end=['default'])
+        self.simulate_request(open_at_start=['default'], open_at_end=['default'])
+        self.assertEqual(self.stats(), {'opened': 1, 'reused': 1, 'stale': 0})
+
+    def test_expired_connection_is_stale(self):
+        self.simulate_request(open_at_start=[], open_at_end=['default'])
+        self.simulate_request(open_at_start=[], open_at_end=[])
+        self.assertEqual(self.stats()['stale'], 1)
+
+    def test_failed_health_check_is_stale(self):
+        self.simulate_request(open_at_start=[], open_at_end=['default'])
+        self.simulate_request(open_at_start=['default'], open_at_end=['default'], replaced=True)
+        self.assertEqual(self.stats(), {'opened': 1, 'reused': 0, 'stale': 1})
+
+    def test_command_needs_a_shared_cache(self):
+        with self.assertRaisesMessage(CommandError, 'CACHE_URL'):
+            call_command('connection_stats', stdout=io.StringIO())
+
+        with tempfile.TemporaryDirectory() as tmp, override_settings(CACHES={
+            **settings.CACHES,
+            'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': tmp},
+        }):
+            self.simulate_request(open_at_start=[], open_at_end=['default'])
+            self.simulate_request(open_at_start=['default'], open_at_end=['default'])
+            output = io.StringIO()
+            call_command('connection_stats', stdout=output)
+        self.assertRegex(output.getvalue(), r'default\s+\S+\s+0\s+1\s+0')
+
+
+class SQLiteConnectionTests(SimpleTestCase):
+    """Every new SQLite connection gets SQLITE_PRAGMAS; checkpoint_wal empties the -wal file"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / 'db.sqlite3'
+
+    def connect(self):
+        wrapper = DatabaseWrapper({**connection.settings_dict, 'NAME': str(self.path)}, alias='scratch')
+        self.addCleanup(wrapper.close)
+        wrapper.ensure_connection()
+        return wrapper
+
+    def pragma(self, wrapper, name):
+        with wrapper.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_pragmas_are_applied_to_new_connections(self):
+        wrapper = self.connect()
+        self.assertEqual(self.pragma(wrapper, 'journal_mode'), 'wal')
+        self.assertEqual(self.pragma(wrapper, 'synchronous'), 1)  # NORMAL
+        self.assertEqual(self.pragma(wrapper, 'busy_timeout'), 5000)
+        self.assertEqual(self.pragma(wrapper, 'cache_size'), -20000)
+        self.assertEqual(self.pragma(wrapper, 'temp_store'), 2)  # MEMORY
+
+    @override_settings(SQLITE_PRAGMAS={'journal_mode': 'delete', 'busy_timeout': 250, 'cache_size': ''})
+    def test_pragmas_follow_the_settings(self):
+        wrapper = self.connect()
+        self.assertEqual(self.pragma(wrapper, 'journal_mode'), 'delete')
+        self.assertEqual(self.pragma(wrapper, 'busy_timeout'), 250)
+        self.assertEqual(self.pragma(wrapper, 'cache_size'), -2000)  # SQLite's default
+
+    def checkpoint(self, wrapper):
+        out = io.StringIO()
+        with mock.patch('apps.core.management.commands.checkpoint_wal.connections', {'scratch': wrapper}):
+            call_command('checkpoint_wal', database='scratch', stdout=out)
+        return out.getvalue()
+
+    def test_checkpoint_truncates_the_wal(self):
+        wrapper = self.connect()
+        with wrapper.cursor() as cursor:
+            cursor.execute('CREATE TABLE counter (value integer)')
+            cursor.executemany('INSERT INTO counter VALUES (%s)', [(value,) for value in range(100)])
+        wal = Path(f'{self.path}-wal')
+        self.assertGreater(wal.stat().st_size, 0)
+
+        self.assertIn('WAL checkpoint (TRUNCATE) complete', self.checkpoint(wrapper))
+        self.assertEqual(wal.stat().st_size, 0)
+
+    @override_settings(SQLITE_PRAGMAS={'journal_mode': 'delete'})
+    def test_checkpoint_without_wal_does_nothing(self):
+        self.assertIn('nothing to checkpoint', self.checkpoint(self.connect()))
+
+
+class HybridSessionTests(TestCase):
+    """Anonymous visitors never touch the session table; staff get a server-side session"""
+
+    def visit(self, **cookies):
+        def get_response(request):
+            request.session['flash'] = 'Thank you for contacting us!'
+            return HttpResponse()
+
+        request = RequestFactory().post('/contact/submit/')
+        request.COOKIES.update(cookies)
+        return HybridSessionMiddleware(get_response)(request)
+
+    def test_anonymous_session_is_a_signed_cookie(self):
+        response = self.visit()
+        self.assertIn('amma_visitor', response.cookies)
+        self.assertNotIn('sessionid', response.cookies)
+        self.assertFalse(Session.objects.exists())
+
+    @override_settings(ANONYMOUS_SESSIONS='none')
+    def test_anonymous_sessions_can_be_disabled(self):
+        response = self.visit()
+        self.assertFalse(response.cookies)
+        self.assertFalse(Session.objects.exists())
+
+    def test_login_promotes_to_server_session(self):
+        User.objects.create_user('editor', password='secret-pass', is_staff=True)
+        self.client.cookies['amma_visitor'] = 'stale'
+        response = self.client.post('/login/', {
+            'username': 'editor', 'password': 'secret-pass', 'remember_me': 'on',
+        })
+
+        self.assertEqual(response.status_code, 302)
+        session = Session.objects.get()
+        self.assertGreater(session.expire_date, timezone.now() + timedelta(days=29))
+        self.assertEqual(response.cookies['amma_visitor'].value, '')
+        self.assertEqual(self.client.get('/portal/').status_code, 200)
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.cached_db')
+    def test_logout_ends_the_cached_session_in_every_worker(self):
+        User.objects.create_user('editor', password='secret-pass', is_staff=True)
+        self.client.post('/login/', {'username': 'editor', 'password': 'secret-pass'})
+        cache_key = cached_db.SessionStore(self.client.cookies['sessionid'].value).cache_key
+
+        # Another worker: a cache instance with storage of its own if the backend is per-process
+        with mock.patch.multiple(locmem, _caches={}, _expire_info={}, _locks={}):
+            other_worker = caches.create_connection(settings.SESSION_CACHE_ALIAS)
+        self.assertIsNotNone(other_worker.get(cache_key))
+
+        self.client.get('/portal/logout/')
+        self.assertIsNone(other_worker.get(cache_key))
+
+
+class PruneSessionsTests(TestCase):
+    def test_deletes_only_expired_sessions_in_batches(self):
+        now = timezone.now()
+        for index in range(5):
+            Session.objects.create(session_key=f'expired{index}', session_data='', expire_date=now - timedelta(days=1))
+        Session.objects.create(session_key='live', session_data='', expire_date=now + timedelta(days=1))
+
+        call_command('prune_sessions', batch_size=2, pause=0, stdout=mock.MagicMock())
+
+        self.assertEqual(list(Session.objects.values_list('session_key', flat=True)), ['live'])
+
+
+class SendQueuedMailTests(TestCase):
+    """The outbox is delivered over one SMTP connection, with retries on failure"""
+
+    def send_queued_mail(self, smtp, **options):
+        with override_settings(**smtp.email_settings):
+            call_command('send_queued_mail', stdout=mock.MagicMock(), **options)
+
+    def test_batch_is_sent_over_one_connection(self):
+        for index in range(3):
+            queue_mail(f'Inquiry {index}', 'Hello', ['info@amma.gov.gh'])
+
+        with LocalSMTPServer() as smtp:
+            self.send_queued_mail(smtp)
+
+        self.assertEqual(smtp.connections, 1)
+        self.assertEqual(len(smtp.messages), 3)
+        self.assertEqual(OutgoingEmail.objects.filter(status='sent').count(), 3)
+
+    def test_failed_email_is_retried_with_backoff(self):
+        bounced = queue_mail('Bounced', 'Hello', ['nobody@amma.gov.gh'])
+        delivered = queue_mail('Delivered', 'Hello', ['info@amma.gov.gh'])
+
+        with LocalSMTPServer() as smtp:
+            smtp.rejected.add('nobody@amma.gov.gh')
+            with self.assertLogs('apps.core.mail', 'WARNING'):
+                self.send_queued_mail(smtp)
+
+        bounced.refresh_from_db()
+        delivered.refresh_from_db()
+        self.assertEqual(delivered.status, 'sent')
+        self.assertEqual(bounced.status, 'queued')
+        self.assertEqual(bounced.attempts, 1)
+        self.assertGreater(bounced.next_attempt_at, timezone.now() + timedelta(seconds=30))
+
+    def test_gives_up_after_max_attempts(self):
+        email = queue_mail('Bounced', 'Hello', ['nobody@amma.gov.gh'])
+        OutgoingEmail.objects.filter(pk=email.pk).update(attempts=2)
+
+        with LocalSMTPServer() as smtp:
+            smtp.rejected.add('nobody@amma.gov.gh')
+            with self.assertLogs('apps.core.mail', 'ERROR'):
+                self.send_queued_mail(smtp, max_attempts=3)
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'failed')
+        self.assertIn('nobody@amma.gov.gh', email.last_error)
+
+    def test_unreachable_server_keeps_mail_queued(self):
+        email = queue_mail('Inquiry', 'Hello', ['info@amma.gov.gh'])
+        with LocalSMTPServer() as smtp:
+            pass  # closed before sending
+
+        with self.assertLogs('apps.core.mail', 'WARNING'):
+            self.send_queued_mail(smtp)
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, 'queued')
+        self.assertEqual(email.attempts, 1)
+
+
+    def test_dropped_connection_is_reopened_for_the_rest_of_the_batch(self):
+        emails = [queue_mail(f'Inquiry {index}', 'Hello', ['info@amma.gov.gh']) for index in range(3)]
+
+        with LocalSMTPServer() as smtp, override_settings(**smtp.email_settings):
+            smtp.drop_after = 1
+            with self.assertLogs('apps.core.mail', 'WARNING'):
+                self.assertEqual(send_batch(claim_batch(10)), (2, 1))
+
+        self.assertEqual(smtp.connections, 2)
+        self.assertEqual(
+            list(OutgoingEmail.objects.filter(pk__in=[email.pk for email in emails]).order_by('pk').values_list('status', flat=True)),
+            ['sent', 'queued', 'sent'],
+        )
+
+    def test_failed_reconnect_keeps_the_rest_queued(self):
+        for index in range(3):
+            queue_mail(f'Inquiry {index}', 'Hello', ['info@amma.gov.gh'])
+
+        with LocalSMTPServer() as smtp, override_settings(**smtp.email_settings):
+            smtp.drop_after = 1
+            smtp.max_connections = 1
+            with self.assertLogs('apps.core.mail', 'WARNING'):
+                self.assertEqual(send_batch(claim_batch(10)), (1, 2))
+
+        queued = OutgoingEmail.objects.filter(status='queued')
+        self.assertEqual(queued.count(), 2)
+        self.assertEqual(set(queued.values_list('attempts', flat=True)), {1})
+
+
+class CompressedManifestStorageTests(SimpleTestCase):
+    """collectstatic writes hashed names, compressed siblings and the manifest"""
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.source = Path(tmpdir.name) / 'src'
+        self.root = Path(tmpdir.name) / 'root'
+        (self.source / 'css').mkdir(parents=True)
+        (self.source / 'css' / 'site.css').write_text('body { color: #1a1a1a; }\n' * 100)
+        (self.source / 'css' / 'tiny.css').write_text('a { color: red; }')
+
+    def static_settings(self):
+        return override_settings(
+            STATIC_ROOT=self.root,
+            STATICFILES_DIRS=[self.source],
+            STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+            STATIC_HTACCESS=True,
+            DEBUG=False,
+        )
+
+    def collectstatic(self):
+        """Run collectstatic and return the path of the hashed site.css"""
+        with self.static_settings():
+            call_command('collectstatic', interactive=False, verbosity=0)
+            return self.root / staticfiles_storage.url('css/site.css').removeprefix('/static/')
+
+    def test_hashed_and_precompressed_files(self):
+        hashed = self.collectstatic()
+
+        self.assertRegex(hashed.name, r'^site\.[0-9a-f]{12}\.css$')
+        self.assertEqual(gzip.decompress(Path(f'{hashed}.gz').read_bytes()), hashed.read_bytes())
+        self.assertTrue((self.root / 'css' / 'site.css.gz').exists())
+        self.assertFalse((self.root / 'css' / 'tiny.css.gz').exists())
+        self.assertIn('immutable', (self.root / '.htaccess').read_text())
+
+    def test_missing_file_falls_back_to_unhashed_url(self):
+        self.collectstatic()
+        with self.static_settings(), self.assertLogs('apps.core.storage', 'WARNING'):
+            self.assertEqual(staticfiles_storage.url('css/missing.css'), '/static/css/missing.css')
+
+    def test_unchanged_files_are_not_recompressed(self):
+        compressed = Path(f'{self.collectstatic()}.gz')
+        first_mtime = compressed.stat().st_mtime_ns
+
+        self.collectstatic()
+
+        self.assertEqual(compressed.stat().st_mtime_ns, first_mtime)
+
+
+class FrontendTagsTests(SimpleTestCase):
+    template = Template('{% load frontend %}{% frontend_fonts %}{% frontend_scripts %}')
+
+    def render(self, bundled):
+        frontend.has_bundle.cache_clear()
+        self.addCleanup(frontend.has_bundle.cache_clear)
+        with mock.patch.object(frontend.finders, 'find', return_value='/static/js/dist/app.js' if bundled else None), \
+                mock.patch.object(frontend.staticfiles_storage, 'exists', return_value=False):
+            return self.template.render(Context())
+
+    def test_bundle_replaces_cdns(self):
+        html = self.render(bundled=True)
+
+        self.assertIn('js/dist/app.js', html)
+        self.assertIn('rel="preload"', html)
+        self.assertNotIn('https://', html)
+
+    def test_fallback_without_bundle(self):
+        html = self.render(bundled=False)
+
+        self.assertIn('js/alpine.min.js', html)
+        self.assertIn('lucide@0.546.0', html)
+        self.assertIn('fonts.googleapis.com', html)
+
+
+class SyndicationTests(TestCase):
+    """Sitemaps and feeds are files, rewritten per chunk when content changes"""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        settings_override = override_settings(SYNDICATION_ROOT=tmp.name, SITE_URL='https://amma.example')
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def save(self, obj):
+        with self.captureOnCommitCallbacks(execute=True):
+            obj.save()
+        return obj
+
+    def test_save_rewrites_only_the_objects_chunk(self):
+        service = self.save(Service(name='Birth Registration', description='Register births'))
+        chunk = self.root / syndication.chunk_filename('services', syndication.chunk_for_pk(service.pk))
+
+        self.assertIn('https://amma.example/services/birth-registration/', chunk.read_text())
+        self.assertIn(chunk.name, (self.root / 'sitemap.xml').read_text())
+        self.assertFalse((self.root / 'sitemap-news-1.xml').exists())
+
+        service.is_active = False
+        self.save(service)
+        self.assertFalse(chunk.exists())
+        self.assertNotIn(chunk.name, (self.root / 'sitemap.xml').read_text())
+
+    def test_counter_updates_do_not_rewrite_files(self):
+        service = self.save(Service(name='Birth Registration', description='Register births'))
+        with self.captureOnCommitCallbacks() as callbacks:
+            service.save(update_fields=['order'])
+        self.assertEqual(callbacks, [])
+
+    def test_news_feeds(self):
+        category = NewsCategory.objects.create(name='Updates', slug='updates')
+        self.save(NewsArticle(title='Market Reopens', excerpt='The central market reopens', content='',
+                              category=category, status='published'))
+        self.save(NewsArticle(title='Draft Story', excerpt='Not yet', content='', category=category))
+
+        rss = (self.root / 'feeds' / 'news.rss').read_text()
+        self.assertIn('https://amma.example/news/market-reopens/', rss)
+        self.assertNotIn('Draft Story', rss)
+        self.assertIn('<feed', (self.root / 'feeds' / 'news.atom').read_text())
+
+    def test_documents_link_to_their_page_not_the_download(self):
+        cache.clear()
+        with tempfile.TemporaryDirectory() as media, override_settings(MEDIA_ROOT=media):
+            document = self.save(Document(
+                title='Budget 2025', description='Annual budget', category=DocumentCategory.objects.create(name='Budgets'),
+                file=SimpleUploadedFile('budget.pdf', b'%PDF-1.4'),
+            ))
+            chunk = (self.root / syndication.chunk_filename('documents', 1)).read_text()
+            self.assertIn('https://amma.example/documents/budget-2025/', chunk)
+            self.assertNotIn('/download/', chunk + (self.root / 'feeds' / 'documents.rss').read_text())
+
+            response = self.client.get(document.get_absolute_url())
+            self.assertContains(response, f'/documents/download/{document.pk}/')
+        document.refresh_from_db()
+        self.assertEqual(document.download_count, 0)
+
+    def test_admin_bulk_actions_update_the_files(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'secret-pass'))
+        category = NewsCategory.objects.create(name='Updates', slug='updates')
+        article = NewsArticle.objects.create(title='Market Reopens', content='', category=category)
+
+        def run(action):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post('/admin/news/newsarticle/', {'action': action, '_selected_action': [article.pk]})
+            return (self.root / 'feeds' / 'news.rss').read_text()
+
+        self.assertIn('market-reopens', run('publish_articles'))
+        self.assertIn('market-reopens', (self.root / 'sitemap-news-1.xml').read_text())
+        self.assertNotIn('market-reopens', run('archive_articles'))
+        self.assertFalse((self.root / 'sitemap-news-1.xml').exists())
+
+    def test_view_serves_file_and_handles_conditional_requests(self):
+        self.save(Service(name='Waste Collection', description='Weekly pickup'))
+
+        response = self.client.get('/sitemap.xml')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/xml; charset=utf-8')
+
+        response = self.client.get('/sitemap.xml', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.client.get('/feeds/unknown.rss').status_code, 404)
+
+
+class AdminChangelistQueryTests(TestCase):
+    """Changelists run a fixed number of queries however many rows they show"""
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'x'))
+
+    def add_rows(self, start, count):
+        """Create `count` rows for every changelist, each with its own category"""
+        for number in range(start, start + count):
+            news_category = NewsCategory.objects.create(name=f'News {number}', slug=f'news-{number}')
+            department = Department.objects.create(name=f'Department {number}', slug=f'department-{number}')
+            author = StaffMember.objects.create(full_name=f'Author {number}', position='Officer', department=department)
+            NewsArticle.objects.bulk_create([NewsArticle(
+                title=f'Article {number}', slug=f'article-{number}', excerpt='Excerpt', content='Some words here',
+                category=news_category, author=author, status='published',
+            )])
+            project_category = ProjectCategory.objects.create(name=f'Projects {number}', slug=f'projects-{number}')
+            project = Project.objects.bulk_create([Project(
+                title=f'Project {number}', slug=f'project-{number}', description='Road works', category=project_category,
+            )])[0]
+            ProjectImage.objects.bulk_create([ProjectImage(project=project, image='projects/road.jpg', is_primary=True)])
+            document_category = DocumentCategory.objects.create(name=f'Documents {number}', slug=f'documents-{number}')
+            Document.objects.bulk_create([Document(
+                title=f'Document {number}', slug=f'document-{number}', description='Budget',
+                category=document_category, file='documents/budget.pdf', file_type='PDF',
+            )])
+            gallery_category = GalleryCategory.objects.create(name=f'Gallery {number}', slug=f'gallery-{number}')
+            GalleryImage.objects.bulk_create([GalleryImage(
+                title=f'Image {number}', category=gallery_category, image='gallery/event.jpg',
+            )])
+            service = Service.objects.create(name=f'Service {number}', slug=f'service-{number}', description='Service')
+            ServiceContentBlock.objects.create(service=service, title='Requirements')
+
+    def changelist_queries(self):
+        # Warm per-process caches (content types, site settings) first
+        self.client.get('/admin/')
+        counts = {}
+        for model in (
+            NewsCategory, NewsArticle, ProjectCategory, Project, DocumentCategory, Document,
+            GalleryCategory, GalleryImage, Department, StaffMember, Service, ServiceContentBlock,
+        ):
+            url = f'/admin/{model._meta.app_label}/{model._meta.model_name}/'
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.client.get(url).status_code, 200)
+            counts[url] = len(queries)
+        return counts
+
+    def test_query_count_does_not_grow_with_rows(self):
+        self.add_rows(0, 1)
+        with_one_row = self.changelist_queries()
+        self.add_rows(1, 4)
+        self.assertEqual(self.changelist_queries(), with_one_row)
+
+    def test_count_columns_are_sortable(self):
+        self.add_rows(0, 2)
+        NewsArticle.objects.filter(slug='article-1').update(category=NewsCategory.objects.get(slug='news-0'))
+
+        response = self.client.get('/admin/news/newscategory/?o=-4')
+        self.assertEqual(
+            [category.num_articles for category in response.context['cl'].result_list], [2, 0]
+        )
+
+    def test_reading_time_matches_the_article(self):
+        category = NewsCategory.objects.create(name='Updates', slug='updates')
+        # Spaces in markup and between words are not words
+        article = NewsArticle.objects.create(
+            title='Budget', category=category, content='<p class="lead">\n' + 'word  ' * 450 + '</p>',
+        )
+
+        response = self.client.get(f'/admin/news/newsarticle/{article.pk}/change/')
+        self.assertContains(response, f'<div class="readonly">{article.reading_time} min</div>', html=True)
+        self.assertEqual(article.reading_time, 2)
+        response = self.client.get('/admin/news/newsarticle/add/')
+        self.assertContains(response, '<div class="readonly">1 min</div>', html=True)
+
+        # The changelist never scans the article bodies for it
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/admin/news/newsarticle/')
+        self.assertFalse(any('REPLACE' in query['sql'].upper() for query in queries))
+
+
+def image_upload(name='photo.jpg', size=(1200, 800), color=(200, 120, 40)):
+    output = io.BytesIO()
+    Image.new('RGB', size, color).save(output, 'JPEG')
+    return SimpleUploadedFile(name, output.getvalue(), content_type='image/jpeg')
+
+
+class ImageMetadataTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=tmp.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_metadata_is_stored_on_upload(self):
+        slide = HeroSlide.objects.create(title='Welcome', subtitle='Hello', image=image_upload())
+
+        self.assertEqual((slide.image_width, slide.image_height), (1200, 800))
+        self.assertRegex(slide.image_color, r'^#[0-9a-f]{6}$')
+        self.assertTrue(slide.image_placeholder.startswith('data:image/'))
+        self.assertLess(len(slide.image_placeholder), 400)
+
+    def test_unchanged_image_is_not_reopened(self):
+        slide = HeroSlide.objects.create(title='Welcome', subtitle='Hello', image=image_upload())
+        slide.refresh_from_db()
+        with mock.patch('apps.core.images.open_image') as open_image:
+            slide.title = 'Welcome back'
+            slide.save()
+        open_image.assert_not_called()
+
+        slide.image = image_upload('portrait.jpg', size=(300, 500))
+        slide.save()
+        self.assertEqual((slide.image_width, slide.image_height), (300, 500))
+
+    def test_image_attrs_tag_reads_stored_metadata(self):
+        slide = HeroSlide.objects.create(title='Welcome', subtitle='Hello', image=image_upload())
+        rendered = Template('{% load images %}<img {% image_attrs slide.image %}>').render(Context({'slide': slide}))
+
+        self.assertIn('width="1200" height="800"', rendered)
+        self.assertIn(f'background-color:{slide.image_color}', rendered)
+        self.assertIn('background-image:url(data:image/', rendered)
+
+    def test_backfill_uses_worker_processes(self):
+        category = GalleryCategory.objects.create(name='Events')
+        stored = default_storage.save('gallery/old.jpg', image_upload(size=(640, 480)))
+        broken = default_storage.save('gallery/broken.jpg', ContentFile(b'not an image'))
+        GalleryImage.objects.bulk_create([
+            GalleryImage(title='Old', category=category, image=stored),
+            GalleryImage(title='Broken', category=category, image=broken),
+        ])
+
+        out, err = io.StringIO(), io.StringIO()
+        call_command('backfill_image_metadata', model=['gallery.GalleryImage'], workers=2, stdout=out, stderr=err)
+
+        old = GalleryImage.objects.get(title='Old')
+        self.assertEqual((old.image_width, old.image_height), (640, 480))
+        self.assertTrue(old.image_placeholder)
+        self.assertIsNone(GalleryImage.objects.get(title='Broken').image_width)
+        self.assertIn('stored metadata for 1 image(s), 1 unreadable', out.getvalue())
+        self.assertIn('broken.jpg', err.getvalue())
+
+
+@override_settings(IMAGE_MAX_SIZES={'core.HeroSlide': (400, 400)})
+class ImageNormalisationTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=tmp.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def phone_photo(self):
+        """A landscape-encoded JPEG that EXIF says to rotate to portrait, with camera and GPS tags"""
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Orientation: rotate 90 degrees clockwise
+        exif[0x010F] = 'PhoneMaker'
+        exif[0x8825] = {1: 'N', 2: (51.0, 30.0, 0.0)}
+        output = io.BytesIO()
+        Image.new('RGB', (1600, 1200), (30, 90, 160)).save(output, 'JPEG', exif=exif, quality=95)
+        return SimpleUploadedFile('phone.jpg', output.getvalue(), content_type='image/jpeg')
+
+    def test_upload_is_oriented_downscaled_and_stripped(self):
+        upload = self.phone_photo()
+        original_size = upload.size
+        slide = HeroSlide.objects.create(title='Welcome', subtitle='Hello', image=upload)
+
+        with Image.open(slide.image.path) as stored:
+            self.assertEqual(stored.size, (300, 400))
+            self.assertEqual(len(stored.getexif()), 0)
+        self.assertEqual((slide.image_width, slide.image_height), (300, 400))
+        self.assertLess(slide.image.size, original_size)
+
+    def test_small_images_keep_their_size(self):
+        slide = HeroSlide.objects.create(title='Welcome', subtitle='Hello', image=image_upload(size=(320, 200)))
+        with Image.open(slide.image.path) as stored:
+            self.assertEqual(stored.size, (320, 200))
+
+    def test_animated_formats_are_stored_as_uploaded(self):
+        frames = [Image.new('P', (800, 800), color) for color in (1, 2)]
+        output = io.BytesIO()
+        frames[0].save(output, 'GIF', save_all=True, append_images=frames[1:])
+        slide = HeroSlide.objects.create(
+            title='Welcome', subtitle='Hello', image=SimpleUploadedFile('banner.gif', output.getvalue()),
+        )
+        with open(slide.image.path, 'rb') as stored:
+            self.assertEqual(stored.read(), output.getvalue())
+        self.assertEqual(slide.image_width, 800)
+
+
+class MediaAuditTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.media = Path(tmp.name) / 'media'
+        self.media.mkdir()
+        self.quarantine = Path(tmp.name) / 'quarantine'
+        settings_override = override_settings(MEDIA_ROOT=str(self.media), MEDIA_QUARANTINE_ROOT=str(self.quarantine))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.slide = HeroSlide.objects.create(title='Welcome', subtitle='Hello', image=image_upload())
+        category = GalleryCategory.objects.create(name='Events')
+        GalleryImage.objects.bulk_create([GalleryImage(title='Deleted', category=category, image='gallery/gone.jpg')])
+        # CKEditor uploads land in the media root and are only referenced from HTML
+        default_storage.save('inline.png', ContentFile(b'png'))
+        NewsArticle.objects.bulk_create([NewsArticle(
+            title='Story', slug='story', excerpt='Story', featured_image=self.slide.image.name,
+            category=NewsCategory.objects.create(name='Updates'),
+            content='<p><img src="/media/inline.png"></p>',
+        )])
+        self.orphan = default_storage.save('gallery/2020/orphan.jpg', ContentFile(b'left behind'))
+        old = time.time() - 3 * 86400
+        os.utime(self.media / self.orphan, (old, old))
+        default_storage.save('gallery/just-uploaded.jpg', ContentFile(b'in flight'))
+
+    def audit(self, **options):
+        out = io.StringIO()
+        call_command('media_audit', stdout=out, stderr=io.StringIO(), **options)
+        return out.getvalue()
+
+    def test_reports_orphans_and_missing_files(self):
+        output = self.audit()
+
+        self.assertIn(f'orphan {self.orphan}', output)
+        self.assertIn('missing gallery/gone.jpg (gallery.GalleryImage', output)
+        self.assertNotIn('inline.png', output)
+        self.assertNotIn('just-uploaded', output)
+        self.assertIn('1 orphan(s), 1 missing, 1 too recent to judge', output)
+        self.assertTrue((self.media / self.orphan).exists())
+
+    def test_media_urls_in_plain_text_and_json_are_references(self):
+        old = time.time() - 3 * 86400
+        for name in ('bios/photo.jpg', 'blocks/map.png'):
+            default_storage.save(name, ContentFile(b'image'))
+            os.utime(self.media / name, (old, old))
+        department = Department.objects.create(name='Works', slug='works')
+        StaffMember.objects.create(
+            full_name='Ama Mensah', position='Engineer', department=department,
+            bio='<p><img src="/media/bios/photo.jpg"> Civil engineer</p>',
+        )
+        service = Service.objects.create(name='Building Permits', description='Permits')
+        ServiceContentBlock.objects.create(
+            service=service, block_type='image', title='Map', data={'url': 'https://amma.example/media/blocks/map.png'},
+        )
+
+        output = self.audit(quarantine=True)
+        self.assertNotIn('bios/photo.jpg', output)
+        self.assertNotIn('blocks/map.png', output)
+        self.assertTrue((self.media / 'bios/photo.jpg').exists())
+        self.assertTrue((self.media / 'blocks/map.png').exists())
+
+    def test_quarantine_moves_orphans_out_of_media_root(self):
+        self.audit(quarantine=True)
+
+        self.assertFalse((self.media / self.orphan).exists())
+        self.assertEqual(len(list(self.quarantine.glob(f'*/{self.orphan}'))), 1)
+        self.assertTrue(Path(self.slide.image.path).exists())
+
+    def test_manifest_reports_changed_files(self):
+        manifest = self.media.parent / 'media.sha256'
+        self.assertIn('Checksummed 2 file(s): 0 unreadable, 0 changed', self.audit(checksums=True, manifest=manifest))
+
+        (self.media / 'inline.png').write_bytes(b'edited')
+        output = self.audit(checksums=True, manifest=manifest, workers=2)
+        self.assertIn('changed inline.png', output)
+        self.assertIn('1 changed', output)
+
+
+class BackupTests(TransactionTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+
+    def backup(self, **options):
+        out = io.StringIO()
+        call_command('backup_db', output_dir=str(self.root), compression='gzip', stdout=out, **options)
+        return out.getvalue()
+
+    def test_backup_restores_to_the_same_data(self):
+        NewsCategory.objects.create(name='Announcements')
+        self.assertIn('integrity ok', self.backup(verify=True))
+
+        [path] = backup.generations(self.root, 'sqlite3')
+        restored = self.root / 'restored.sqlite3'
+        backup.restore_sqlite(path, restored)
+        database = sqlite3.connect(restored)
+        self.addCleanup(database.close)
+        self.assertEqual(database.execute('SELECT name FROM news_newscategory').fetchall(), [('Announcements',)])
+
+    def test_unchanged_database_is_not_stored_again_and_old_generations_rotate(self):
+        self.backup()
+        self.assertIn('Unchanged since', self.backup())
+        self.assertEqual(len(backup.generations(self.root, 'sqlite3')), 1)
+
+        for name in ('Tenders', 'Events'):
+            NewsCategory.objects.create(name=name)
+            with mock.patch('apps.core.backup.timezone.now', return_value=timezone.now() + timedelta(minutes=len(name))):
+                self.backup(keep=2)
+        self.assertEqual(len(backup.generations(self.root, 'sqlite3')), 2)
+        self.assertEqual(len(list(self.root.glob('*.sha256'))), 2)
+
+    def test_corrupted_backup_is_rejected(self):
+        self.backup()
+        [path] = backup.generations(self.root, 'sqlite3')
+        with gzip.open(path, 'wb') as output:
+            output.write(b'SQLite format 3\0' + b'\0' * 4096)
+
+        target = self.root / 'restored.sqlite3'
+        with self.assertRaises(backup.BackupError):
+            backup.restore_sqlite(path, target)
+        self.assertFalse(target.exists())
@@ -1,6 +1,6 @@
 """URL configuration for core app."""
 
-from django.urls import path
+from django.urls import path, re_path
 from . import views
 
 app_name = 'core'
@@ -8,4 +8,9 @@ app_name = 'core'
 urlpatterns = [
     path('', views.homepage, name='homepage'),
     path('about/', views.about_page, name='about'),
+
+    # Pre-rendered sitemaps and feeds
+    path('sitemap.xml', views.syndication_file, {'name': 'sitemap.xml'}, name='sitemap'),
+    re_path(r'^(?P<name>sitemap-[a-z]+-\d+\.xml)$', views.syndication_file, name='sitemap_section'),
+    re_path(r'^(?P<name>feeds/[a-z]+\.(?:rss|atom))$', views.syndication_file, name='feed'),
 ]
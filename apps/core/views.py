@@ -1,12 +1,22 @@
+import os
+
+from django.http import FileResponse, Http404, HttpResponseNotModified
 from django.shortcuts import render
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+from django.views.static import was_modified_since
+
 from .models import HeroSlide, Statistic, AboutSection
 from apps.services.models import Service
 from apps.news.models import NewsArticle
 from apps.projects.models import Project
 from apps.staff.models import StaffMember
 from apps.documents.models import Document
+from .routers import replica_reads
+from . import syndication
 
 
+@replica_reads
 def homepage(request):
     """
     Homepage view with all dynamic content sections.
@@ -52,3 +62,20 @@ def about_page(request):
         'statistics': Statistic.objects.filter(is_active=True).order_by('order'),
     }
     return render(request, 'core/about.html', context)
+
+
+@require_safe
+def syndication_file(request, name):
+    """Serve a pre-rendered sitemap or feed (see apps/core/syndication.py)"""
+    path = syndication.get_file(name)
+    if path is None:
+        raise Http404('Not found')
+
+    stat = path.stat()
+    if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime):
+        return HttpResponseNotModified()
+
+    response = FileResponse(open(path, 'rb'), content_type=syndication.CONTENT_TYPES[os.path.splitext(name)[1]])
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Cache-Control'] = 'public, max-age=3600'
+    return response
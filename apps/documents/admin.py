@@ -1,5 +1,10 @@
 from django.contrib import admin
+from django.db.models import Count
 from django.utils.html import format_html
+from apps.api.resources import bump_versions_for_model
+from apps.core.facets import bump_facets_version
+from apps.core.slugs import bump_slug_version
+from apps.core.syndication import schedule_objects_update
 from .models import DocumentCategory, Document
 
 
@@ -27,10 +32,15 @@ class DocumentCategoryAdmin(admin.ModelAdmin):
         )
     icon_display.short_description = 'Icon'
 
+    def get_queryset(self, request):
+        # One COUNT per changelist instead of one query per row
+        return super().get_queryset(request).annotate(num_documents=Count('documents'))
+
     def document_count(self, obj):
         """Count of documents in this category"""
-        return obj.documents.count()
+        return obj.num_documents
     document_count.short_description = 'Documents'
+    document_count.admin_order_field = 'num_documents'
 
 
 @admin.register(Document)
@@ -55,6 +65,7 @@ class DocumentAdmin(admin.ModelAdmin):
     prepopulated_fields = {'slug': ('title',)}
     date_hierarchy = 'uploaded_date'
     ordering = ('-document_year', '-uploaded_date')
+    list_select_related = ('category',)
     readonly_fields = ('file_size', 'file_type', 'download_count', 'uploaded_date', 'updated_date')
 
     fieldsets = (
@@ -125,20 +136,32 @@ class DocumentAdmin(admin.ModelAdmin):
     # Custom Actions
     @admin.action(description='Mark as public')
     def mark_as_public(self, request, queryset):
+        pks = list(queryset.values_list('pk', flat=True))
         updated = queryset.update(is_public=True)
+        bump_versions_for_model(self.model)
+        bump_slug_version(self.model)
+        bump_facets_version('documents')
+        schedule_objects_update(self.model, pks)
         self.message_user(request, f'{updated} document(s) marked as public.')
 
     @admin.action(description='Mark as private')
     def mark_as_private(self, request, queryset):
+        pks = list(queryset.values_list('pk', flat=True))
         updated = queryset.update(is_public=False)
+        bump_versions_for_model(self.model)
+        bump_slug_version(self.model)
+        bump_facets_version('documents')
+        schedule_objects_update(self.model, pks)
         self.message_user(request, f'{updated} document(s) marked as private.')
 
     @admin.action(description='Mark as featured')
     def mark_as_featured(self, request, queryset):
         updated = queryset.update(is_featured=True)
+        bump_versions_for_model(self.model)
         self.message_user(request, f'{updated} document(s) marked as featured.')
 
     @admin.action(description='Unmark as featured')
     def unmark_as_featured(self, request, queryset):
         updated = queryset.update(is_featured=False)
+        bump_versions_for_model(self.model)
         self.message_user(request, f'{updated} document(s) unmarked as featured.')
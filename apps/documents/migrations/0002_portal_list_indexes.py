@@ -0,0 +1,17 @@
+# Generated by Django 5.0.8 on 2026-10-19 17:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['-uploaded_date'], name='documents_d_uploade_5dc5eb_idx'),
+        ),
+    ]
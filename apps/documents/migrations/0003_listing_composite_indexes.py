@@ -0,0 +1,29 @@
+# Generated by Django 5.0.8 on 2026-10-19 17:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0002_portal_list_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='document',
+            name='documents_d_is_publ_2aa443_idx',
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(condition=models.Q(('is_public', True)), fields=['-document_year', '-uploaded_date'], name='documents_public_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(condition=models.Q(('is_public', True)), fields=['category', '-document_year', '-uploaded_date'], name='documents_public_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(condition=models.Q(('is_featured', True), ('is_public', True)), fields=['-uploaded_date'], name='documents_featured_public_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.8 on 2026-10-19 18:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0003_listing_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['is_public', '-document_year', '-uploaded_date'], name='documents_is_public_year_idx'),
+        ),
+    ]
@@ -104,8 +104,32 @@ class Document(models.Model):
         verbose_name_plural = "Documents"
         indexes = [
             models.Index(fields=['category']),
-            models.Index(fields=['is_public']),
             models.Index(fields=['document_year']),
+            models.Index(fields=['-uploaded_date']),
+            # Public listings: is_public [AND category] ORDER BY document_year DESC, -uploaded_date.
+            # Boolean filters compile to a bare "WHERE is_public", which only a
+            # partial index with the same condition can serve. MySQL has no
+            # partial indexes and skips those, so it uses the plain one.
+            models.Index(
+                fields=['is_public', '-document_year', '-uploaded_date'],
+                name='documents_is_public_year_idx',
+            ),
+            models.Index(
+                fields=['-document_year', '-uploaded_date'],
+                condition=models.Q(is_public=True),
+                name='documents_public_year_idx',
+            ),
+            models.Index(
+                fields=['category', '-document_year', '-uploaded_date'],
+                condition=models.Q(is_public=True),
+                name='documents_public_category_idx',
+            ),
+            # Homepage featured documents
+            models.Index(
+                fields=['-uploaded_date'],
+                condition=models.Q(is_public=True, is_featured=True),
+                name='documents_featured_public_idx',
+            ),
         ]
 
     def save(self, *args, **kwargs):
@@ -128,6 +152,11 @@ class Document(models.Model):
             size_bytes /= 1024.0
         return f"{size_bytes:.1f} TB"
 
+    def get_absolute_url(self):
+        """Return the URL of this document's page"""
+        from django.urls import reverse
+        return reverse('documents:detail', kwargs={'slug': self.slug})
+
     def increment_downloads(self):
         """Increment download counter"""
         self.download_count += 1
@@ -1,3 +1,102 @@
-from django.test import TestCase
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db.models import F
+from django.test import TestCase, override_settings
+
+from apps.core import facets
+from apps.core.facets import get_facets
+from apps.core.testing import QueryPlanAssertionsMixin
+from .models import Document, DocumentCategory
+
+
+class DocumentListingIndexTests(QueryPlanAssertionsMixin, TestCase):
+    """Listing queries must be served by an index, not a full table scan"""
+
+    def test_public_listing_uses_index(self):
+        self.assertUsesIndex(
+            Document.objects.filter(is_public=True).order_by(
+                F('document_year').desc(nulls_last=True), '-uploaded_date'
+            )
+        )
+
+    def test_public_category_listing_uses_index(self):
+        self.assertUsesIndex(
+            Document.objects.filter(is_public=True, category_id=1).order_by(
+                F('document_year').desc(nulls_last=True), '-uploaded_date'
+            )
+        )
+
+    def test_featured_listing_uses_index(self):
+        self.assertUsesIndex(
+            Document.objects.filter(is_public=True, is_featured=True).order_by('-uploaded_date')[:6]
+        )
+
+
+@override_settings(SYNDICATION_AUTO_UPDATE=False)
+class DocumentFacetTests(TestCase):
+    """Category and year counts come from one cached grouped query"""
+
+    def setUp(self):
+        cache.clear()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=tmp.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.budgets = DocumentCategory.objects.create(name='Budgets')
+        self.reports = DocumentCategory.objects.create(name='Reports')
+        self.add('Budget 2024', self.budgets, 2024)
+        self.add('Budget 2025', self.budgets, 2025)
+        self.report = self.add('Annual Report', self.reports, 2024)
+        self.add('Undated Report', self.reports, None)
+
+    def add(self, title, category, year):
+        return Document.objects.create(
+            title=title, description=title, category=category, document_year=year,
+            file=SimpleUploadedFile(f'{title}.pdf', b'%PDF-1.4'),
+        )
+
+    def counts(self, **selection):
+        facets = get_facets('documents', **selection)
+        return (
+            {category.name: category.doc_count for category in facets['categories']},
+            [(year['year'], year['count']) for year in facets['years']],
+        )
+
+    def test_counts_and_combined_facets_are_cached(self):
+        self.assertEqual(self.counts(), ({'Budgets': 2, 'Reports': 2}, [(2025, 1), (2024, 2)]))
+        # Only the shared version reads
+        with self.assertNumQueries(2):
+            self.assertEqual(self.counts(category=self.budgets.pk), ({'Budgets': 2, 'Reports': 2}, [(2025, 1), (2024, 1)]))
+            self.assertEqual(self.counts(year=2024), ({'Budgets': 1, 'Reports': 1}, [(2025, 1), (2024, 2)]))
+
+    def test_writes_invalidate_the_counts(self):
+        self.counts()
+        self.report.increment_downloads()
+        with self.assertNumQueries(1):
+            self.counts()
+
+        self.report.is_public = False
+        self.report.save()
+        self.assertEqual(self.counts(), ({'Budgets': 2, 'Reports': 1}, [(2025, 1), (2024, 1)]))
+
+        self.reports.name = 'Annual Reports'
+        self.reports.save()
+        self.assertIn('Annual Reports', self.counts()[0])
+
+    def test_changes_saved_in_another_worker_reach_this_one(self):
+        self.counts()
+        with mock.patch.object(facets, 'cache', LocMemCache('other-worker', {})):
+            self.report.is_public = False
+            self.report.save()
+        self.assertEqual(self.counts(), ({'Budgets': 2, 'Reports': 1}, [(2025, 1), (2024, 1)]))
+
+    def test_listing_shows_the_counts(self):
+        response = self.client.get('/documents/', {'category': self.budgets.slug})
+        self.assertEqual([category.doc_count for category in response.context['categories']], [2, 2])
+        self.assertEqual(response.context['years'], [{'year': 2025, 'count': 1}, {'year': 2024, 'count': 1}])
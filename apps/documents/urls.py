@@ -8,4 +8,5 @@ app_name = 'documents'
 urlpatterns = [
     path('', views.document_list, name='list'),
     path('download/<int:pk>/', views.document_download, name='download'),
+    path('<slug:slug>/', views.document_detail, name='detail'),
 ]
@@ -2,10 +2,14 @@ from django.shortcuts import render, get_object_or_404
 from django.http import FileResponse, Http404
 from django.core.paginator import Paginator
 from django.db import models
-from django.db.models import Count, Q, F
+from django.db.models import Q, F
 from .models import Document, DocumentCategory
+from apps.core.facets import get_facets
+from apps.core.routers import replica_reads
+from apps.core.slugs import get_by_slug_or_404
 
 
+@replica_reads
 def document_list(request):
     """Display list of public documents with pagination, filtering, search and sorting."""
     documents = Document.objects.filter(is_public=True).select_related('category')
@@ -83,18 +87,10 @@ def document_list(request):
             documents_by_year[year] = []
         documents_by_year[year].append(doc)
 
-    # Get categories with document counts
-    categories = DocumentCategory.objects.annotate(
-        doc_count=Count('documents', filter=Q(documents__is_public=True))
-    ).filter(doc_count__gt=0)
-
-    # Get available years with document counts
-    years = Document.objects.filter(
-        is_public=True,
-        document_year__isnull=False
-    ).values('document_year').annotate(
-        doc_count=Count('id')
-    ).order_by('-document_year')
+    # Category and year counts (cached; each counted within the other's selection)
+    facets = get_facets(
+        'documents', category=selected_category.pk if selected_category else None, year=selected_year,
+    )
 
     # Available quarters
     quarters = ['Q1', 'Q2', 'Q3', 'Q4']
@@ -102,9 +98,9 @@ def document_list(request):
     context = {
         'documents': page_obj,
         'documents_by_year': documents_by_year,
-        'categories': categories,
+        'categories': facets['categories'],
         'selected_category': selected_category,
-        'years': years,
+        'years': facets['years'],
         'selected_year': selected_year,
         'quarters': quarters,
         'selected_quarter': selected_quarter,
@@ -115,6 +111,13 @@ def document_list(request):
     return render(request, 'documents/list.html', context)
 
 
+@replica_reads
+def document_detail(request, slug):
+    """Display a public document's details; the file itself is served by document_download."""
+    document = get_by_slug_or_404(Document, slug, Document.objects.select_related('category'))
+    return render(request, 'documents/detail.html', {'document': document})
+
+
 def document_download(request, pk):
     """Handle document download and increment counter."""
     document = get_object_or_404(Document, pk=pk, is_public=True)
@@ -1,5 +1,7 @@
 from django.contrib import admin
+from django.db.models import Count
 from django.utils.html import format_html
+from apps.api.resources import bump_versions_for_model
 from .models import GalleryCategory, GalleryImage
 
 
@@ -19,10 +21,15 @@ class GalleryCategoryAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        # One COUNT per changelist instead of one query per row
+        return super().get_queryset(request).annotate(num_images=Count('images'))
+
     def image_count(self, obj):
         """Count of images in this category"""
-        return obj.images.count()
+        return obj.num_images
     image_count.short_description = 'Images'
+    image_count.admin_order_field = 'num_images'
 
 
 @admin.register(GalleryImage)
@@ -43,6 +50,7 @@ class GalleryImageAdmin(admin.ModelAdmin):
     search_fields = ('title', 'caption')
     date_hierarchy = 'date_taken'
     ordering = ('-date_taken', '-uploaded_date')
+    list_select_related = ('category',)
     readonly_fields = ('uploaded_date',)
 
     fieldsets = (
@@ -73,9 +81,11 @@ class GalleryImageAdmin(admin.ModelAdmin):
     @admin.action(description='Mark as featured')
     def mark_as_featured(self, request, queryset):
         updated = queryset.update(is_featured=True)
+        bump_versions_for_model(self.model)
         self.message_user(request, f'{updated} image(s) marked as featured.')
 
     @admin.action(description='Unmark as featured')
     def unmark_as_featured(self, request, queryset):
         updated = queryset.update(is_featured=False)
+        bump_versions_for_model(self.model)
         self.message_user(request, f'{updated} image(s) unmarked as featured.')
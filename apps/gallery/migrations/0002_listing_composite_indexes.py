@@ -0,0 +1,29 @@
+# Generated by Django 5.0.8 on 2026-10-19 17:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gallery', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='galleryimage',
+            name='gallery_gal_categor_efd69b_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='galleryimage',
+            name='gallery_gal_date_ta_077b37_idx',
+        ),
+        migrations.AddIndex(
+            model_name='galleryimage',
+            index=models.Index(fields=['-date_taken', '-uploaded_date'], name='gallery_gal_date_ta_1ae130_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='galleryimage',
+            index=models.Index(fields=['category', '-date_taken', '-uploaded_date'], name='gallery_gal_categor_62db3c_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.8 on 2026-10-19 20:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gallery', '0003_image_thumbnail_dimensions'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='galleryimage',
+            old_name='width',
+            new_name='image_width',
+        ),
+        migrations.RenameField(
+            model_name='galleryimage',
+            old_name='height',
+            new_name='image_height',
+        ),
+        migrations.AddField(
+            model_name='galleryimage',
+            name='image_color',
+            field=models.CharField(blank=True, editable=False, max_length=7),
+        ),
+        migrations.AddField(
+            model_name='galleryimage',
+            name='image_placeholder',
+            field=models.TextField(blank=True, editable=False),
+        ),
+    ]
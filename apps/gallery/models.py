@@ -40,6 +40,14 @@ class GalleryImage(models.Model):
     )
     caption = models.TextField(blank=True)
 
+    # Stored when the image changes (see apps.core.images)
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_color = models.CharField(max_length=7, blank=True, editable=False)
+    image_placeholder = models.TextField(blank=True, editable=False)
+    # Listing rendition, rendered when the image changes (see apps.core.images)
+    thumbnail = models.ImageField(upload_to='gallery/thumbs/%Y/%m/', blank=True, editable=False)
+
     # Dates
     date_taken = models.DateField(
         blank=True,
@@ -60,8 +68,9 @@ class GalleryImage(models.Model):
         verbose_name = "Gallery Image"
         verbose_name_plural = "Gallery Images"
         indexes = [
-            models.Index(fields=['category']),
-            models.Index(fields=['-date_taken']),
+            # Gallery listings: [category] ORDER BY -date_taken, -uploaded_date
+            models.Index(fields=['-date_taken', '-uploaded_date']),
+            models.Index(fields=['category', '-date_taken', '-uploaded_date']),
         ]
 
     def __str__(self):
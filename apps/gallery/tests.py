@@ -1,3 +1,136 @@
-from django.test import TestCase
+import base64
+import io
+import json
+import tempfile
+from datetime import date
 
-# Create your tests here.
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.db.models import F
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+
+from apps.core.testing import QueryPlanAssertionsMixin
+from .models import GalleryCategory, GalleryImage
+
+
+class GalleryListingIndexTests(QueryPlanAssertionsMixin, TestCase):
+    """Listing queries must be served by an index, not a full table scan"""
+
+    def test_listing_uses_index(self):
+        self.assertUsesIndex(
+            GalleryImage.objects.order_by('-date_taken', '-uploaded_date')[:24]
+        )
+
+    def test_category_listing_uses_index(self):
+        self.assertUsesIndex(
+            GalleryImage.objects.filter(category_id=1).order_by('-date_taken', '-uploaded_date')
+        )
+
+
+def make_image_file(name='photo.jpg', size=(1200, 800), image_format='JPEG'):
+    output = io.BytesIO()
+    Image.new('RGB', size, (200, 120, 40)).save(output, image_format)
+    return SimpleUploadedFile(name, output.getvalue(), content_type='image/jpeg')
+
+
+class GalleryThumbnailTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.category = GalleryCategory.objects.create(name='Events')
+
+    def test_upload_stores_thumbnail_and_dimensions(self):
+        image = GalleryImage.objects.create(title='Launch', category=self.category, image=make_image_file())
+
+        self.assertEqual((image.image_width, image.image_height), (1200, 800))
+        self.assertTrue(image.thumbnail.name.startswith('gallery/thumbs/'))
+        with Image.open(image.thumbnail.path) as thumbnail:
+            self.assertEqual(thumbnail.size, (600, 400))
+
+    def test_unreadable_upload_is_saved_without_thumbnail(self):
+        upload = SimpleUploadedFile('broken.jpg', b'not an image', content_type='image/jpeg')
+        with self.assertLogs('apps', 'WARNING'):
+            image = GalleryImage.objects.create(title='Broken', category=self.category, image=upload)
+        self.assertFalse(image.thumbnail)
+        self.assertIsNone(image.image_width)
+
+
+class GalleryFeedTests(TestCase):
+    def setUp(self):
+        self.events = GalleryCategory.objects.create(name='Events', slug='events')
+        dates = [date(2024, 5, 1), date(2024, 5, 1), None, date(2024, 6, 1), None, date(2023, 1, 1), date(2024, 5, 1)]
+        GalleryImage.objects.bulk_create([
+            GalleryImage(
+                title=f'Photo {number}', category=self.events, image=f'gallery/photo-{number}.jpg',
+                thumbnail=f'gallery/thumbs/photo-{number}.jpg' if number % 2 else '',
+                image_width=1200, image_height=800, date_taken=taken, order=number % 3,
+            )
+            for number, taken in enumerate(dates)
+        ])
+
+    def walk(self, url):
+        ids, cursor = [], None
+        while True:
+            response = self.client.get(url, {'limit': 2, **({'cursor': cursor} if cursor else {})})
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            ids += [item['id'] for item in data['results']]
+            cursor = data['next_cursor']
+            if not cursor:
+                return ids
+
+    def test_cursor_walks_every_image_once_in_order(self):
+        expected = list(
+            GalleryImage.objects.order_by(F('date_taken').desc(nulls_last=True), '-uploaded_date', 'id')
+            .values_list('id', flat=True)
+        )
+        self.assertEqual(self.walk('/gallery/feed/'), expected)
+
+        album_order = list(
+            GalleryImage.objects.order_by('order', F('date_taken').desc(nulls_last=True), '-uploaded_date', 'id')
+            .values_list('id', flat=True)
+        )
+        self.assertEqual(self.walk('/gallery/album/events/feed/'), album_order)
+
+    def test_items_are_compact_and_prefer_thumbnails(self):
+        items = self.client.get('/gallery/feed/', {'limit': 60}).json()['results']
+        self.assertEqual(
+            set(items[0]), {'id', 'title', 'thumbnail', 'image', 'width', 'height', 'color', 'placeholder'}
+        )
+        by_title = {item['title']: item for item in items}
+        self.assertEqual(by_title['Photo 1']['thumbnail'], '/media/gallery/thumbs/photo-1.jpg')
+        self.assertEqual(by_title['Photo 2']['thumbnail'], '/media/gallery/photo-2.jpg')
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get('/gallery/feed/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.json()['success'])
+
+    def test_well_formed_cursor_with_bad_values_is_rejected(self):
+        bad_values = [
+            ['abc', '2024-05-01T10:00:00+00:00', 1],
+            [{'a': 1}, '2024-05-01T10:00:00+00:00', 1],
+            ['2024-05-01', '2024-05-01T10:00:00+00:00', 'one'],
+            ['2024-05-01', None, 1],
+        ]
+        for values in bad_values:
+            cursor = base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+            with self.subTest(values=values):
+                response = self.client.get('/gallery/feed/', {'cursor': cursor})
+                self.assertEqual(response.status_code, 400)
+                # The pages fall back to the first batch
+                self.assertEqual(self.client.get('/gallery/', {'cursor': cursor}).status_code, 200)
+                self.assertEqual(self.client.get('/gallery/album/events/', {'cursor': cursor}).status_code, 200)
+
+    def test_list_renders_first_batch_without_count_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/gallery/')
+        self.assertEqual(len(response.context['images']), 7)
+        self.assertIsNone(response.context['next_cursor'])
+        self.assertFalse(any('COUNT(' in query['sql'] for query in queries))
+        self.assertContains(response, 'width="1200" height="800"')
@@ -7,5 +7,7 @@ app_name = 'gallery'
 
 urlpatterns = [
     path('', views.gallery_list, name='list'),
+    path('feed/', views.gallery_feed, name='feed'),
     path('album/<slug:slug>/', views.album_detail, name='album'),
+    path('album/<slug:slug>/feed/', views.album_feed, name='album_feed'),
 ]
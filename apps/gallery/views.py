@@ -1,7 +1,66 @@
-from django.shortcuts import render, get_object_or_404
-from django.core.paginator import Paginator
+from django.core.files.storage import default_storage
+from django.http import JsonResponse
+from django.shortcuts import render
+from django.urls import reverse
+from django.views.decorators.http import require_safe
+
+from apps.core.keyset import InvalidCursor, after_cursor, decode_cursor, encode_cursor
+from apps.core.slugs import get_by_slug_or_404, resolve_slug
 from .models import GalleryImage, GalleryCategory
 
+GALLERY_PAGE_SIZE = 24
+GALLERY_MAX_PAGE_SIZE = 60
+
+# Keyset orderings; each ends with the primary key so every image has its own position
+LATEST_ORDERING = ('-date_taken', '-uploaded_date', 'id')
+ALBUM_ORDERING = ('order', '-date_taken', '-uploaded_date', 'id')
+NULLABLE_FIELDS = {'date_taken'}
+
+
+def _feed_page(queryset, ordering, cursor, limit=GALLERY_PAGE_SIZE):
+    """
+    Return (items, next cursor) for one batch of images after `cursor`.
+
+    Items are compact dicts: the thumbnail (or the original, for images
+    without one), the original for the lightbox and its stored dimensions,
+    dominant colour and placeholder.
+    """
+    if cursor:
+        queryset = queryset.filter(
+            after_cursor(ordering, decode_cursor(cursor, ordering, queryset.model), NULLABLE_FIELDS)
+        )
+    rows = list(
+        queryset
+        .order_by(*ordering)
+        .values(
+            'id', 'title', 'image', 'thumbnail', 'image_width', 'image_height', 'image_color', 'image_placeholder',
+            'order', 'date_taken', 'uploaded_date',
+        )
+        [:limit + 1]
+    )
+    next_cursor = encode_cursor(rows[limit - 1], ordering) if len(rows) > limit else None
+
+    items = [{
+        'id': row['id'],
+        'title': row['title'],
+        'thumbnail': default_storage.url(row['thumbnail'] or row['image']),
+        'image': default_storage.url(row['image']),
+        'width': row['image_width'],
+        'height': row['image_height'],
+        'color': row['image_color'],
+        'placeholder': row['image_placeholder'],
+    } for row in rows[:limit]]
+    return items, next_cursor
+
+
+def _feed_response(request, queryset, ordering):
+    try:
+        limit = max(1, min(int(request.GET.get('limit', GALLERY_PAGE_SIZE)), GALLERY_MAX_PAGE_SIZE))
+        items, next_cursor = _feed_page(queryset, ordering, request.GET.get('cursor'), limit)
+    except (ValueError, InvalidCursor):
+        return JsonResponse({'success': False, 'error': 'Invalid cursor or limit'}, status=400)
+    return JsonResponse({'success': True, 'results': items, 'next_cursor': next_cursor})
+
 
 def gallery_list(request):
     """Display gallery with all images organized by category."""
@@ -14,20 +73,27 @@ def gallery_list(request):
     # Filter by category if provided
     category_slug = request.GET.get('category')
     if category_slug:
-        category = get_object_or_404(GalleryCategory, slug=category_slug)
-        images = GalleryImage.objects.filter(category=category).order_by('-date_taken', '-uploaded_date')
+        category = get_by_slug_or_404(GalleryCategory, category_slug)
+        images = GalleryImage.objects.filter(category=category)
     else:
         category = None
-        images = GalleryImage.objects.select_related('category').order_by('-date_taken', '-uploaded_date')
+        images = GalleryImage.objects.all()
+
+    # First batch rendered here; the rest is fetched from gallery_feed while scrolling
+    try:
+        page, next_cursor = _feed_page(images, LATEST_ORDERING, request.GET.get('cursor'))
+    except InvalidCursor:
+        page, next_cursor = _feed_page(images, LATEST_ORDERING, None)
 
-    # Pagination
-    paginator = Paginator(images, 24)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    feed_url = reverse('gallery:feed')
+    if category:
+        feed_url += f'?category={category.slug}'
 
     context = {
         'featured_images': featured_images,
-        'images': page_obj,
+        'images': page,
+        'next_cursor': next_cursor,
+        'feed_url': feed_url,
         'categories': categories,
         'selected_category': category,
     }
@@ -36,17 +102,37 @@ def gallery_list(request):
 
 def album_detail(request, slug):
     """Display all images in a specific category/album."""
-    category = get_object_or_404(GalleryCategory, slug=slug)
-    images = GalleryImage.objects.filter(category=category).order_by('order', '-date_taken')
+    category = get_by_slug_or_404(GalleryCategory, slug)
+    images = GalleryImage.objects.filter(category=category)
 
-    # Pagination
-    paginator = Paginator(images, 24)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    try:
+        page, next_cursor = _feed_page(images, ALBUM_ORDERING, request.GET.get('cursor'))
+    except InvalidCursor:
+        page, next_cursor = _feed_page(images, ALBUM_ORDERING, None)
 
     context = {
         'category': category,
-        'images': page_obj,
+        'images': page,
+        'next_cursor': next_cursor,
+        'feed_url': reverse('gallery:album_feed', kwargs={'slug': slug}),
         'all_categories': GalleryCategory.objects.all(),
     }
     return render(request, 'gallery/album.html', context)
+
+
+@require_safe
+def gallery_feed(request):
+    """JSON batches of the gallery (optionally one category), newest first"""
+    images = GalleryImage.objects.all()
+    category_slug = request.GET.get('category')
+    if category_slug:
+        entry = resolve_slug(GalleryCategory, category_slug)
+        images = images.filter(category_id=entry.pk) if entry else images.none()
+    return _feed_response(request, images, LATEST_ORDERING)
+
+
+@require_safe
+def album_feed(request, slug):
+    """JSON batches of one album, in its curated order"""
+    category = get_by_slug_or_404(GalleryCategory, slug)
+    return _feed_response(request, GalleryImage.objects.filter(category=category), ALBUM_ORDERING)
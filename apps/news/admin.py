@@ -1,6 +1,11 @@
 from django.contrib import admin
+from django.db.models import Count
 from django.utils.html import format_html
 from django.utils import timezone
+from apps.api.resources import bump_versions_for_model
+from apps.core.facets import bump_facets_version
+from apps.core.slugs import bump_slug_version
+from apps.core.syndication import schedule_objects_update
 from .models import NewsCategory, NewsArticle
 
 
@@ -27,10 +32,15 @@ class NewsCategoryAdmin(admin.ModelAdmin):
         )
     color_badge.short_description = 'Color'
 
+    def get_queryset(self, request):
+        # One COUNT per changelist instead of one query per row
+        return super().get_queryset(request).annotate(num_articles=Count('articles'))
+
     def article_count(self, obj):
         """Count of articles in this category"""
-        return obj.articles.count()
+        return obj.num_articles
     article_count.short_description = 'Articles'
+    article_count.admin_order_field = 'num_articles'
 
 
 @admin.register(NewsArticle)
@@ -53,6 +63,7 @@ class NewsArticleAdmin(admin.ModelAdmin):
     prepopulated_fields = {'slug': ('title',)}
     date_hierarchy = 'published_date'
     ordering = ('-published_date', '-created_at')
+    list_select_related = ('category', 'author')
     readonly_fields = ('views', 'reading_time', 'created_at', 'updated_at')
 
     fieldsets = (
@@ -116,25 +127,42 @@ class NewsArticleAdmin(admin.ModelAdmin):
     # Custom Actions
     @admin.action(description='Publish selected articles')
     def publish_articles(self, request, queryset):
+        pks = list(queryset.values_list('pk', flat=True))
         updated = queryset.update(status='published', published_date=timezone.now())
+        bump_versions_for_model(self.model)
+        bump_slug_version(self.model)
+        bump_facets_version('news')
+        schedule_objects_update(self.model, pks)
         self.message_user(request, f'{updated} article(s) published successfully.')
 
     @admin.action(description='Unpublish selected articles')
     def unpublish_articles(self, request, queryset):
+        pks = list(queryset.values_list('pk', flat=True))
         updated = queryset.update(status='draft')
+        bump_versions_for_model(self.model)
+        bump_slug_version(self.model)
+        bump_facets_version('news')
+        schedule_objects_update(self.model, pks)
         self.message_user(request, f'{updated} article(s) unpublished.')
 
     @admin.action(description='Mark as featured')
     def feature_articles(self, request, queryset):
         updated = queryset.update(is_featured=True)
+        bump_versions_for_model(self.model)
         self.message_user(request, f'{updated} article(s) marked as featured.')
 
     @admin.action(description='Unmark as featured')
     def unfeature_articles(self, request, queryset):
         updated = queryset.update(is_featured=False)
+        bump_versions_for_model(self.model)
         self.message_user(request, f'{updated} article(s) unmarked as featured.')
 
     @admin.action(description='Archive selected articles')
     def archive_articles(self, request, queryset):
+        pks = list(queryset.values_list('pk', flat=True))
         updated = queryset.update(status='archived')
+        bump_versions_for_model(self.model)
+        bump_slug_version(self.model)
+        bump_facets_version('news')
+        schedule_objects_update(self.model, pks)
         self.message_user(request, f'{updated} article(s) archived.')
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.8 on 2026-10-19 17:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0001_initial'),
+        ('staff', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='newsarticle',
+            index=models.Index(fields=['-created_at'], name='news_newsar_created_c5e5ce_idx'),
+        ),
+    ]
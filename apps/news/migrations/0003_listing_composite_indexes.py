@@ -0,0 +1,26 @@
+# Generated by Django 5.0.8 on 2026-10-19 17:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0002_portal_list_indexes'),
+        ('staff', '0002_listing_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='newsarticle',
+            name='news_newsar_status_f99d47_idx',
+        ),
+        migrations.AddIndex(
+            model_name='newsarticle',
+            index=models.Index(fields=['status', '-published_date'], name='news_newsar_status_53fa3e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='newsarticle',
+            index=models.Index(condition=models.Q(('is_featured', True), ('status', 'published')), fields=['-published_date'], name='news_featured_published_idx'),
+        ),
+    ]
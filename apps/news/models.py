@@ -52,6 +52,11 @@ class NewsArticle(models.Model):
         upload_to='news/%Y/%m/',
         help_text="Main article image (recommended: 800x600px)"
     )
+    # Stored when the image changes (see apps.core.images)
+    featured_image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    featured_image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    featured_image_color = models.CharField(max_length=7, blank=True, editable=False)
+    featured_image_placeholder = models.TextField(blank=True, editable=False)
     image_caption = models.CharField(max_length=200, blank=True)
 
     # Classification
@@ -100,8 +105,16 @@ class NewsArticle(models.Model):
         verbose_name_plural = "News Articles"
         indexes = [
             models.Index(fields=['-published_date']),
-            models.Index(fields=['status']),
             models.Index(fields=['slug']),
+            models.Index(fields=['-created_at']),
+            # Public listings: status='published' ORDER BY -published_date
+            models.Index(fields=['status', '-published_date']),
+            # Homepage featured news
+            models.Index(
+                fields=['-published_date'],
+                condition=models.Q(status='published', is_featured=True),
+                name='news_featured_published_idx',
+            ),
         ]
 
     def save(self, *args, **kwargs):
@@ -143,3 +156,32 @@ class NewsArticle(models.Model):
         """Return the URL for this article"""
         from django.urls import reverse
         return reverse('news:detail', kwargs={'slug': self.slug})
+
+
+class RelatedArticle(models.Model):
+    """Precomputed most similar articles (see apps/core/similarity.py)"""
+
+    source = models.ForeignKey(
+        NewsArticle,
+        on_delete=models.CASCADE,
+        related_name='similarity_links'
+    )
+    target = models.ForeignKey(
+        NewsArticle,
+        on_delete=models.CASCADE,
+        related_name='similar_to'
+    )
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ['source', 'rank']
+        verbose_name = "Related Article"
+        verbose_name_plural = "Related Articles"
+        constraints = [
+            # Also the index behind the detail page lookup: source = ? ORDER BY rank
+            models.UniqueConstraint(fields=['source', 'rank'], name='news_related_source_rank_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.source_id} -> {self.target_id} ({self.score:.2f})"
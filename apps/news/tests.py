@@ -1,3 +1,185 @@
-from django.test import TestCase
+import importlib
+import sys
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import TestCase, override_settings
+
+from apps.core import slugs
+from apps.core.models import PendingRelatedRefresh
+from apps.core.similarity import TOP_K, refresh_pending
+from apps.core.slugs import resolve_slug
+from apps.core.testing import QueryPlanAssertionsMixin
+from .models import NewsArticle, NewsCategory, RelatedArticle
+
+
+class NewsListingIndexTests(QueryPlanAssertionsMixin, TestCase):
+    """Listing queries must be served by an index, not a full table scan"""
+
+    def test_published_listing_uses_index(self):
+        self.assertUsesIndex(
+            NewsArticle.objects.filter(status='published').order_by('-published_date')
+        )
+
+    def test_published_category_listing_uses_index(self):
+        self.assertUsesIndex(
+            NewsArticle.objects.filter(status='published', category_id=1).order_by('-published_date')
+        )
+
+    def test_featured_listing_uses_index(self):
+        self.assertUsesIndex(
+            NewsArticle.objects.filter(status='published', is_featured=True).order_by('-published_date')[:3]
+        )
+
+
+@override_settings(SYNDICATION_AUTO_UPDATE=False)
+class RelatedArticlesTests(QueryPlanAssertionsMixin, TestCase):
+    """Related articles come from the precomputed similarity index"""
+
+    def setUp(self):
+        self.category = NewsCategory.objects.create(name='Updates', slug='updates')
+
+    def publish(self, title, content):
+        article = NewsArticle.objects.create(
+            title=title, excerpt=title, content=f'<p>{content}</p>',
+            category=self.category, status='published',
+        )
+        refresh_pending('news')
+        return article
+
+    def test_saves_only_queue_a_refresh(self):
+        roads = NewsArticle.objects.create(title='Road Works', content='Road', category=self.category, status='published')
+        roads.title = 'Road Works Update'
+        roads.save()
+        self.assertEqual(list(PendingRelatedRefresh.objects.values_list('index', 'object_id')), [('news', roads.pk)])
+
+        self.assertEqual(refresh_pending('news'), 1)
+        self.assertFalse(PendingRelatedRefresh.objects.exists())
+        self.assertEqual(refresh_pending('news'), 0)
+
+    def test_queueing_does_not_need_numpy(self):
+        roads = NewsArticle.objects.create(title='Road Works', content='Road', category=self.category, status='published')
+        PendingRelatedRefresh.objects.all().delete()
+
+        # A fresh import of the module, as at startup, on a host without numpy
+        with mock.patch.dict(sys.modules, {'numpy': None}):
+            del sys.modules['apps.core.similarity']
+            similarity = importlib.import_module('apps.core.similarity')
+            similarity.schedule_refresh(NewsArticle, roads)
+        self.assertTrue(PendingRelatedRefresh.objects.filter(object_id=roads.pk).exists())
+
+    def test_similar_articles_are_linked_on_publish(self):
+        roads = self.publish('Road Rehabilitation Begins', 'Asphalt road rehabilitation works on the market road.')
+        self.publish('Health Screening Exercise', 'Free malaria and blood pressure screening at the clinic.')
+        more_roads = self.publish('Road Works Update', 'Road rehabilitation reaches the market with new asphalt.')
+
+        self.assertEqual(
+            list(RelatedArticle.objects.filter(source=roads).values_list('target', flat=True)[:1]),
+            [more_roads.pk],
+        )
+        response = self.client.get(roads.get_absolute_url())
+        self.assertEqual(response.context['related_articles'][0], more_roads)
+
+    def test_refresh_leaves_unindexed_sources_to_the_rebuild(self):
+        NewsArticle.objects.bulk_create(
+            NewsArticle(title=f'Road Works {number}', slug=f'road-works-{number}', excerpt='',
+                        content='<p>Road rehabilitation with new asphalt.</p>',
+                        category=self.category, status='published')
+            for number in range(TOP_K + 2)
+        )
+        # Terms found in more than half the articles are ignored
+        NewsArticle.objects.bulk_create(
+            NewsArticle(title=f'Clinic Notice {number}', slug=f'clinic-notice-{number}', excerpt='',
+                        content='<p>Free malaria screening.</p>', category=self.category, status='published')
+            for number in range(TOP_K + 3)
+        )
+        latest = self.publish('Road Works Update', 'Road rehabilitation with new asphalt.')
+
+        # The others have plenty of candidates; they only lack links because
+        # no full build ran yet, so the refresh does not rewrite them
+        self.assertEqual(set(RelatedArticle.objects.values_list('source', flat=True)), {latest.pk})
+        self.assertEqual(RelatedArticle.objects.filter(source=latest).count(), TOP_K)
+
+    def test_unpublishing_removes_links(self):
+        roads = self.publish('Road Rehabilitation Begins', 'Asphalt road rehabilitation works.')
+        more_roads = self.publish('Road Works Update', 'Road rehabilitation with new asphalt.')
+
+        more_roads.status = 'draft'
+        more_roads.save()
+        refresh_pending('news')
+
+        self.assertFalse(RelatedArticle.objects.filter(target=more_roads).exists())
+        self.assertFalse(RelatedArticle.objects.filter(source=roads).exists())
+
+    def test_view_counter_does_not_refresh_index(self):
+        roads = self.publish('Road Rehabilitation Begins', 'Asphalt road rehabilitation works.')
+        roads.increment_views()
+        self.assertFalse(PendingRelatedRefresh.objects.exists())
+
+    def test_related_lookup_uses_index(self):
+        self.assertUsesIndex(RelatedArticle.objects.filter(source_id=1).order_by('rank'))
+
+
+@override_settings(SYNDICATION_AUTO_UPDATE=False)
+class SlugResolutionTests(TestCase):
+    """Detail pages resolve slugs from the cache and fetch rows by primary key"""
+
+    def setUp(self):
+        cache.clear()
+        self.category = NewsCategory.objects.create(name='Updates', slug='updates')
+        self.article = NewsArticle.objects.create(
+            title='Market Reopens', excerpt='Market', content='<p>Market</p>',
+            category=self.category, status='published',
+        )
+
+    def test_unknown_and_draft_slugs_404_from_the_cache(self):
+        NewsArticle.objects.create(title='Draft Story', excerpt='Draft', content='', category=self.category)
+        for url in ('/news/no-such-story/', '/news/draft-story/'):
+            self.assertEqual(self.client.get(url).status_code, 404)
+            # Only the shared version read
+            with self.assertNumQueries(1):
+                self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_cache_follows_slug_changes_publishing_and_deletes(self):
+        self.assertEqual(self.client.get('/news/market-reopens/').status_code, 200)
+        self.article.slug = 'central-market-reopens'
+        self.article.save()
+        self.assertEqual(self.client.get('/news/market-reopens/').status_code, 404)
+        self.assertEqual(self.client.get('/news/central-market-reopens/').status_code, 200)
+
+        draft = NewsArticle.objects.create(title='Draft Story', excerpt='Draft', content='', category=self.category)
+        self.assertEqual(self.client.get('/news/draft-story/').status_code, 404)
+        draft.status = 'published'
+        draft.save()
+        self.assertEqual(self.client.get('/news/draft-story/').status_code, 200)
+
+        draft.delete()
+        self.assertEqual(self.client.get('/news/draft-story/').status_code, 404)
+
+    def test_view_counter_keeps_cached_entries(self):
+        resolve_slug(NewsArticle, 'market-reopens')
+        resolve_slug(NewsCategory, 'updates')
+        self.article.increment_views()
+        # One shared version read per model
+        with self.assertNumQueries(2):
+            self.assertEqual(resolve_slug(NewsArticle, 'market-reopens').pk, self.article.pk)
+            self.assertEqual(resolve_slug(NewsCategory, 'updates').obj, self.category)
+
+    def test_changes_saved_in_another_worker_reach_this_one(self):
+        draft = NewsArticle.objects.create(title='Draft Story', excerpt='Draft', content='', category=self.category)
+        self.assertEqual(self.client.get('/news/draft-story/').status_code, 404)
+        self.assertEqual(self.client.get('/news/category/updates/').status_code, 200)
+
+        with mock.patch.object(slugs, 'cache', LocMemCache('other-worker', {})):
+            draft.status = 'published'
+            draft.save()
+            self.category.name = 'Latest Updates'
+            self.category.save()
+
+        self.assertEqual(self.client.get('/news/draft-story/').status_code, 200)
+        self.assertEqual(resolve_slug(NewsCategory, 'updates').obj.name, 'Latest Updates')
+
+    def test_unknown_slugs_expire_quickly_in_a_local_cache(self):
+        self.assertIsInstance(caches['default'], LocMemCache)
+        self.assertEqual(slugs.unknown_slug_timeout(), slugs.LOCAL_UNKNOWN_SLUG_TIMEOUT)
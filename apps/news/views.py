@@ -1,9 +1,13 @@
-from django.shortcuts import render, get_object_or_404
+from django.shortcuts import render
 from django.core.paginator import Paginator
-from django.db.models import Count, Q
+from django.db.models import Q
 from .models import NewsArticle, NewsCategory
+from apps.core.facets import get_facets
+from apps.core.routers import replica_reads
+from apps.core.slugs import get_by_slug_or_404, resolve_slug
 
 
+@replica_reads
 def news_list(request):
     """Display list of published news articles with search, filtering, and sorting."""
     articles = NewsArticle.objects.filter(
@@ -19,8 +23,12 @@ def news_list(request):
     # Filter by category if provided
     selected_category = None
     if category_slug:
-        articles = articles.filter(category__slug=category_slug)
-        selected_category = NewsCategory.objects.filter(slug=category_slug).first()
+        entry = resolve_slug(NewsCategory, category_slug)
+        if entry:
+            articles = articles.filter(category_id=entry.pk)
+            selected_category = entry.obj
+        else:
+            articles = articles.none()
 
     # Filter by year if provided
     selected_year = None
@@ -63,16 +71,10 @@ def news_list(request):
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
 
-    # Get categories with article counts
-    categories = NewsCategory.objects.annotate(
-        article_count=Count('articles', filter=Q(articles__status='published'))
-    ).filter(article_count__gt=0).order_by('name')
-
-    # Get available years with article counts
-    years = NewsArticle.objects.filter(
-        status='published',
-        published_date__isnull=False
-    ).dates('published_date', 'year', order='DESC')
+    # Category and year counts (cached; each counted within the other's selection)
+    facets = get_facets(
+        'news', category=selected_category.pk if selected_category else None, year=selected_year,
+    )
 
     # Get most viewed articles for sidebar
     most_viewed = NewsArticle.objects.filter(
@@ -82,9 +84,9 @@ def news_list(request):
     context = {
         'articles': page_obj,
         'featured_article': featured_article,
-        'categories': categories,
+        'categories': facets['categories'],
         'selected_category': selected_category,
-        'years': years,
+        'years': facets['years'],
         'selected_year': selected_year,
         'search_query': search_query or '',
         'sort_by': sort_by,
@@ -96,20 +98,22 @@ def news_list(request):
 
 def news_detail(request, slug):
     """Display single news article detail."""
-    article = get_object_or_404(
-        NewsArticle.objects.select_related('category', 'author'),
-        slug=slug,
-        status='published'
-    )
+    article = get_by_slug_or_404(NewsArticle, slug, NewsArticle.objects.select_related('category', 'author'))
 
     # Increment views
     article.increment_views()
 
-    # Related articles
-    related = NewsArticle.objects.filter(
-        category=article.category,
-        status='published'
-    ).exclude(pk=article.pk).order_by('-published_date')[:3]
+    # Related articles: precomputed most similar (apps/core/similarity.py),
+    # falling back to the latest in the category until the index has them
+    related = list(
+        NewsArticle.objects.filter(similar_to__source=article, status='published')
+        .order_by('similar_to__rank')[:3]
+    )
+    if not related:
+        related = NewsArticle.objects.filter(
+            category=article.category,
+            status='published'
+        ).exclude(pk=article.pk).order_by('-published_date')[:3]
 
     context = {
         'article': article,
@@ -120,7 +124,7 @@ def news_detail(request, slug):
 
 def news_by_category(request, slug):
     """Display news articles filtered by category."""
-    category = get_object_or_404(NewsCategory, slug=slug)
+    category = get_by_slug_or_404(NewsCategory, slug)
     articles = NewsArticle.objects.filter(
         category=category,
         status='published'
@@ -1,5 +1,7 @@
 from django.contrib import admin
+from django.db.models import Count
 from django.utils.html import format_html
+from apps.api.resources import bump_versions_for_model
 from .models import ProjectCategory, Project, ProjectImage
 
 
@@ -38,10 +40,15 @@ class ProjectCategoryAdmin(admin.ModelAdmin):
         )
     color_badge.short_description = 'Color'
 
+    def get_queryset(self, request):
+        # One COUNT per changelist instead of one query per row
+        return super().get_queryset(request).annotate(num_projects=Count('projects'))
+
     def project_count(self, obj):
         """Count of projects in this category"""
-        return obj.projects.count()
+        return obj.num_projects
     project_count.short_description = 'Projects'
+    project_count.admin_order_field = 'num_projects'
 
 
 class ProjectImageInline(admin.TabularInline):
@@ -82,6 +89,7 @@ class ProjectAdmin(admin.ModelAdmin):
     prepopulated_fields = {'slug': ('title',)}
     date_hierarchy = 'start_date'
     ordering = ('-is_featured', 'order', '-start_date')
+    list_select_related = ('category',)
     readonly_fields = ('created_at', 'updated_at')
     inlines = [ProjectImageInline]
 
@@ -113,6 +121,10 @@ class ProjectAdmin(admin.ModelAdmin):
 
     actions = ['mark_as_featured', 'unmark_as_featured', 'mark_as_ongoing', 'mark_as_completed']
 
+    def get_queryset(self, request):
+        # primary_image reuses the prefetched images instead of querying per row
+        return super().get_queryset(request).prefetch_related('images')
+
     def primary_image_preview(self, obj):
         """Display primary project image"""
         primary = obj.primary_image
@@ -150,19 +162,23 @@ class ProjectAdmin(admin.ModelAdmin):
     @admin.action(description='Mark as featured')
     def mark_as_featured(self, request, queryset):
         updated = queryset.update(is_featured=True)
+        bump_versions_for_model(self.model)
         self.message_user(request, f'{updated} project(s) marked as featured.')
 
     @admin.action(description='Unmark as featured')
     def unmark_as_featured(self, request, queryset):
         updated = queryset.update(is_featured=False)
+        bump_versions_for_model(self.model)
         self.message_user(request, f'{updated} project(s) unmarked as featured.')
 
     @admin.action(description='Mark as ongoing')
     def mark_as_ongoing(self, request, queryset):
         updated = queryset.update(status='ongoing')
+        bump_versions_for_model(self.model)
         self.message_user(request, f'{updated} project(s) marked as ongoing.')
 
     @admin.action(description='Mark as completed')
     def mark_as_completed(self, request, queryset):
         updated = queryset.update(status='completed')
+        bump_versions_for_model(self.model)
         self.message_user(request, f'{updated} project(s) marked as completed.')
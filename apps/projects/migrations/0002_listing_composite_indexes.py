@@ -0,0 +1,17 @@
+# Generated by Django 5.0.8 on 2026-10-19 17:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['-is_featured', 'order', '-start_date'], name='projects_pr_is_feat_05fc76_idx'),
+        ),
+    ]
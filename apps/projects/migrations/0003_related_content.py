@@ -0,0 +1,33 @@
+# Generated by Django 5.0.8 on 2026-10-19 18:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_listing_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedProject',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('source', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similarity_links', to='projects.project')),
+                ('target', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='similar_to', to='projects.project')),
+            ],
+            options={
+                'verbose_name': 'Related Project',
+                'verbose_name_plural': 'Related Projects',
+                'ordering': ['source', 'rank'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='relatedproject',
+            constraint=models.UniqueConstraint(fields=('source', 'rank'), name='projects_related_source_rank_uniq'),
+        ),
+    ]
@@ -125,6 +125,8 @@ class Project(models.Model):
             models.Index(fields=['status']),
             models.Index(fields=['category']),
             models.Index(fields=['slug']),
+            # Default listing order: -is_featured, order, -start_date
+            models.Index(fields=['-is_featured', 'order', '-start_date']),
         ]
 
     def save(self, *args, **kwargs):
@@ -138,6 +140,10 @@ class Project(models.Model):
     @property
     def primary_image(self):
         """Get the primary project image"""
+        if 'images' in getattr(self, '_prefetched_objects_cache', {}):
+            # Images are ordered primary-first, so reuse the prefetched list
+            images = self.images.all()
+            return images[0] if images else None
         return self.images.filter(is_primary=True).first() or self.images.first()
 
     @property
@@ -164,6 +170,11 @@ class ProjectImage(models.Model):
         upload_to='projects/%Y/%m/',
         help_text="Project image (recommended: 1200x800px)"
     )
+    # Stored when the image changes (see apps.core.images)
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_color = models.CharField(max_length=7, blank=True, editable=False)
+    image_placeholder = models.TextField(blank=True, editable=False)
     caption = models.CharField(max_length=200, blank=True)
     is_primary = models.BooleanField(
         default=False,
@@ -188,3 +199,32 @@ class ProjectImage(models.Model):
 
     def __str__(self):
         return f"{self.project.title} - Image {self.order}"
+
+
+class RelatedProject(models.Model):
+    """Precomputed most similar projects (see apps/core/similarity.py)"""
+
+    source = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        related_name='similarity_links'
+    )
+    target = models.ForeignKey(
+        Project,
+        on_delete=models.CASCADE,
+        related_name='similar_to'
+    )
+    score = models.FloatField()
+    rank = models.PositiveSmallIntegerField()
+
+    class Meta:
+        ordering = ['source', 'rank']
+        verbose_name = "Related Project"
+        verbose_name_plural = "Related Projects"
+        constraints = [
+            # Also the index behind the detail page lookup: source = ? ORDER BY rank
+            models.UniqueConstraint(fields=['source', 'rank'], name='projects_related_source_rank_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.source_id} -> {self.target_id} ({self.score:.2f})"
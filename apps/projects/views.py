@@ -1,9 +1,12 @@
-from django.shortcuts import render, get_object_or_404
+from django.shortcuts import render
 from django.core.paginator import Paginator
 from django.db.models import Q, Count
 from .models import Project, ProjectCategory
+from apps.core.routers import replica_reads
+from apps.core.slugs import get_by_slug_or_404
 
 
+@replica_reads
 def project_list(request):
     """Display list of projects with search, filtering, sorting, and pagination."""
     projects = Project.objects.select_related('category').prefetch_related('images').all()
@@ -22,7 +25,7 @@ def project_list(request):
     selected_category = None
     category_slug = request.GET.get('category')
     if category_slug:
-        selected_category = get_object_or_404(ProjectCategory, slug=category_slug)
+        selected_category = get_by_slug_or_404(ProjectCategory, category_slug)
         projects = projects.filter(category=selected_category)
 
     # Filter by status
@@ -76,15 +79,18 @@ def project_list(request):
 
 def project_detail(request, slug):
     """Display single project detail."""
-    project = get_object_or_404(
-        Project.objects.select_related('category').prefetch_related('images'),
-        slug=slug
-    )
+    project = get_by_slug_or_404(Project, slug, Project.objects.select_related('category').prefetch_related('images'))
 
-    # Related projects
-    related = Project.objects.filter(
-        category=project.category
-    ).exclude(pk=project.pk).prefetch_related('images').order_by('-is_featured', 'order')[:3]
+    # Related projects: precomputed most similar (apps/core/similarity.py),
+    # falling back to the same category until the index has them
+    related = list(
+        Project.objects.filter(similar_to__source=project)
+        .prefetch_related('images').order_by('similar_to__rank')[:3]
+    )
+    if not related:
+        related = Project.objects.filter(
+            category=project.category
+        ).exclude(pk=project.pk).prefetch_related('images').order_by('-is_featured', 'order')[:3]
 
     context = {
         'project': project,
@@ -95,7 +101,7 @@ def project_detail(request, slug):
 
 def project_by_category(request, slug):
     """Display projects filtered by category with search, status filtering, and sorting."""
-    category = get_object_or_404(ProjectCategory, slug=slug)
+    category = get_by_slug_or_404(ProjectCategory, slug)
     projects = Project.objects.filter(category=category).select_related('category').prefetch_related('images')
 
     # Search functionality
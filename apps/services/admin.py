@@ -1,6 +1,9 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django import forms
+from apps.api.resources import bump_versions_for_model
+from apps.core.slugs import bump_slug_version
+from apps.staff_portal.overview import bump_services_overview_version
 from .models import Service, ServiceContentBlock
 
 
@@ -65,11 +68,17 @@ class ServiceAdmin(admin.ModelAdmin):
     @admin.action(description='Mark as active')
     def mark_as_active(self, request, queryset):
         updated = queryset.update(is_active=True)
+        bump_versions_for_model(self.model)
+        bump_slug_version(self.model)
+        bump_services_overview_version()
         self.message_user(request, f'{updated} service(s) marked as active.')
 
     @admin.action(description='Mark as inactive')
     def mark_as_inactive(self, request, queryset):
         updated = queryset.update(is_active=False)
+        bump_versions_for_model(self.model)
+        bump_slug_version(self.model)
+        bump_services_overview_version()
         self.message_user(request, f'{updated} service(s) marked as inactive.')
 
 
@@ -81,6 +90,7 @@ class ServiceContentBlockAdmin(admin.ModelAdmin):
     list_editable = ('order', 'is_active')
     search_fields = ('title', 'content', 'service__name')
     ordering = ('service', 'order')
+    list_select_related = ('service',)
 
     fieldsets = (
         ('Block Information', {
@@ -45,6 +45,14 @@ class Service(models.Model):
         ordering = ['order', 'name']
         verbose_name = "Service"
         verbose_name_plural = "Services"
+        indexes = [
+            # Public listing: is_active ORDER BY order, name
+            models.Index(
+                fields=['order', 'name'],
+                condition=models.Q(is_active=True),
+                name='services_active_order_idx',
+            ),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -1,3 +1,13 @@
 from django.test import TestCase
 
-# Create your tests here.
+from apps.core.testing import QueryPlanAssertionsMixin
+from .models import Service
+
+
+class ServiceListingIndexTests(QueryPlanAssertionsMixin, TestCase):
+    """Listing queries must be served by an index, not a full table scan"""
+
+    def test_active_listing_uses_index(self):
+        self.assertUsesIndex(
+            Service.objects.filter(is_active=True).order_by('order', 'name')
+        )
@@ -1,5 +1,6 @@
-from django.shortcuts import render, get_object_or_404
+from django.shortcuts import render
 from django.db.models import Q
+from apps.core.slugs import get_by_slug_or_404
 from .models import Service, ServiceContentBlock
 
 
@@ -28,7 +29,7 @@ def service_list(request):
 
 def service_detail(request, slug):
     """Display detailed service page with content blocks."""
-    service = get_object_or_404(Service, slug=slug, is_active=True)
+    service = get_by_slug_or_404(Service, slug)
 
     # Get all active content blocks for this service
     content_blocks = service.content_blocks.filter(is_active=True).order_by('order')
@@ -1,5 +1,7 @@
 from django.contrib import admin
+from django.db.models import Count
 from django.utils.html import format_html
+from apps.api.resources import bump_versions_for_model
 from .models import Department, StaffMember
 
 
@@ -19,10 +21,15 @@ class DepartmentAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        # One COUNT per changelist instead of one query per row
+        return super().get_queryset(request).annotate(num_staff=Count('staff_members'))
+
     def staff_count(self, obj):
         """Count of staff members in this department"""
-        return obj.staff_members.count()
+        return obj.num_staff
     staff_count.short_description = 'Staff Members'
+    staff_count.admin_order_field = 'num_staff'
 
 
 @admin.register(StaffMember)
@@ -42,6 +49,7 @@ class StaffMemberAdmin(admin.ModelAdmin):
     list_editable = ('is_active',)
     search_fields = ('full_name', 'position', 'bio', 'email')
     ordering = ('position_type', 'display_order', 'full_name')
+    list_select_related = ('department',)
     readonly_fields = ('created_at', 'updated_at')
 
     fieldsets = (
@@ -101,19 +109,23 @@ class StaffMemberAdmin(admin.ModelAdmin):
     @admin.action(description='Mark as active')
     def mark_as_active(self, request, queryset):
         updated = queryset.update(is_active=True)
+        bump_versions_for_model(self.model)
         self.message_user(request, f'{updated} staff member(s) marked as active.')
 
     @admin.action(description='Mark as inactive')
     def mark_as_inactive(self, request, queryset):
         updated = queryset.update(is_active=False)
+        bump_versions_for_model(self.model)
         self.message_user(request, f'{updated} staff member(s) marked as inactive.')
 
     @admin.action(description='Set as leadership')
     def set_as_leadership(self, request, queryset):
         updated = queryset.update(position_type='leadership')
+        bump_versions_for_model(self.model)
         self.message_user(request, f'{updated} staff member(s) set as leadership.')
 
     @admin.action(description='Set as management')
     def set_as_management(self, request, queryset):
         updated = queryset.update(position_type='management')
+        bump_versions_for_model(self.model)
         self.message_user(request, f'{updated} staff member(s) set as management.')
@@ -0,0 +1,21 @@
+# Generated by Django 5.0.8 on 2026-10-19 17:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('staff', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='staffmember',
+            name='staff_staff_is_acti_81fb95_idx',
+        ),
+        migrations.AddIndex(
+            model_name='staffmember',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['position_type', 'display_order', 'full_name'], name='staff_active_position_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.8 on 2026-10-19 18:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('staff', '0003_image_metadata'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='staffmember',
+            index=models.Index(fields=['is_active', 'position_type', 'display_order'], name='staff_is_active_position_idx'),
+        ),
+    ]
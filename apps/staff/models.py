@@ -66,6 +66,11 @@ class StaffMember(models.Model):
         validators=[FileExtensionValidator(['jpg', 'jpeg', 'png'])],
         help_text="Professional photo (recommended: 400x400px, square)"
     )
+    # Stored when the image changes (see apps.core.images)
+    photo_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    photo_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    photo_color = models.CharField(max_length=7, blank=True, editable=False)
+    photo_placeholder = models.TextField(blank=True, editable=False)
 
     # Contact Information
     email = models.EmailField(blank=True)
@@ -102,7 +107,17 @@ class StaffMember(models.Model):
         verbose_name_plural = "Staff Members"
         indexes = [
             models.Index(fields=['position_type']),
-            models.Index(fields=['is_active']),
+            # Public pages: is_active [AND position_type] ORDER BY display_order.
+            # The partial index serves SQLite; MySQL skips it and uses the plain one.
+            models.Index(
+                fields=['is_active', 'position_type', 'display_order'],
+                name='staff_is_active_position_idx',
+            ),
+            models.Index(
+                fields=['position_type', 'display_order', 'full_name'],
+                condition=models.Q(is_active=True),
+                name='staff_active_position_idx',
+            ),
         ]
 
     def __str__(self):
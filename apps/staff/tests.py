@@ -1,3 +1,18 @@
 from django.test import TestCase
 
-# Create your tests here.
+from apps.core.testing import QueryPlanAssertionsMixin
+from .models import StaffMember
+
+
+class StaffListingIndexTests(QueryPlanAssertionsMixin, TestCase):
+    """Listing queries must be served by an index, not a full table scan"""
+
+    def test_leadership_listing_uses_index(self):
+        self.assertUsesIndex(
+            StaffMember.objects.filter(is_active=True, position_type='leadership').order_by('display_order')
+        )
+
+    def test_active_listing_uses_index(self):
+        self.assertUsesIndex(
+            StaffMember.objects.filter(is_active=True).order_by('position_type', 'display_order', 'full_name')
+        )
@@ -5,3 +5,6 @@ class StaffPortalConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.staff_portal'
     verbose_name = 'Staff Portal'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -1,12 +1,6 @@
 """Context processors for AMMA CMS Portal"""
 
-from .permissions import (
-    user_can_manage_news,
-    user_can_manage_services,
-    user_can_manage_projects,
-    user_can_manage_documents,
-    user_can_manage_staff
-)
+from .permissions import PortalPermissions, get_portal_capabilities
 
 
 def portal_permissions(request):
@@ -14,19 +8,12 @@ def portal_permissions(request):
     Add portal permissions to template context.
     Makes permission checks available in all templates.
     """
-    if not request.user.is_authenticated:
-        return {
-            'can_manage_news': False,
-            'can_manage_services': False,
-            'can_manage_projects': False,
-            'can_manage_documents': False,
-            'can_manage_staff': False,
-        }
+    capabilities = get_portal_capabilities(request.user)
 
     return {
-        'can_manage_news': user_can_manage_news(request.user),
-        'can_manage_services': user_can_manage_services(request.user),
-        'can_manage_projects': user_can_manage_projects(request.user),
-        'can_manage_documents': user_can_manage_documents(request.user),
-        'can_manage_staff': user_can_manage_staff(request.user),
+        'can_manage_news': PortalPermissions.CAN_MANAGE_NEWS in capabilities,
+        'can_manage_services': PortalPermissions.CAN_MANAGE_SERVICES in capabilities,
+        'can_manage_projects': PortalPermissions.CAN_MANAGE_PROJECTS in capabilities,
+        'can_manage_documents': PortalPermissions.CAN_MANAGE_DOCUMENTS in capabilities,
+        'can_manage_staff': PortalPermissions.CAN_MANAGE_STAFF in capabilities,
     }
@@ -0,0 +1,93 @@
+"""Pagination, sorting and JSON helpers for portal management lists"""
+
+from django.core.paginator import Paginator
+from django.http import JsonResponse
+
+
+PORTAL_PAGE_SIZE = 25
+PORTAL_MAX_PAGE_SIZE = 100
+
+
+def wants_json(request):
+    """Check if the client asked for the JSON variant of a list"""
+    return (
+        request.GET.get('format') == 'json'
+        or 'application/json' in request.headers.get('Accept', '')
+    )
+
+
+def get_sort(request, sort_options, default):
+    """
+    Return the validated sort key and its ORDER BY fields.
+
+    The primary key is appended in the direction of the last field, so rows
+    that tie on every sort field keep one position and pages never repeat or
+    skip them.
+
+    Args:
+        sort_options: Mapping of sort key -> tuple of order_by() fields
+        default: Sort key used when the requested one is missing or unknown
+    """
+    sort_by = request.GET.get('sort', default)
+    if sort_by not in sort_options:
+        sort_by = default
+    ordering = sort_options[sort_by]
+    last = ordering[-1]
+    descending = last.startswith('-') if isinstance(last, str) else getattr(last, 'descending', False)
+    return sort_by, (*ordering, '-pk' if descending else 'pk')
+
+
+def sort_links(request, sort_labels, sort_by):
+    """
+    Return the sort controls of a list, each keeping its search and filters.
+
+    Args:
+        sort_labels: Mapping of sort key -> label, in display order
+    """
+    params = request.GET.copy()
+    params.pop('page', None)
+    params.pop('format', None)
+    links = []
+    for key, label in sort_labels.items():
+        params['sort'] = key
+        links.append({'label': label, 'url': f'?{params.urlencode()}', 'active': key == sort_by})
+    return links
+
+
+def paginate(request, queryset):
+    """Paginate a queryset using the page and per_page query parameters"""
+    try:
+        per_page = int(request.GET.get('per_page', PORTAL_PAGE_SIZE))
+    except ValueError:
+        per_page = PORTAL_PAGE_SIZE
+    per_page = max(1, min(per_page, PORTAL_MAX_PAGE_SIZE))
+
+    paginator = Paginator(queryset, per_page)
+    return paginator.get_page(request.GET.get('page'))
+
+
+def json_page(page_obj, serialize, sort_by):
+    """Build the JSON response for one page of a portal list"""
+    return JsonResponse({
+        'success': True,
+        'results': [serialize(obj) for obj in page_obj],
+        'page': page_obj.number,
+        'num_pages': page_obj.paginator.num_pages,
+        'count': page_obj.paginator.count,
+        'has_next': page_obj.has_next(),
+        'next_page': page_obj.next_page_number() if page_obj.has_next() else None,
+        'sort': sort_by,
+    })
+
+
+def file_url(field_file):
+    """Return the URL of a file field, or None if it is empty"""
+    return field_file.url if field_file else None
+
+
+def query_without_page(request):
+    """Return the current query string minus the page number, for pagination links"""
+    params = request.GET.copy()
+    params.pop('page', None)
+    params.pop('format', None)
+    return params.urlencode()
@@ -0,0 +1,75 @@
+"""
+Content block statistics for the portal services list and dashboard.
+
+Both read the same per-service aggregates (block counts, active/inactive
+split, last block edit) computed in one grouped query. The dashboard panel is
+cached under a version bumped whenever a service or content block changes
+(see signals.py), so it never shows stale numbers. Bulk queryset.update() sends
+no signals, so code changing services that way calls
+bump_services_overview_version() itself.
+"""
+
+from django.core.cache import cache
+from django.db.models import Count, Max, Q
+
+from apps.services.models import Service
+
+SERVICES_OVERVIEW_VERSION_KEY = 'portal_services_overview_version'
+SERVICES_OVERVIEW_CACHE_TIMEOUT = 60 * 60  # 1 hour
+RECENTLY_EDITED_LIMIT = 5
+
+
+def with_block_stats(queryset):
+    """Annotate services with block_count, active_block_count, inactive_block_count and last_block_edit"""
+    return queryset.annotate(
+        block_count=Count('content_blocks'),
+        active_block_count=Count('content_blocks', filter=Q(content_blocks__is_active=True)),
+        inactive_block_count=Count('content_blocks', filter=Q(content_blocks__is_active=False)),
+        last_block_edit=Max('content_blocks__updated_at'),
+    )
+
+
+def get_services_overview_version():
+    return cache.get_or_set(SERVICES_OVERVIEW_VERSION_KEY, 1, None)
+
+
+def bump_services_overview_version():
+    """Invalidate the cached dashboard services panel"""
+    try:
+        cache.incr(SERVICES_OVERVIEW_VERSION_KEY)
+    except ValueError:
+        cache.set(SERVICES_OVERVIEW_VERSION_KEY, 2, None)
+
+
+def build_services_overview():
+    """Totals and the most recently edited services, from one grouped query"""
+    rows = list(
+        with_block_stats(Service.objects.all())
+        .values(
+            'pk', 'name', 'is_active', 'updated_at',
+            'block_count', 'active_block_count', 'inactive_block_count', 'last_block_edit',
+        )
+    )
+    for row in rows:
+        row['last_edited'] = max(filter(None, (row['updated_at'], row['last_block_edit'])))
+
+    recently_edited = sorted(rows, key=lambda row: row['last_edited'], reverse=True)
+    return {
+        'services': len(rows),
+        'active_services': sum(1 for row in rows if row['is_active']),
+        'blocks': sum(row['block_count'] for row in rows),
+        'active_blocks': sum(row['active_block_count'] for row in rows),
+        'inactive_blocks': sum(row['inactive_block_count'] for row in rows),
+        'without_blocks': sum(1 for row in rows if not row['block_count']),
+        'recently_edited': recently_edited[:RECENTLY_EDITED_LIMIT],
+    }
+
+
+def get_services_overview():
+    """Return the dashboard services panel data, computing it at most once per change"""
+    cache_key = f'portal_services_overview:{get_services_overview_version()}'
+    overview = cache.get(cache_key)
+    if overview is None:
+        overview = build_services_overview()
+        cache.set(cache_key, overview, SERVICES_OVERVIEW_CACHE_TIMEOUT)
+    return overview
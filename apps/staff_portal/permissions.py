@@ -1,7 +1,20 @@
 """Custom permissions for AMMA CMS Portal"""
 
+import time
+
 from django.contrib.auth.models import Permission
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import caches
+
+# Portal capability sets are cached per user together with the global
+# permissions version they were computed under, and both are read with one
+# get_many(). Bumping the version (see signals.py) invalidates every user's set.
+# Both live in the shared cache: with a per-process cache, the workers that did
+# not handle the change would keep granting a revoked permission. The default
+# shared cache is a database table, so a bump made inside a transaction becomes
+# visible together with the permission change itself.
+PERMISSIONS_VERSION_KEY = 'portal_permissions_version'
+PERMISSIONS_CACHE_TIMEOUT = 60 * 5  # 5 minutes
 
 
 class PortalPermissions:
@@ -52,26 +65,93 @@ class PortalPermissions:
         return created_permissions
 
 
+def get_permissions_version():
+    """
+    Return the current portal permissions version.
+
+    Versions start from the clock, so a version lost from the cache cannot
+    bring back capability sets cached under an older one.
+    """
+    return caches['shared'].get_or_set(PERMISSIONS_VERSION_KEY, time.time_ns() // 1000, None)
+
+
+def bump_permissions_version():
+    """Invalidate every cached portal capability set"""
+    try:
+        caches['shared'].incr(PERMISSIONS_VERSION_KEY)
+    except ValueError:
+        caches['shared'].set(PERMISSIONS_VERSION_KEY, time.time_ns() // 1000, None)
+
+
+def _capabilities_cache_key(user_id):
+    return f'portal_capabilities:{user_id}'
+
+
+def clear_user_capabilities(user):
+    """Drop the cached capability set of a single user"""
+    caches['shared'].delete(_capabilities_cache_key(user.pk))
+    user.__dict__.pop('_portal_capabilities', None)
+
+
+def get_portal_capabilities(user):
+    """
+    Return the set of portal permission codenames the user holds.
+
+    Computed once per user and permissions version, cached in the shared
+    cache and memoised on the user object for the rest of the request. A
+    cache hit costs one read, cheaper than loading the permissions.
+    """
+    if not user.is_authenticated:
+        return frozenset()
+
+    capabilities = user.__dict__.get('_portal_capabilities')
+    if capabilities is not None:
+        return capabilities
+
+    key = _capabilities_cache_key(user.pk)
+    cached = caches['shared'].get_many([PERMISSIONS_VERSION_KEY, key])
+    version = cached.get(PERMISSIONS_VERSION_KEY)
+    if version is not None and key in cached and cached[key][0] == version:
+        capabilities = cached[key][1]
+    else:
+        if version is None:
+            version = get_permissions_version()
+        codenames = [codename for codename, _ in PortalPermissions.PERMISSIONS]
+        if user.is_superuser:
+            capabilities = frozenset(codenames)
+        else:
+            # One load of user and group permissions for all portal checks
+            all_permissions = user.get_all_permissions()
+            capabilities = frozenset(
+                codename for codename in codenames
+                if f'auth.{codename}' in all_permissions
+            )
+        caches['shared'].set(key, (version, capabilities), PERMISSIONS_CACHE_TIMEOUT)
+
+    user.__dict__['_portal_capabilities'] = capabilities
+    return capabilities
+
+
 def user_can_manage_news(user):
     """Check if user has permission to manage news"""
-    return user.is_superuser or user.has_perm(f'auth.{PortalPermissions.CAN_MANAGE_NEWS}')
+    return PortalPermissions.CAN_MANAGE_NEWS in get_portal_capabilities(user)
 
 
 def user_can_manage_services(user):
     """Check if user has permission to manage services"""
-    return user.is_superuser or user.has_perm(f'auth.{PortalPermissions.CAN_MANAGE_SERVICES}')
+    return PortalPermissions.CAN_MANAGE_SERVICES in get_portal_capabilities(user)
 
 
 def user_can_manage_projects(user):
     """Check if user has permission to manage projects"""
-    return user.is_superuser or user.has_perm(f'auth.{PortalPermissions.CAN_MANAGE_PROJECTS}')
+    return PortalPermissions.CAN_MANAGE_PROJECTS in get_portal_capabilities(user)
 
 
 def user_can_manage_documents(user):
     """Check if user has permission to manage documents"""
-    return user.is_superuser or user.has_perm(f'auth.{PortalPermissions.CAN_MANAGE_DOCUMENTS}')
+    return PortalPermissions.CAN_MANAGE_DOCUMENTS in get_portal_capabilities(user)
 
 
 def user_can_manage_staff(user):
     """Check if user has permission to manage staff members"""
-    return user.is_superuser or user.has_perm(f'auth.{PortalPermissions.CAN_MANAGE_STAFF}')
+    return PortalPermissions.CAN_MANAGE_STAFF in get_portal_capabilities(user)
@@ -0,0 +1,46 @@
+"""Signal handlers that keep cached portal permissions and statistics coherent"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from apps.services.models import Service, ServiceContentBlock
+from .overview import bump_services_overview_version
+from .permissions import bump_permissions_version, clear_user_capabilities
+
+User = get_user_model()
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+@receiver(m2m_changed, sender=Group.permissions.through)
+def permissions_relation_changed(sender, action, **kwargs):
+    """Invalidate cached capabilities when group or permission membership changes"""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_permissions_version()
+
+
+@receiver(post_delete, sender=Group)
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+def group_or_permission_changed(sender, **kwargs):
+    """Invalidate cached capabilities when a group or permission is removed or changed"""
+    bump_permissions_version()
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, update_fields=None, **kwargs):
+    """Drop a user's cached capabilities when their account changes (e.g. is_superuser)"""
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    clear_user_capabilities(instance)
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_delete, sender=Service)
+@receiver(post_save, sender=ServiceContentBlock)
+@receiver(post_delete, sender=ServiceContentBlock)
+def service_content_changed(sender, **kwargs):
+    """Invalidate the cached dashboard services panel"""
+    bump_services_overview_version()
@@ -1,3 +1,328 @@
-from django.test import TestCase
+import json
 
-# Create your tests here.
+from django.contrib.auth.models import Group, Permission, User
+from django.core.cache import cache, caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.ordering import bulk_reorder, get_ordering_version
+from apps.news.models import NewsArticle, NewsCategory
+from apps.services.models import Service, ServiceContentBlock
+from apps.staff_portal.permissions import get_permissions_version, get_portal_capabilities
+from apps.staff_portal.views import PREVIEW_BLOCK_CACHE_PREFIX
+
+
+@override_settings(RATELIMIT_RATES={'login': '3/5m', 'portal-create': '2/m'})
+class PortalRateLimitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_login_attempts_are_limited(self):
+        for _ in range(3):
+            response = self.client.post('/login/', {'username': 'editor', 'password': 'wrong'})
+            self.assertEqual(response.status_code, 200)
+
+        response = self.client.post('/login/', {'username': 'editor', 'password': 'wrong'})
+        self.assertEqual(response.status_code, 429)
+
+    def test_failures_from_elsewhere_do_not_lock_the_account(self):
+        User.objects.create_user('editor', 'editor@example.com', 'secret-pass', is_staff=True)
+        for number in range(5):
+            self.client.post('/login/', {'username': 'editor', 'password': 'wrong'}, REMOTE_ADDR=f'203.0.113.{number}')
+
+        response = self.client.post('/login/', {'username': 'editor', 'password': 'secret-pass'})
+        self.assertEqual(response.status_code, 302)
+
+    def test_create_api_is_limited(self):
+        admin = User.objects.create_superuser('admin', 'admin@example.com', 'secret-pass')
+        self.client.force_login(admin)
+
+        for name in ('Events', 'Notices'):
+            response = self.client.post('/portal/api/news/categories/create/', {'name': name})
+            self.assertEqual(response.status_code, 200)
+
+        response = self.client.post('/portal/api/news/categories/create/', {'name': 'Alerts'})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.json()['success'], False)
+
+
+class ServiceBlockStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'secret-pass'))
+        self.permits = Service.objects.create(name='Building Permits', description='Permits', order=1)
+        Service.objects.create(name='Waste Collection', description='Waste', order=2)
+        ServiceContentBlock.objects.create(service=self.permits, title='Requirements')
+        ServiceContentBlock.objects.create(service=self.permits, title='Fees', is_active=False)
+
+    def test_list_annotates_block_stats(self):
+        response = self.client.get('/portal/services/?format=json')
+        results = response.json()['results']
+
+        self.assertEqual([service['name'] for service in results], ['Building Permits', 'Waste Collection'])
+        self.assertEqual(
+            [(service['block_count'], service['active_block_count'], service['inactive_block_count'])
+             for service in results],
+            [(2, 1, 1), (0, 0, 0)],
+        )
+        self.assertIsNone(results[1]['last_block_edit'])
+
+    def test_list_queries_do_not_grow_with_services(self):
+        self.client.get('/portal/services/')
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/portal/services/')
+        for number in range(5):
+            service = Service.objects.create(name=f'Service {number}', description='Service')
+            ServiceContentBlock.objects.create(service=service, title='Contact')
+
+        with self.assertNumQueries(len(queries)):
+            response = self.client.get('/portal/services/')
+        self.assertContains(response, '1 active, 1 hidden')
+
+    def test_dashboard_panel_is_cached_until_content_changes(self):
+        self.client.get('/portal/')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/portal/')
+        self.assertFalse(any('services_servicecontentblock' in query['sql'] for query in queries))
+        self.assertEqual(response.context['services_overview']['blocks'], 2)
+
+        ServiceContentBlock.objects.create(service=self.permits, title='Contact')
+        overview = self.client.get('/portal/').context['services_overview']
+        self.assertEqual((overview['blocks'], overview['active_blocks'], overview['without_blocks']), (3, 2, 1))
+        self.assertEqual(overview['recently_edited'][0]['name'], 'Building Permits')
+
+    def test_admin_bulk_actions_refresh_the_dashboard_panel(self):
+        self.assertEqual(self.client.get('/portal/').context['services_overview']['active_services'], 2)
+
+        self.client.post('/admin/services/service/', {
+            'action': 'mark_as_inactive', '_selected_action': [self.permits.pk],
+        })
+        self.assertEqual(self.client.get('/portal/').context['services_overview']['active_services'], 1)
+
+        self.client.post('/admin/services/service/', {
+            'action': 'mark_as_active', '_selected_action': [self.permits.pk],
+        })
+        self.assertEqual(self.client.get('/portal/').context['services_overview']['active_services'], 2)
+
+
+class ReorderTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'secret-pass'))
+        self.service = Service.objects.create(name='Building Permits', description='Permits')
+        self.blocks = [
+            ServiceContentBlock.objects.create(service=self.service, title=title, order=order)
+            for order, title in enumerate(['Requirements', 'Fees', 'Contact'])
+        ]
+        self.url = f'/portal/api/services/{self.service.pk}/blocks/reorder/'
+
+    def reorder(self, order, version=''):
+        positions = [{'id': block.pk, 'order': position} for position, block in enumerate(order)]
+        return self.client.post(self.url, {'positions': json.dumps(positions), 'version': version})
+
+    def titles(self):
+        return list(self.service.content_blocks.order_by('order').values_list('title', flat=True))
+
+    def test_bulk_reorder_applies_positions_in_one_update(self):
+        queryset = self.service.content_blocks.all()
+        fees, contact = self.blocks[1:]
+        with self.assertNumQueries(4):  # savepoint, locked read, UPDATE, release
+            version = bulk_reorder(queryset, {contact.pk: 1, fees.pk: 2})
+        self.assertEqual(self.titles(), ['Requirements', 'Contact', 'Fees'])
+        self.assertEqual(version, get_ordering_version(queryset.filter(pk__in=[fees.pk, contact.pk])))
+
+    def test_editor_page_version_is_accepted_then_stale(self):
+        version = self.client.get(f'/portal/services/{self.service.pk}/edit/').context['blocks_version']
+
+        response = self.reorder(self.blocks[::-1], version)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.titles(), ['Contact', 'Fees', 'Requirements'])
+
+        response = self.reorder(self.blocks, version)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['version'], get_ordering_version(self.service.content_blocks.all()))
+        self.assertEqual(self.titles(), ['Contact', 'Fees', 'Requirements'])
+
+    def test_bad_payloads_are_rejected(self):
+        other = ServiceContentBlock.objects.create(
+            service=Service.objects.create(name='Waste', description='Waste'), title='Other',
+        )
+        payloads = [
+            'not json',
+            json.dumps([{'id': self.blocks[0].pk}]),
+            json.dumps([{'id': self.blocks[0].pk, 'order': 0}, {'id': self.blocks[1].pk, 'order': 0}]),
+            json.dumps([{'id': other.pk, 'order': 0}]),
+        ]
+        for payload in payloads:
+            with self.subTest(payload=payload):
+                response = self.client.post(self.url, {'positions': payload})
+                self.assertEqual(response.status_code, 400)
+                self.assertFalse(response.json()['success'])
+        self.assertEqual(self.titles(), ['Requirements', 'Fees', 'Contact'])
+
+
+class ServicePreviewTests(TestCase):
+    url = '/portal/api/services/preview/'
+
+    def setUp(self):
+        caches['shared'].clear()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'secret-pass'))
+        self.blocks = [
+            {'block_type': 'text', 'title': 'Requirements', 'content': '<p>Bring your ID</p>', 'data': {}},
+            {'block_type': 'text', 'title': 'Fees', 'content': '<p>Free of charge</p>', 'data': {}},
+        ]
+
+    def preview(self, blocks):
+        response = self.client.post(self.url, {
+            'service_data': json.dumps({'name': 'Building Permits'}),
+            'blocks_data': json.dumps(blocks),
+        })
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_unchanged_blocks_are_sent_as_keys(self):
+        first = self.preview(self.blocks)
+        self.assertTrue(first['success'])
+        self.assertEqual(len(first['block_keys']), 2)
+        self.assertIn('Bring your ID', first['html'])
+
+        # The fragments are in the shared cache, where any worker finds them
+        for key in first['block_keys']:
+            self.assertIsNotNone(caches['shared'].get(f'{PREVIEW_BLOCK_CACHE_PREFIX}:{key}'))
+
+        changed = {**self.blocks[1], 'content': '<p>Ten dollars</p>'}
+        second = self.preview([{'key': first['block_keys'][0]}, changed])
+        self.assertTrue(second['success'])
+        self.assertEqual(second['block_keys'][0], first['block_keys'][0])
+        self.assertNotEqual(second['block_keys'][1], first['block_keys'][1])
+        self.assertIn('Bring your ID', second['html'])
+        self.assertIn('Ten dollars', second['html'])
+
+    def test_shared_cache_queries_grow_only_with_changed_blocks(self):
+        def queries_for(blocks):
+            keys = self.preview(blocks)['block_keys']
+            with CaptureQueriesContext(connection) as unchanged:
+                self.assertTrue(self.preview([{'key': key} for key in keys])['success'])
+            edited = [{'key': key} for key in keys[1:]]
+            with CaptureQueriesContext(connection) as one_changed:
+                self.assertTrue(self.preview([{**blocks[0], 'content': '<p>Edited</p>'}, *edited])['success'])
+            return len(unchanged), len(one_changed)
+
+        more_blocks = [{**self.blocks[0], 'title': f'Step {number}'} for number in range(6)]
+        self.assertEqual(queries_for(self.blocks), queries_for(more_blocks))
+
+    def test_expired_keys_are_reported_missing(self):
+        keys = self.preview(self.blocks)['block_keys']
+        caches['shared'].delete(f'{PREVIEW_BLOCK_CACHE_PREFIX}:{keys[1]}')
+
+        response = self.preview([{'key': keys[0]}, {'key': keys[1]}, {'key': 'unknown'}])
+        self.assertEqual(response, {'success': False, 'missing': [1, 2]})
+
+        # Resending the full payload recovers
+        self.assertEqual(self.preview(self.blocks)['block_keys'], keys)
+
+
+class PortalListTests(TestCase):
+    url = '/portal/news/'
+
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'secret-pass'))
+        category = NewsCategory.objects.create(name='Announcements')
+        NewsArticle.objects.bulk_create(
+            NewsArticle(category=category, title=f'Article {number:02}', slug=f'article-{number}',
+                        content='Text', views=number)
+            for number in range(30)
+        )
+
+    def test_pages_keep_the_filters_and_sort(self):
+        response = self.client.get(self.url, {'q': 'Article', 'sort': 'title', 'page': 2})
+        page = response.context['page_obj']
+        self.assertEqual((page.number, page.paginator.num_pages, len(page)), (2, 2, 5))
+        self.assertEqual(page[0].title, 'Article 25')
+        self.assertEqual(response.context['query_string'], 'q=Article&sort=title')
+        self.assertContains(response, '<input type="hidden" name="sort" value="title">', html=True)
+
+        links = {link['label']: link for link in response.context['sort_links']}
+        self.assertTrue(links['Title']['active'])
+        self.assertEqual(links['Most viewed']['url'], '?q=Article&sort=-views')
+
+    def test_ties_keep_one_position_across_pages(self):
+        NewsArticle.objects.update(views=0)
+        ids, page = [], 1
+        while page:
+            data = self.client.get(self.url, {'sort': '-views', 'per_page': 7, 'page': page, 'format': 'json'}).json()
+            ids += [article['id'] for article in data['results']]
+            page = data['next_page']
+
+        self.assertEqual(ids, sorted(NewsArticle.objects.values_list('pk', flat=True), reverse=True))
+
+    def test_json_variant(self):
+        response = self.client.get(self.url, {'format': 'json', 'sort': '-views', 'per_page': 10})
+        data = response.json()
+        self.assertTrue(data['success'])
+        self.assertEqual((data['count'], data['num_pages'], data['next_page'], data['sort']), (30, 3, 2, '-views'))
+        self.assertEqual([article['views'] for article in data['results'][:3]], [29, 28, 27])
+
+        response = self.client.get(self.url, {'sort': 'title'}, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.json()['results'][0]['title'], 'Article 00')
+
+    def test_unknown_sort_and_page_size_fall_back(self):
+        for sort in ('password', '-author__user__password', ''):
+            with self.subTest(sort=sort):
+                data = self.client.get(self.url, {'format': 'json', 'sort': sort, 'per_page': 'many'}).json()
+                self.assertEqual(data['sort'], '-created_at')
+                self.assertEqual(len(data['results']), 25)
+        data = self.client.get(self.url, {'format': 'json', 'per_page': 1000, 'page': 'last'}).json()
+        self.assertEqual((len(data['results']), data['page']), (30, 1))
+
+
+class PortalPermissionCacheTests(TestCase):
+    def setUp(self):
+        self.news = Permission.objects.get(codename='can_manage_news')
+        self.services = Permission.objects.get(codename='can_manage_services')
+        self.editors = Group.objects.create(name='Editors')
+        self.editors.permissions.add(self.news)
+        self.user = User.objects.create_user('editor', 'editor@example.com', 'secret-pass', is_staff=True)
+        self.user.groups.add(self.editors)
+
+    def capabilities(self):
+        # A fresh user object, as another worker handling the next request would load
+        return get_portal_capabilities(User.objects.get(pk=self.user.pk))
+
+    def assertInvalidates(self, change, expected):
+        version = get_permissions_version()
+        change()
+        self.assertNotEqual(get_permissions_version(), version)
+        self.assertEqual(self.capabilities(), frozenset(expected))
+
+    def test_capabilities_are_cached_in_the_shared_cache(self):
+        with CaptureQueriesContext(connection) as uncached:
+            User.objects.get(pk=self.user.pk).get_all_permissions()
+        self.assertEqual(self.capabilities(), {'can_manage_news'})
+
+        with CaptureQueriesContext(connection) as cached:
+            self.assertEqual(self.capabilities(), {'can_manage_news'})
+        # The user, then the version and the set in one read of the cache table
+        self.assertEqual(len(cached), 2)
+        self.assertLess(len(cached), len(uncached))
+
+    def test_permission_changes_invalidate_cached_sets(self):
+        self.assertEqual(self.capabilities(), {'can_manage_news'})
+        self.assertInvalidates(lambda: self.editors.permissions.add(self.services), {'can_manage_news', 'can_manage_services'})
+        self.assertInvalidates(lambda: self.editors.permissions.remove(self.news), {'can_manage_services'})
+        self.assertInvalidates(lambda: self.user.user_permissions.add(self.news), {'can_manage_news', 'can_manage_services'})
+        self.assertInvalidates(lambda: self.user.user_permissions.clear(), {'can_manage_services'})
+        self.assertInvalidates(lambda: self.user.groups.remove(self.editors), set())
+        self.assertInvalidates(lambda: self.user.groups.add(self.editors), {'can_manage_services'})
+        self.assertInvalidates(self.editors.delete, set())
+
+    def test_account_changes_drop_the_users_set(self):
+        self.assertEqual(self.capabilities(), {'can_manage_news'})
+        self.user.is_superuser = True
+        self.user.save()
+        self.assertEqual(len(self.capabilities()), 5)
+
+        self.user.is_superuser = False
+        self.user.save(update_fields=['is_superuser'])
+        self.assertEqual(self.capabilities(), {'can_manage_news'})
@@ -8,6 +8,11 @@ from django.http import JsonResponse
 from django.template.loader import render_to_string
 from django.views.decorators.http import require_POST, require_http_methods
 from django.db import transaction
+from django.db.models import F, Prefetch, Q
+from django.core.cache import caches
+from django.utils.decorators import method_decorator
+from django.utils.safestring import mark_safe
+import hashlib
 import json
 
 from apps.services.models import Service, ServiceContentBlock
@@ -15,6 +20,11 @@ from apps.news.models import NewsArticle, NewsCategory
 from apps.projects.models import Project, ProjectCategory, ProjectImage
 from apps.documents.models import Document, DocumentCategory
 from apps.staff.models import StaffMember, Department
+from apps.gallery.models import GalleryImage
+from apps.core.models import HeroSlide
+from apps.api.resources import bump_versions_for_model
+from apps.core.ordering import bulk_reorder, get_ordering_version, StaleOrderingError
+from apps.core.ratelimit import ratelimit
 from .decorators import (
     staff_required,
     portal_user_required,
@@ -25,16 +35,21 @@ from .decorators import (
     staff_members_permission_required
 )
 from .permissions import (
-    user_can_manage_news,
+    PortalPermissions,
+    get_portal_capabilities,
     user_can_manage_services,
     user_can_manage_projects,
-    user_can_manage_documents,
     user_can_manage_staff
 )
 from .block_templates import get_all_templates, get_template
+from .listing import file_url, get_sort, json_page, paginate, query_without_page, sort_links, wants_json
+from .overview import get_services_overview, with_block_stats
 from .forms import NewsArticleForm, ProjectForm, ProjectImageFormSet, DocumentForm, StaffMemberForm
 
 
+# Per IP only: counting failures per username would let anyone lock a named
+# account out from anywhere
+@method_decorator(ratelimit('login', keys=('ip',)), name='dispatch')
 class CustomLoginView(LoginView):
     """Custom login view for staff portal"""
     template_name = 'staff_portal/login.html'
@@ -66,16 +81,19 @@ class CustomLoginView(LoginView):
 @portal_user_required
 def dashboard(request):
     """AMMA CMS Portal dashboard"""
-    # Check user permissions
-    can_manage_news = user_can_manage_news(request.user)
-    can_manage_services = user_can_manage_services(request.user)
-    can_manage_projects = user_can_manage_projects(request.user)
-    can_manage_documents = user_can_manage_documents(request.user)
-    can_manage_staff = user_can_manage_staff(request.user)
+    # Check user permissions (one cached capability set shared with the
+    # decorators and the context processor)
+    capabilities = get_portal_capabilities(request.user)
+    can_manage_news = PortalPermissions.CAN_MANAGE_NEWS in capabilities
+    can_manage_services = PortalPermissions.CAN_MANAGE_SERVICES in capabilities
+    can_manage_projects = PortalPermissions.CAN_MANAGE_PROJECTS in capabilities
+    can_manage_documents = PortalPermissions.CAN_MANAGE_DOCUMENTS in capabilities
+    can_manage_staff = PortalPermissions.CAN_MANAGE_STAFF in capabilities
 
     # Get statistics based on permissions
-    services_count = Service.objects.count() if can_manage_services else 0
-    active_services_count = Service.objects.filter(is_active=True).count() if can_manage_services else 0
+    services_overview = get_services_overview() if can_manage_services else None
+    services_count = services_overview['services'] if can_manage_services else 0
+    active_services_count = services_overview['active_services'] if can_manage_services else 0
 
     # News statistics
     news_count = NewsArticle.objects.count() if can_manage_news else 0
@@ -100,6 +118,7 @@ def dashboard(request):
     context = {
         'services_count': services_count,
         'active_services_count': active_services_count,
+        'services_overview': services_overview,
         'news_count': news_count,
         'published_news_count': published_news_count,
         'draft_news_count': draft_news_count,
@@ -122,19 +141,56 @@ def dashboard(request):
     return render(request, 'staff_portal/dashboard.html', context)
 
 
+SERVICE_SORT_OPTIONS = {
+    'order': ('order', 'name'),
+    'name': ('name',),
+    '-last_block_edit': (F('last_block_edit').desc(nulls_last=True), 'order', 'name'),
+    '-block_count': ('-block_count', 'order', 'name'),
+}
+
+SERVICE_SORT_LABELS = {
+    'order': 'Display order',
+    'name': 'Name',
+    '-last_block_edit': 'Recently edited',
+    '-block_count': 'Most blocks',
+}
+
+
 @services_permission_required
 def service_list(request):
-    """List all services for management"""
-    services = Service.objects.all().order_by('order', 'name')
+    """List services for management (paginated, with a JSON variant)"""
+    # Block counts and the last block edit come from one grouped query
+    services = with_block_stats(Service.objects.all())
 
     # Search functionality
     search_query = request.GET.get('q', '').strip()
     if search_query:
         services = services.filter(name__icontains=search_query)
 
+    sort_by, ordering = get_sort(request, SERVICE_SORT_OPTIONS, 'order')
+    page_obj = paginate(request, services.order_by(*ordering))
+
+    if wants_json(request):
+        return json_page(page_obj, lambda service: {
+            'id': service.pk,
+            'name': service.name,
+            'slug': service.slug,
+            'is_active': service.is_active,
+            'has_detail_page': service.has_detail_page,
+            'order': service.order,
+            'block_count': service.block_count,
+            'active_block_count': service.active_block_count,
+            'inactive_block_count': service.inactive_block_count,
+            'last_block_edit': service.last_block_edit,
+        }, sort_by)
+
     context = {
-        'services': services,
+        'services': page_obj,
+        'page_obj': page_obj,
         'search_query': search_query,
+        'sort_by': sort_by,
+        'sort_links': sort_links(request, SERVICE_SORT_LABELS, sort_by),
+        'query_string': query_without_page(request),
     }
     return render(request, 'staff_portal/services/list.html', context)
 
@@ -173,6 +229,7 @@ def service_edit(request, pk):
 
     # Serialize blocks to JSON for JavaScript
     content_blocks_json = [{
+        'pk': block.pk,
         'block_type': block.block_type,
         'title': block.title,
         'content': block.content,
@@ -184,6 +241,8 @@ def service_edit(request, pk):
         'service': service,
         'content_blocks': content_blocks,
         'content_blocks_json': content_blocks_json,
+        # Sent back by the drag-and-drop reorder so concurrent edits are detected
+        'blocks_version': get_ordering_version(content_blocks),
         'templates': templates,
         'is_create': False,
     }
@@ -260,10 +319,48 @@ def service_delete(request, pk):
     return redirect('staff_portal:service_list')
 
 
+# Rendered preview HTML is memoised per block, keyed by a hash of the block's JSON.
+# The editor sends back only the keys of unchanged blocks, and the next request
+# may land on another worker, so the fragments live in the shared cache.
+PREVIEW_BLOCK_CACHE_PREFIX = 'service_preview_block'
+PREVIEW_BLOCK_CACHE_TIMEOUT = 60 * 60  # 1 hour
+
+
+def _preview_block_key(block_data):
+    """Return a stable hash of the fields that affect a block's preview"""
+    payload = json.dumps({
+        'block_type': block_data.get('block_type', 'text'),
+        'title': block_data.get('title', ''),
+        'content': block_data.get('content', ''),
+        'data': block_data.get('data', {}),
+    }, sort_keys=True)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def _render_preview_block(block_data):
+    """Render a single block's preview"""
+    # Create temporary block object (not saved to DB)
+    block = ServiceContentBlock(
+        block_type=block_data.get('block_type', 'text'),
+        title=block_data.get('title', ''),
+        content=block_data.get('content', ''),
+        data=block_data.get('data', {}),
+    )
+    return render_to_string('staff_portal/services/preview_block.html', {'block': block})
+
+
 @services_permission_required
 @require_POST
 def service_preview_api(request):
-    """API endpoint for live preview"""
+    """
+    API endpoint for live preview.
+
+    Each entry in blocks_data is either a full block ({block_type, title,
+    content, data}) or just {"key": ...} for a block that is unchanged since
+    the previous preview. Keys are returned in block_keys. If a cached block
+    has expired, the response lists its index in "missing" and the client
+    resends the full payload.
+    """
     try:
         # Get service data from POST
         service_data = json.loads(request.POST.get('service_data', '{}'))
@@ -276,24 +373,38 @@ def service_preview_api(request):
             icon=service_data.get('icon', 'file-text')
         )
 
-        # Create temporary block objects
-        temp_blocks = []
-        for block_data in blocks_data:
-            temp_blocks.append(ServiceContentBlock(
-                block_type=block_data.get('block_type', 'text'),
-                title=block_data.get('title', ''),
-                content=block_data.get('content', ''),
-                data=block_data.get('data', {}),
-                order=block_data.get('order', 0)
-            ))
-
-        # Render preview HTML
+        # One shared cache read and one write per preview instead of one of each per block
+        block_keys = [
+            block_data['key'] if 'block_type' not in block_data and block_data.get('key')
+            else _preview_block_key(block_data)
+            for block_data in blocks_data
+        ]
+        cached = caches['shared'].get_many([f'{PREVIEW_BLOCK_CACHE_PREFIX}:{key}' for key in block_keys])
+        rendered = {}
+        rendered_blocks = []
+        missing = []
+        for index, (key, block_data) in enumerate(zip(block_keys, blocks_data)):
+            cache_key = f'{PREVIEW_BLOCK_CACHE_PREFIX}:{key}'
+            html = cached.get(cache_key, rendered.get(cache_key))
+            if html is None:
+                if 'block_type' not in block_data and block_data.get('key'):
+                    missing.append(index)
+                    continue
+                html = rendered[cache_key] = _render_preview_block(block_data)
+            rendered_blocks.append(mark_safe(html))
+        if rendered:
+            caches['shared'].set_many(rendered, PREVIEW_BLOCK_CACHE_TIMEOUT)
+
+        if missing:
+            return JsonResponse({'success': False, 'missing': missing})
+
+        # Stitch the per-block HTML into the preview
         html = render_to_string('staff_portal/services/preview_content.html', {
             'service': temp_service,
-            'content_blocks': temp_blocks
+            'rendered_blocks': rendered_blocks
         })
 
-        return JsonResponse({'success': True, 'html': html})
+        return JsonResponse({'success': True, 'html': html, 'block_keys': block_keys})
 
     except Exception as e:
         return JsonResponse({'success': False, 'error': str(e)})
@@ -303,20 +414,73 @@ def service_preview_api(request):
 @require_POST
 def service_blocks_reorder_api(request, pk):
     """API endpoint for reordering blocks"""
-    try:
-        service = get_object_or_404(Service, pk=pk)
-        block_orders = json.loads(request.POST.get('block_orders', '[]'))
+    service = get_object_or_404(Service, pk=pk)
+    return _reorder_response(request, service.content_blocks.all(), 'order')
 
-        # Update block orders
-        for item in block_orders:
-            block_id = item.get('id')
-            order = item.get('order')
-            ServiceContentBlock.objects.filter(id=block_id, service=service).update(order=order)
 
-        return JsonResponse({'success': True})
+# Sortable lists that can be reordered through the generic reorder API.
+# Each entry: (model, ordering field, parent lookup or None, permission check)
+REORDERABLE_LISTS = {
+    'service-blocks': (ServiceContentBlock, 'order', 'service_id', user_can_manage_services),
+    'project-images': (ProjectImage, 'order', 'project_id', user_can_manage_projects),
+    'gallery-images': (GalleryImage, 'order', 'category_id', lambda user: user.is_superuser),
+    'staff-members': (StaffMember, 'display_order', None, user_can_manage_staff),
+    'hero-slides': (HeroSlide, 'order', None, lambda user: user.is_superuser),
+}
 
-    except Exception as e:
-        return JsonResponse({'success': False, 'error': str(e)})
+
+@portal_user_required
+@require_POST
+def reorder_api(request, list_key):
+    """
+    Generic API endpoint for drag-and-drop reordering.
+
+    Expects POST fields:
+        positions: JSON list of {"id": ..., "order": ...}
+        parent_id: ID of the owning object (for lists scoped to a parent)
+        version: Ordering version returned by the previous reorder (optional)
+    """
+    if list_key not in REORDERABLE_LISTS:
+        return JsonResponse({'success': False, 'error': 'Unknown list'}, status=404)
+
+    model, field, parent_lookup, permission_check = REORDERABLE_LISTS[list_key]
+    if not permission_check(request.user):
+        return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
+
+    queryset = model.objects.all()
+    if parent_lookup:
+        parent_id = request.POST.get('parent_id', '').strip()
+        if not parent_id.isdigit():
+            return JsonResponse({'success': False, 'error': 'parent_id is required'}, status=400)
+        queryset = queryset.filter(**{parent_lookup: parent_id})
+
+    return _reorder_response(request, queryset, field)
+
+
+def _reorder_response(request, queryset, field):
+    """Apply the posted ordering to a queryset and build the JSON response"""
+    try:
+        items = json.loads(request.POST.get('positions') or request.POST.get('block_orders', '[]'))
+        positions = {item['id']: item['order'] for item in items}
+        version = bulk_reorder(
+            queryset,
+            positions,
+            field=field,
+            expected_version=request.POST.get('version', '').strip() or None,
+        )
+        # The single UPDATE sends no signals
+        bump_versions_for_model(queryset.model)
+        return JsonResponse({'success': True, 'version': version})
+
+    except StaleOrderingError as e:
+        return JsonResponse({
+            'success': False,
+            'error': str(e),
+            'version': e.version,
+        }, status=409)
+
+    except (ValueError, KeyError, TypeError) as e:
+        return JsonResponse({'success': False, 'error': str(e) or 'Invalid positions'}, status=400)
 
 
 @services_permission_required
@@ -338,10 +502,31 @@ def get_template_api(request, template_key):
 # NEWS MANAGEMENT VIEWS
 # ============================================================================
 
+NEWS_SORT_OPTIONS = {
+    '-created_at': ('-created_at',),
+    'created_at': ('created_at',),
+    '-published_date': ('-published_date', '-created_at'),
+    'title': ('title',),
+    '-views': ('-views',),
+}
+
+NEWS_SORT_LABELS = {
+    '-created_at': 'Newest',
+    'created_at': 'Oldest',
+    '-published_date': 'Recently published',
+    'title': 'Title',
+    '-views': 'Most viewed',
+}
+
+
 @news_permission_required
 def news_list(request):
-    """List all news articles for management"""
-    articles = NewsArticle.objects.all().select_related('category', 'author')
+    """List news articles for management (paginated, with a JSON variant)"""
+    articles = NewsArticle.objects.select_related('category', 'author').only(
+        'title', 'slug', 'excerpt', 'featured_image', 'status', 'is_featured',
+        'published_date', 'created_at', 'views',
+        'category__name', 'category__color', 'author__full_name',
+    )
 
     # Search functionality
     search_query = request.GET.get('q', '').strip()
@@ -358,18 +543,38 @@ def news_list(request):
     if category_filter:
         articles = articles.filter(category_id=category_filter)
 
-    # Order by most recent
-    articles = articles.order_by('-created_at')
+    # Order by most recent unless another sort was requested
+    sort_by, ordering = get_sort(request, NEWS_SORT_OPTIONS, '-created_at')
+    page_obj = paginate(request, articles.order_by(*ordering))
+
+    if wants_json(request):
+        return json_page(page_obj, lambda article: {
+            'id': article.pk,
+            'title': article.title,
+            'slug': article.slug,
+            'excerpt': article.excerpt,
+            'image_url': file_url(article.featured_image),
+            'category': {'name': article.category.name, 'color': article.category.color},
+            'status': article.status,
+            'is_featured': article.is_featured,
+            'author': article.author.full_name if article.author else None,
+            'published_date': article.published_date,
+            'views': article.views,
+        }, sort_by)
 
     # Get all categories for filter dropdown
-    categories = NewsCategory.objects.all().order_by('name')
+    categories = NewsCategory.objects.only('name').order_by('name')
 
     context = {
-        'articles': articles,
+        'articles': page_obj,
+        'page_obj': page_obj,
         'categories': categories,
         'search_query': search_query,
         'status_filter': status_filter,
         'category_filter': category_filter,
+        'sort_by': sort_by,
+        'sort_links': sort_links(request, NEWS_SORT_LABELS, sort_by),
+        'query_string': query_without_page(request),
     }
     return render(request, 'staff_portal/news/list.html', context)
 
@@ -429,6 +634,7 @@ def news_delete(request, pk):
     return redirect('staff_portal:news_list')
 
 
+@ratelimit('portal-create')
 @news_permission_required
 @require_POST
 def news_category_create_api(request):
@@ -477,10 +683,32 @@ def news_category_create_api(request):
 # PROJECT MANAGEMENT VIEWS
 # ============================================================================
 
+PROJECT_SORT_OPTIONS = {
+    '-is_featured': ('-is_featured', 'order', '-start_date'),
+    '-start_date': ('-start_date',),
+    'start_date': ('start_date',),
+    'title': ('title',),
+    '-updated_at': ('-updated_at',),
+}
+
+PROJECT_SORT_LABELS = {
+    '-is_featured': 'Featured first',
+    '-start_date': 'Latest start',
+    'start_date': 'Earliest start',
+    'title': 'Title',
+    '-updated_at': 'Recently updated',
+}
+
+
 @projects_permission_required
 def project_list(request):
-    """List all projects for management"""
-    projects = Project.objects.all().select_related('category')
+    """List projects for management (paginated, with a JSON variant)"""
+    projects = Project.objects.select_related('category').only(
+        'title', 'slug', 'description', 'status', 'location', 'start_date',
+        'is_featured', 'order', 'category__name', 'category__color',
+    ).prefetch_related(
+        Prefetch('images', queryset=ProjectImage.objects.only('project_id', 'image', 'is_primary', 'order'))
+    )
 
     # Search functionality
     search_query = request.GET.get('q', '').strip()
@@ -497,18 +725,40 @@ def project_list(request):
     if category_filter:
         projects = projects.filter(category_id=category_filter)
 
-    # Order by featured, then order field
-    projects = projects.order_by('-is_featured', 'order', '-start_date')
+    # Order by featured, then order field unless another sort was requested
+    sort_by, ordering = get_sort(request, PROJECT_SORT_OPTIONS, '-is_featured')
+    page_obj = paginate(request, projects.order_by(*ordering))
+
+    if wants_json(request):
+        def serialize(project):
+            primary = project.primary_image
+            return {
+                'id': project.pk,
+                'title': project.title,
+                'slug': project.slug,
+                'description': project.description,
+                'image_url': file_url(primary.image) if primary else None,
+                'category': {'name': project.category.name, 'color': project.category.color},
+                'status': project.status,
+                'location': project.location,
+                'start_date': project.start_date,
+                'is_featured': project.is_featured,
+            }
+        return json_page(page_obj, serialize, sort_by)
 
     # Get all categories for filter dropdown
-    categories = ProjectCategory.objects.all().order_by('name')
+    categories = ProjectCategory.objects.only('name').order_by('name')
 
     context = {
-        'projects': projects,
+        'projects': page_obj,
+        'page_obj': page_obj,
         'categories': categories,
         'search_query': search_query,
         'status_filter': status_filter,
         'category_filter': category_filter,
+        'sort_by': sort_by,
+        'sort_links': sort_links(request, PROJECT_SORT_LABELS, sort_by),
+        'query_string': query_without_page(request),
     }
     return render(request, 'staff_portal/projects/list.html', context)
 
@@ -583,6 +833,7 @@ def project_delete(request, pk):
     return redirect('staff_portal:project_list')
 
 
+@ratelimit('portal-create')
 @projects_permission_required
 @require_POST
 def project_category_create_api(request):
@@ -633,10 +884,31 @@ def project_category_create_api(request):
 # DOCUMENT MANAGEMENT VIEWS
 # ============================================================================
 
+DOCUMENT_SORT_OPTIONS = {
+    '-uploaded_date': ('-uploaded_date',),
+    'uploaded_date': ('uploaded_date',),
+    '-document_year': (F('document_year').desc(nulls_last=True), '-uploaded_date'),
+    'title': ('title',),
+    '-download_count': ('-download_count',),
+}
+
+DOCUMENT_SORT_LABELS = {
+    '-uploaded_date': 'Newest',
+    'uploaded_date': 'Oldest',
+    '-document_year': 'Document year',
+    'title': 'Title',
+    '-download_count': 'Most downloaded',
+}
+
+
 @documents_permission_required
 def document_list(request):
-    """List all documents for management"""
-    documents = Document.objects.all().select_related('category')
+    """List documents for management (paginated, with a JSON variant)"""
+    documents = Document.objects.select_related('category').only(
+        'title', 'description', 'file', 'thumbnail', 'file_size', 'file_type',
+        'document_year', 'document_quarter', 'download_count', 'is_public',
+        'is_featured', 'uploaded_date', 'category__name',
+    )
 
     # Search functionality
     search_query = request.GET.get('q', '').strip()
@@ -660,24 +932,47 @@ def document_list(request):
     elif public_filter == 'private':
         documents = documents.filter(is_public=False)
 
-    # Order by most recent
-    documents = documents.order_by('-uploaded_date')
+    # Order by most recent unless another sort was requested
+    sort_by, ordering = get_sort(request, DOCUMENT_SORT_OPTIONS, '-uploaded_date')
+    page_obj = paginate(request, documents.order_by(*ordering))
+
+    if wants_json(request):
+        return json_page(page_obj, lambda document: {
+            'id': document.pk,
+            'title': document.title,
+            'description': document.description,
+            'file_url': file_url(document.file),
+            'thumbnail_url': file_url(document.thumbnail),
+            'file_size': document.file_size,
+            'file_type': document.file_type,
+            'category': document.category.name,
+            'document_year': document.document_year,
+            'document_quarter': document.document_quarter,
+            'download_count': document.download_count,
+            'is_public': document.is_public,
+            'is_featured': document.is_featured,
+        }, sort_by)
 
     # Get all categories for filter dropdown
-    categories = DocumentCategory.objects.all().order_by('name')
+    categories = DocumentCategory.objects.only('name').order_by('name')
 
     # Get available years for filter
-    years = Document.objects.values_list('document_year', flat=True).distinct().order_by('-document_year')
-    years = [year for year in years if year is not None]
+    years = Document.objects.filter(
+        document_year__isnull=False
+    ).values_list('document_year', flat=True).distinct().order_by('-document_year')
 
     context = {
-        'documents': documents,
+        'documents': page_obj,
+        'page_obj': page_obj,
         'categories': categories,
         'years': years,
         'search_query': search_query,
         'category_filter': category_filter,
         'year_filter': year_filter,
         'public_filter': public_filter,
+        'sort_by': sort_by,
+        'sort_links': sort_links(request, DOCUMENT_SORT_LABELS, sort_by),
+        'query_string': query_without_page(request),
     }
     return render(request, 'staff_portal/documents/list.html', context)
 
@@ -737,6 +1032,7 @@ def document_delete(request, pk):
     return redirect('staff_portal:document_list')
 
 
+@ratelimit('portal-create')
 @documents_permission_required
 @require_POST
 def document_category_create_api(request):
@@ -785,18 +1081,32 @@ def document_category_create_api(request):
 # STAFF MEMBER MANAGEMENT
 # ============================================================================
 
+STAFF_MEMBER_SORT_OPTIONS = {
+    'position_type': ('position_type', 'display_order', 'full_name'),
+    'full_name': ('full_name',),
+    '-updated_at': ('-updated_at',),
+}
+
+STAFF_MEMBER_SORT_LABELS = {
+    'position_type': 'Position',
+    'full_name': 'Name',
+    '-updated_at': 'Recently updated',
+}
+
+
 @staff_members_permission_required
 def staff_member_list(request):
-    """List all staff members for management"""
-    staff_members = StaffMember.objects.select_related('department').all()
+    """List staff members for management (paginated, with a JSON variant)"""
+    staff_members = StaffMember.objects.select_related('department').only(
+        'full_name', 'position', 'position_type', 'photo', 'email', 'phone',
+        'is_active', 'display_order', 'department__name',
+    )
 
     # Search functionality
     search_query = request.GET.get('q', '').strip()
     if search_query:
         staff_members = staff_members.filter(
-            full_name__icontains=search_query
-        ) | staff_members.filter(
-            position__icontains=search_query
+            Q(full_name__icontains=search_query) | Q(position__icontains=search_query)
         )
 
     # Department filter
@@ -816,16 +1126,36 @@ def staff_member_list(request):
     elif is_active_filter == 'inactive':
         staff_members = staff_members.filter(is_active=False)
 
+    sort_by, ordering = get_sort(request, STAFF_MEMBER_SORT_OPTIONS, 'position_type')
+    page_obj = paginate(request, staff_members.order_by(*ordering))
+
+    if wants_json(request):
+        return json_page(page_obj, lambda member: {
+            'id': member.pk,
+            'full_name': member.full_name,
+            'position': member.position,
+            'position_type': member.position_type,
+            'department': member.department.name if member.department else None,
+            'photo_url': file_url(member.photo),
+            'email': member.email,
+            'phone': member.phone,
+            'is_active': member.is_active,
+        }, sort_by)
+
     # Get all departments for filter dropdown
-    departments = Department.objects.all().order_by('order', 'name')
+    departments = Department.objects.only('name').order_by('order', 'name')
 
     context = {
-        'staff_members': staff_members,
+        'staff_members': page_obj,
+        'page_obj': page_obj,
         'departments': departments,
         'search_query': search_query,
         'department_filter': department_filter,
         'position_type_filter': position_type_filter,
         'is_active_filter': is_active_filter,
+        'sort_by': sort_by,
+        'sort_links': sort_links(request, STAFF_MEMBER_SORT_LABELS, sort_by),
+        'query_string': query_without_page(request),
     }
     return render(request, 'staff_portal/staff_members/list.html', context)
 
@@ -884,6 +1214,7 @@ def staff_member_delete(request, pk):
     return redirect('staff_portal:staff_member_list')
 
 
+@ratelimit('portal-create')
 @staff_members_permission_required
 @require_POST
 def department_create_api(request):
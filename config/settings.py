@@ -58,14 +58,16 @@ INSTALLED_APPS = [
     'apps.documents',
     'apps.gallery',
     'apps.contact',
+    'apps.api',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'apps.core.sessions.HybridSessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.core.middleware.ReplicaPinningMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'apps.staff_portal.middleware.RestrictAdminMiddleware',
@@ -102,6 +104,93 @@ DATABASES = {
     'default': env.db('DATABASE_URL', default='sqlite:///db.sqlite3'),
 }
 
+# Optional read replicas for public pages, as a comma-separated list of
+# database URLs (e.g. DATABASE_REPLICA_URLS=mysql://reader:pw@replica1/amma).
+# Each becomes a "replicaN" alias; see apps/core/routers.py.
+DATABASE_REPLICAS = []
+for _index, _url in enumerate(env.list('DATABASE_REPLICA_URLS', default=[]), start=1):
+    _alias = f'replica{_index}'
+    DATABASES[_alias] = env.db_url_config(_url)
+    DATABASES[_alias]['TEST'] = {'MIRROR': 'default'}
+    DATABASE_REPLICAS.append(_alias)
+
+# Persistent connections: keep each worker's connection open for
+# CONN_MAX_AGE seconds instead of reconnecting on every request, and ping it
+# before reuse so a connection dropped by MySQL (wait_timeout) is replaced.
+# A value set in the database URL (?conn_max_age=...) takes precedence.
+for _database in DATABASES.values():
+    _database.setdefault('CONN_MAX_AGE', env.int('CONN_MAX_AGE', default=60))
+    _database.setdefault('CONN_HEALTH_CHECKS', env.bool('CONN_HEALTH_CHECKS', default=True))
+
+DATABASE_ROUTERS = ['apps.core.routers.ReplicaRouter']
+
+# How long a staff member's reads stay on the primary after they save something
+REPLICA_PIN_SECONDS = env.int('REPLICA_PIN_SECONDS', default=15)
+REPLICA_PIN_COOKIE_NAME = 'amma_primary_pin'
+
+# SQLite tuning, applied to every new connection (see apps/core/db.py).
+# WAL lets readers and a writer work concurrently; the busy timeout makes
+# writers wait for the lock instead of raising "database is locked".
+SQLITE_PRAGMAS = {
+    'journal_mode': env('SQLITE_JOURNAL_MODE', default='wal'),
+    'synchronous': env('SQLITE_SYNCHRONOUS', default='normal'),
+    'busy_timeout': env.int('SQLITE_BUSY_TIMEOUT', default=5000),  # milliseconds
+    'cache_size': env.int('SQLITE_CACHE_SIZE', default=-20000),  # negative = KiB (20 MB)
+    'mmap_size': env.int('SQLITE_MMAP_SIZE', default=134217728),  # 128 MB
+    'temp_store': 'memory',
+}
+
+# `manage.py backup_db` writes compressed backups here and keeps the newest
+# BACKUP_KEEP of them (see apps/core/backup.py)
+BACKUP_ROOT = env('BACKUP_ROOT', default=str(BASE_DIR / 'backups'))
+BACKUP_KEEP = env.int('BACKUP_KEEP', default=7)
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# The default in-process cache is per worker. When running several workers
+# (e.g. Passenger on cPanel), use a shared backend such as
+# CACHE_URL=filecache:///home/user/amma_cache so invalidations reach every worker.
+
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+    # State that must be identical in every worker whatever CACHE_URL is (portal
+    # permission sets, preview fragments, API versions): a database table by
+    # default, created by migrate (apps/core/migrations/0004_shared_cache.py).
+    # Culling would drop the versions, so keep it well above the number of entries.
+    'shared': env.cache('SHARED_CACHE_URL', default='dbcache://amma_shared_cache?max_entries=5000'),
+}
+
+
+# Sessions (see apps/core/sessions.py)
+# Staff sessions are read from the cache and written through to the database.
+# Anonymous visitors get a signed cookie ('signed_cookies'), no session at all
+# ('none'), or the staff store ('server').
+SESSION_ENGINE = env('SESSION_ENGINE', default='django.contrib.sessions.backends.cached_db')
+# A logout must end the session in every worker, so cached sessions never live
+# in a per-process cache: the default cache when CACHE_URL is a shared backend,
+# the shared cache otherwise.
+SESSION_CACHE_ALIAS = env(
+    'SESSION_CACHE_ALIAS',
+    default='shared' if CACHES['default']['BACKEND'].endswith(('.LocMemCache', '.DummyCache')) else 'default',
+)
+ANONYMOUS_SESSIONS = env('ANONYMOUS_SESSIONS', default='signed_cookies')
+ANONYMOUS_SESSION_COOKIE_NAME = 'amma_visitor'
+
+
+# Rate limiting (see apps/core/ratelimit.py), counted in the default cache.
+# Format: '<requests>/<period>', period in s, m, h or d (e.g. '5/10m').
+# On the per-process locmemcache:// default each worker counts on its own, so
+# the effective limit is the rate times the number of workers.
+RATELIMIT_ENABLE = env.bool('RATELIMIT_ENABLE', default=True)
+RATELIMIT_RATES = {
+    'contact': env('RATELIMIT_CONTACT', default='5/10m'),
+    'login': env('RATELIMIT_LOGIN', default='10/5m'),
+    'portal-create': env('RATELIMIT_PORTAL_CREATE', default='30/m'),
+}
+# Set to e.g. 'HTTP_X_FORWARDED_FOR' only when behind a proxy that sets it
+RATELIMIT_IP_HEADER = env('RATELIMIT_IP_HEADER', default=None)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -149,9 +238,53 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
 
+# collectstatic writes content-hashed copies plus .gz/.br siblings (see
+# apps/core/storage.py); {% static %} resolves names through staticfiles.json.
+# Set STATIC_HTACCESS=True to also write staticfiles/.htaccess so Apache serves
+# the precompressed files with long-lived immutable caching.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'apps.core.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+STATIC_HTACCESS = env.bool('STATIC_HTACCESS', default=False)
+
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# `manage.py media_audit --quarantine` moves orphaned media files here; keep it
+# outside the web root
+MEDIA_QUARANTINE_ROOT = env('MEDIA_QUARANTINE_ROOT', default=str(BASE_DIR / 'media_quarantine'))
+
+# Sitemaps and RSS/Atom feeds are pre-rendered into SYNDICATION_ROOT and
+# regenerated when content changes (see apps/core/syndication.py). SITE_URL
+# is the public origin used for the absolute URLs inside them.
+SITE_URL = env('SITE_URL', default='http://localhost:8000')
+SYNDICATION_ROOT = env('SYNDICATION_ROOT', default=str(BASE_DIR / 'syndication'))
+SYNDICATION_AUTO_UPDATE = env.bool('SYNDICATION_AUTO_UPDATE', default=True)
+
+# Runs the tests with SYNDICATION_ROOT pointed at a scratch directory
+TEST_RUNNER = 'apps.core.testing.TestRunner'
+
+# Related news/projects come from a precomputed TF-IDF index
+# (apps/core/similarity.py); saves queue a refresh, applied by
+# `manage.py build_related_content --pending` from cron
+RELATED_CONTENT_AUTO_UPDATE = env.bool('RELATED_CONTENT_AUTO_UPDATE', default=True)
+
+# Public read-only API (apps/api). Response bodies are cached per content
+# version, so the timeout only bounds memory use; clients may reuse a response
+# for API_MAX_AGE seconds before revalidating with its ETag.
+API_CACHE_TIMEOUT = env.int('API_CACHE_TIMEOUT', default=3600)
+API_MAX_AGE = env.int('API_MAX_AGE', default=60)
+
+# Uploaded images are downscaled to fit their model's maximum size and
+# re-encoded without EXIF at this quality (apps/core/images.py). Override a
+# size per model, e.g. {'gallery.GalleryImage': (3000, 3000)}.
+IMAGE_MAX_SIZES = {}
+IMAGE_UPLOAD_QUALITY = env.int('IMAGE_UPLOAD_QUALITY', default=85)
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
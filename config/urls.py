@@ -38,6 +38,9 @@ urlpatterns = [
     path('gallery/', include('apps.gallery.urls')),
     path('contact/', include('apps.contact.urls')),
 
+    # Public read-only JSON API
+    path('api/v1/', include('apps.api.urls')),
+
     # Authentication (custom login at root level)
     path('login/', CustomLoginView.as_view(), name='login'),
 
@@ -0,0 +1,55 @@
+/*
+ * Bundle the front-end runtime into ../static/js/dist/app.js and copy the
+ * self-hosted fonts into ../static/fonts.
+ *
+ * The bundle is Alpine.js + Lucide + src/js/app.js, already minified by their
+ * authors, concatenated in load order. collectstatic fingerprints and
+ * precompresses the result.
+ */
+
+const fs = require('fs');
+const path = require('path');
+
+const root = path.resolve(__dirname, '..');
+const modules = path.join(root, 'node_modules');
+const staticDir = path.resolve(root, '..', 'static');
+
+const scripts = [
+  path.join(modules, 'lucide', 'dist', 'umd', 'lucide.min.js'),
+  path.join(root, 'src', 'js', 'app.js'),
+  // Alpine starts itself, so it goes last
+  path.join(modules, 'alpinejs', 'dist', 'cdn.min.js'),
+];
+
+const fonts = [
+  path.join(modules, '@fontsource-variable', 'inter', 'files', 'inter-latin-wght-normal.woff2'),
+  path.join(modules, '@fontsource', 'poppins', 'files', 'poppins-latin-400-normal.woff2'),
+  path.join(modules, '@fontsource', 'poppins', 'files', 'poppins-latin-600-normal.woff2'),
+  path.join(modules, '@fontsource', 'poppins', 'files', 'poppins-latin-700-normal.woff2'),
+];
+
+function bundleScripts() {
+  const outDir = path.join(staticDir, 'js', 'dist');
+  fs.mkdirSync(outDir, { recursive: true });
+
+  const parts = scripts.map((file) => {
+    const source = fs.readFileSync(file, 'utf8').replace(/\/\/# sourceMappingURL=.*$/gm, '');
+    return `/* ${path.relative(root, file)} */\n;${source.trim()}\n`;
+  });
+  const outFile = path.join(outDir, 'app.js');
+  fs.writeFileSync(outFile, parts.join('\n'));
+  console.log(`Wrote ${path.relative(root, outFile)} (${fs.statSync(outFile).size} bytes)`);
+}
+
+function copyFonts() {
+  const outDir = path.join(staticDir, 'fonts');
+  fs.mkdirSync(outDir, { recursive: true });
+
+  for (const file of fonts) {
+    fs.copyFileSync(file, path.join(outDir, path.basename(file)));
+  }
+  console.log(`Copied ${fonts.length} fonts to ${path.relative(root, outDir)}`);
+}
+
+bundleScripts();
+copyFonts();
@@ -0,0 +1,6 @@
+// Render <i data-lucide="..."> placeholders once the page has loaded.
+// Icon names come from the database (services, categories), so the full
+// Lucide icon set is bundled rather than a tree-shaken subset.
+document.addEventListener('DOMContentLoaded', function () {
+  lucide.createIcons();
+});